@@ -20,10 +20,15 @@ __author__ = 'Gorka Eguileor'
 __email__ = 'gorka@eguileor.com'
 __version__ = '0.2.2'
 
+from gcs_client.batch import Batch  # noqa
 from gcs_client.bucket import Bucket  # noqa
+from gcs_client.cache import MetadataCache  # noqa
 from gcs_client import constants  # noqa
 from gcs_client.project import Project  # noqa
 from gcs_client.credentials import Credentials  # noqa
 from gcs_client.gcs_object import *  # noqa
-from gcs_client.common import RetryParams  # noqa
+from gcs_client.columns import ObjectColumns  # noqa
+from gcs_client.common import Executor, RetryParams  # noqa
+from gcs_client.connection import ConnectionPool  # noqa
+from gcs_client.transport import Transport, HttpTransport  # noqa
 from gcs_client.prefix import Prefix  # noqa
@@ -0,0 +1,1030 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Asyncio client for Google Cloud Storage.
+
+This module requires Python 3.6 or newer, so it's not imported by the
+gcs_client package and must be imported explicitly:
+
+.. code-block:: python
+
+    from gcs_client import aio
+
+    async def copy(credentials):
+        bucket = aio.AsyncBucket('my_bucket', credentials)
+        async for obj in bucket.list(prefix='logs/'):
+            async with obj.open() as f:
+                data = await f.read()
+
+Communications use aiohttp when it's installed.  Otherwise the default
+synchronous Transport is used, running blocking requests on the event loop's
+executor.
+"""
+
+from __future__ import absolute_import
+
+import abc
+import asyncio
+import collections
+import functools
+
+import requests
+import six
+
+from gcs_client import base
+from gcs_client import bucket
+from gcs_client import cache as gcs_cache
+from gcs_client import common
+from gcs_client import errors
+from gcs_client import gcs_object
+from gcs_client import prefix
+from gcs_client import project
+from gcs_client import transport
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+__all__ = ('retry', 'AsyncTransport', 'AiohttpTransport',
+           'SyncTransportWrapper', 'AsyncProject', 'AsyncBucket',
+           'AsyncPrefix', 'AsyncObject', 'AsyncGCSObjFile',
+           'AsyncListIterator')
+
+
+def retry(param='_retry_params', error_codes=common.DEFAULT_RETRY_CODES):
+    """Truncated Exponential Backoff decorator for coroutines.
+
+    Accepts the same arguments as gcs_client.common.retry decorator, but waits
+    between retries using asyncio.sleep, so the event loop is never blocked.
+    """
+    def _retry(f):
+        @functools.wraps(f)
+        async def wrapped(self, *args, **kwargs):
+            retry_params = common._get_retry_params(self, param)
+            delay = 0
+
+            n = 0  # Retry number
+            while True:
+                try:
+                    return await f(self, *args, **kwargs)
+                except errors.Http as exc:
+                    if (not retry_params or n >= retry_params.max_retries or
+                            exc.code not in error_codes):
+                        raise exc
+                n += 1
+                delay, wait = common._backoff(retry_params, n, delay)
+                await asyncio.sleep(wait)
+
+        return wrapped
+
+    # If no argument has been used
+    if callable(param):
+        f, param = param, '_retry_params'
+        return _retry(f)
+
+    return _retry
+
+
+class AsyncTransport(object):
+    """Base class for all transports used from coroutines.
+
+    Equivalent to gcs_client.Transport, but request methods are coroutines.
+    """
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, endpoint=None):
+        """Initialize transport.
+
+        :param endpoint: Scheme and host, and optionally port and path, where
+                         GCS API lives.  Defaults to DEFAULT_ENDPOINT.
+        :type endpoint: String
+        """
+        self.endpoint = (endpoint or transport.DEFAULT_ENDPOINT).rstrip('/')
+        self.stats = transport.TransferStats()
+
+    url = transport.Transport.url
+
+    @staticmethod
+    def get_default():
+        """Return default asynchronous transport.
+
+        If no transport has been set with set_default we'll use an
+        AiohttpTransport when aiohttp is available and the default synchronous
+        transport is an HttpTransport.  In any other case the default
+        synchronous transport is wrapped with SyncTransportWrapper.
+        """
+        default = getattr(AsyncTransport, 'default', None)
+        if default:
+            return default
+
+        sync_transport = transport.Transport.get_default()
+        if aiohttp and isinstance(sync_transport, transport.HttpTransport):
+            AsyncTransport.default = AiohttpTransport(sync_transport.endpoint)
+            return AsyncTransport.default
+        return SyncTransportWrapper(sync_transport)
+
+    @staticmethod
+    def set_default(async_transport):
+        """Set default transport used by all asynchronous GCS resources.
+
+        :param async_transport: Transport to use.  If None is passed we'll go
+                                back to the automatic selection of
+                                get_default.
+        :type async_transport: AsyncTransport or NoneType
+        """
+        assert isinstance(async_transport, (type(None), AsyncTransport))
+        AsyncTransport.default = async_transport
+
+    async def request(self, method, url, **kwargs):
+        """Send a request to GCS.
+
+        Accepts the same arguments as gcs_client.Transport.request.
+        """
+        return await self._request(method, self.url(url), **kwargs)
+
+    @abc.abstractmethod
+    async def _request(self, method, url, **kwargs):
+        raise NotImplementedError
+
+    async def get(self, url, **kwargs):
+        """Send a GET request."""
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        """Send a POST request."""
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        """Send a PUT request."""
+        return await self.request('PUT', url, **kwargs)
+
+    async def close(self):
+        """Release resources held by the transport."""
+        pass
+
+
+class AiohttpTransport(AsyncTransport):
+    """Asynchronous transport that sends requests over HTTP with aiohttp."""
+
+    def __init__(self, endpoint=None, limit=100, limit_per_host=0):
+        """Initialize aiohttp transport.
+
+        :param endpoint: Scheme and host, and optionally port and path, where
+                         GCS API lives.  Defaults to DEFAULT_ENDPOINT.
+        :type endpoint: String
+        :param limit: Maximum number of simultaneous connections.
+        :type limit: int
+        :param limit_per_host: Maximum number of simultaneous connections to
+                               the same host, 0 means no limit.
+        :type limit_per_host: int
+        """
+        if aiohttp is None:
+            raise ImportError('AiohttpTransport requires aiohttp')
+        super(AiohttpTransport, self).__init__(endpoint)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = None
+        self._loop = None
+
+    def _get_session(self):
+        # Sessions are bound to an event loop, so we need a new one whenever
+        # we are used from a different loop.
+        loop = asyncio.get_event_loop()
+        if (self._session is None or self._session.closed or
+                self._loop is not loop):
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    async def _request(self, method, url, params=None, headers=None,
+                       json=None, data=None, **kwargs):
+        # Like requests, ignore parameters without value
+        params = {k: six.text_type(v) for k, v in (params or {}).items()
+                  if v is not None}
+        if data is not None and not isinstance(data, six.binary_type):
+            data = bytes(data)
+
+        session = self._get_session()
+        async with session.request(method, url, params=params,
+                                   headers=headers, json=json,
+                                   data=data) as r:
+            content = await r.read()
+            response = transport.Response(r.status, content, dict(r.headers))
+        self.stats.record(response)
+        return response
+
+    async def close(self):
+        """Close all connections."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+class SyncTransportWrapper(AsyncTransport):
+    """Use a synchronous Transport from coroutines.
+
+    Requests on blocking transports are run on an executor, non blocking
+    transports, like FakeTransport, are called directly.
+    """
+
+    def __init__(self, sync_transport, executor=None):
+        """Initialize the wrapper.
+
+        :param sync_transport: Synchronous transport to use.
+        :type sync_transport: gcs_client.Transport
+        :param executor: Executor where blocking requests are run.  Defaults
+                         to the event loop's default executor.
+        :type executor: concurrent.futures.Executor
+        """
+        super(SyncTransportWrapper, self).__init__(sync_transport.endpoint)
+        self.transport = sync_transport
+        self.executor = executor
+        # Responses are counted by the synchronous transport
+        self.stats = sync_transport.stats
+
+    async def _request(self, method, url, **kwargs):
+        if not self.transport.blocking:
+            return self.transport.request(method, url, **kwargs)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.transport.request, method, url, **kwargs))
+
+
+class AsyncGCS(object):
+    """Base class for asynchronous GCS resources."""
+
+    _required_attributes = base.GCS._required_attributes
+    _URL = base.GCS._URL
+
+    def __init__(self, credentials, retry_params=None, transport=None):
+        """Base asynchronous GCS initialization.
+
+        :param credentials: credentials to use for accessing GCS
+        :type credentials: Credentials
+        :param retry_params: retry configuration used for communications with
+                             GCS.  If not specified RetryParams.getdefault()
+                             will be used.
+        :type retry_params: RetryParams
+        :param transport: Transport used for communications with GCS.  If not
+                          specified AsyncTransport.get_default() will be used.
+        :type transport: AsyncTransport
+        """
+        self.credentials = credentials
+        self._retry_params = retry_params or common.RetryParams.get_default()
+        self._transport = transport
+
+    @property
+    def retry_params(self):
+        """Get retry configuration used by this instance for accessing GCS."""
+        return self._retry_params
+
+    @property
+    def transport(self):
+        """Transport used by this instance for accessing GCS."""
+        return self._transport or AsyncTransport.get_default()
+
+    async def _request(self, op='GET', headers=None, body=None, parse=False,
+                       ok=(requests.codes.ok,), url=None, format_url=True,
+                       **params):
+        """Request actions on a GCS resource.
+
+        Accepts the same arguments as gcs_client.base.GCS._request.
+        """
+        headers = dict(transport.GZIP_HEADERS, **(headers or {}))
+        headers['Authorization'] = self.credentials.authorization
+
+        if not url:
+            url = self._URL
+
+        if format_url:
+            format_args = {
+                x: requests.utils.quote(six.text_type(getattr(self, x)),
+                                        safe='')
+                for x in self._required_attributes}
+            url = url.format(**format_args)
+
+        r = await self.transport.request(op, url, params=params,
+                                         headers=headers, json=body)
+
+        if r.status_code not in ok:
+            raise errors.create_http_exception(r.status_code, r.content)
+
+        if parse and r.status_code != requests.codes.not_modified:
+            try:
+                transport.parse_json(r)
+            except Exception:
+                raise errors.Error('GCS response is not JSON: %s' %
+                                   r.content)
+
+        return r
+
+    @common.is_complete
+    @retry
+    async def exists(self):
+        """Check if exists in GCS server."""
+        try:
+            await self._request(op='HEAD')
+        except (errors.NotFound, errors.BadRequest):
+            return False
+        return True
+
+
+class AsyncFillable(AsyncGCS):
+    """Base class for asynchronous resources with metadata.
+
+    Unlike synchronous resources, attributes are not retrieved on access, so
+    reload must be awaited to retrieve them from GCS.  Instances returned by
+    listings are already filled.
+    """
+
+    @classmethod
+    def _obj_from_data(cls, data, credentials=None, retry_params=None,
+                       transport=None):
+        obj = cls(credentials=credentials, retry_params=retry_params,
+                  transport=transport)
+        obj._fill_with_data(data)
+        return obj
+
+    def _fill_with_data(self, data):
+        for k, v in data.items():
+            if isinstance(v, dict) and len(v) == 1:
+                v = tuple(v.values())[0]
+            setattr(self, k, v)
+
+    async def _get_data(self, **kwargs):
+        raise NotImplementedError
+
+    async def reload(self):
+        """Retrieve attributes from GCS.
+
+        :returns: The instance itself.
+        """
+        self._fill_with_data(await self._get_data())
+        return self
+
+    async def refresh(self):
+        """Retrieve attributes from GCS only if they have changed.
+
+        Works like gcs_client.base.Fillable.refresh.
+
+        :returns: Whether attributes were retrieved.
+        :rtype: bool
+        """
+        etag = vars(self).get('etag')
+        metageneration = vars(self).get('metageneration')
+        if not (etag or metageneration):
+            await self.reload()
+            return True
+
+        data = await self._get_data(
+            **base.Fillable._conditions(etag, metageneration))
+        if data is None:
+            return False
+        self._fill_with_data(data)
+        return True
+
+
+class AsyncListIterator(object):
+    """Asynchronous iterator over a GCS listing.
+
+    Pages are retrieved from GCS as they are needed, and retries on transient
+    errors are done per page.
+
+    :ivar page_token: Token of the next page that will be requested, None if
+                      there are no more pages.
+    :vartype page_token: String
+
+    Like in gcs_client.base.ListIterator, partial response selectors get the
+    kind and nextPageToken fields and the item_fields of the items added if
+    missing.
+    """
+
+    def __init__(self, parent, url, params, item_fields=()):
+        fields = params.get('fields')
+        if isinstance(fields, six.string_types):
+            fields = base._add_item_fields(fields, *item_fields)
+            params = dict(params, fields=base._add_fields(
+                fields, 'kind', 'nextPageToken'))
+        self._parent = parent
+        self._url = url
+        self._params = params
+        self._retry_params = parent.retry_params
+        self._items = collections.deque()
+        self._done = False
+        self.page_token = params.get('pageToken')
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._items:
+            if self._done:
+                raise StopAsyncIteration
+            await self._fetch_page()
+        return self._items.popleft()
+
+    @retry
+    async def _fetch_page(self):
+        parent = self._parent
+        r = await parent._request(parse=True, url=self._url, **self._params)
+        r = transport.parse_json(r)
+
+        cls = _classes[r['kind']]
+        self._items.extend(
+            cls._obj_from_data(item, parent.credentials, parent.retry_params,
+                               parent._transport)
+            for item in r.get('items', []))
+        self._items.extend(
+            AsyncPrefix(parent.name, p, self._params.get('delimiter'),
+                        parent.credentials, parent.retry_params,
+                        parent._transport)
+            for p in r.get('prefixes', []))
+
+        self.page_token = self._params['pageToken'] = r.get('nextPageToken')
+        self._done = not self.page_token
+
+    async def all(self):
+        """Retrieve all remaining items.
+
+        :returns: Remaining items in the listing.
+        :rtype: list
+        """
+        return [item async for item in self]
+
+
+class AsyncProject(AsyncGCS):
+    """Asynchronous GCS Project Object representation."""
+
+    _required_attributes = project.Project._required_attributes
+    _URL = project.Project._URL
+    _list_url = project.Project._list_url
+    _list_item_fields = project.Project._list_item_fields
+
+    def __init__(self, project_id, credentials=None, retry_params=None,
+                 transport=None):
+        """Initialize an AsyncProject object.
+
+        :param project_id: Project id as listed in Google's project management
+                           https://console.developers.google.com/project.
+        :type project_id: String
+        :param credentials: A credentials object to authorize the connection.
+        :type credentials: gcs_client.Credentials
+        :param retry_params: Retry configuration used for communications with
+                             GCS.  If None is passed default retries will be
+                             used.
+        :type retry_params: RetryParams or NoneType
+        :param transport: Transport used for communications with GCS.
+        :type transport: AsyncTransport or NoneType
+        """
+        super(AsyncProject, self).__init__(credentials, retry_params,
+                                           transport)
+        self.project_id = project_id
+
+    default_bucket_name = project.Project.default_bucket_name
+
+    @common.is_complete
+    def list(self, fields=None, maxResults=None, projection=None, prefix=None,
+             pageToken=None):
+        """Iterate asynchronously over the buckets of the project.
+
+        Accepts the same arguments as gcs_client.Project.list.
+
+        :returns: Asynchronous iterator of buckets.
+        :rtype: AsyncListIterator of AsyncBucket
+        """
+        return AsyncListIterator(
+            self, self._list_url,
+            dict(project=self.project_id, fields=fields, prefix=prefix,
+                 maxResults=maxResults, projection=projection,
+                 pageToken=pageToken),
+            self._list_item_fields)
+
+    @common.is_complete
+    @retry
+    async def create_bucket(self, name, location='US',
+                            storage_class=project.constants.STORAGE_NEARLINE,
+                            predefined_acl=None,
+                            predefined_default_obj_acl=None,
+                            projection=project.constants.PROJECTION_SIMPLE):
+        """Create a new bucket in the project.
+
+        Accepts the same arguments as gcs_client.Project.create_bucket.
+
+        :returns: A new AsyncBucket instance
+        :rtype: AsyncBucket
+        """
+        r = await self._request(
+            parse=True,
+            op='POST',
+            predefinedAcl=predefined_acl,
+            predefinedDefaultObjectAcl=predefined_default_obj_acl,
+            projection=projection,
+            body={'name': name, 'location': location,
+                  'storageClass': storage_class})
+        gcs_cache.MetadataCache.get_default().invalidate(name)
+        return AsyncBucket._obj_from_data(transport.parse_json(r),
+                                          self.credentials,
+                                          self.retry_params, self._transport)
+
+    def __str__(self):
+        return self.project_id
+
+    __repr__ = __str__
+
+
+class AsyncBucket(AsyncFillable):
+    """Asynchronous GCS Bucket Object representation.
+
+    Has the same attributes as gcs_client.Bucket once reloaded.
+    """
+
+    kind = bucket.Bucket.kind
+    _required_attributes = bucket.Bucket._required_attributes
+    _URL = bucket.Bucket._URL
+    _list_url = bucket.Bucket._list_url
+    _list_item_fields = bucket.Bucket._list_item_fields
+
+    def __init__(self, name=None, credentials=None, retry_params=None,
+                 transport=None):
+        """Initialize an AsyncBucket object.
+
+        :param name: Name of the bucket to use.
+        :type name: String
+        :param credentials: A credentials object to authorize the connection.
+        :type credentials: gcs_client.Credentials
+        :param retry_params: Retry configuration used for communications with
+                             GCS.  If None is passed default retries will be
+                             used.
+        :type retry_params: RetryParams or NoneType
+        :param transport: Transport used for communications with GCS.
+        :type transport: AsyncTransport or NoneType
+        """
+        super(AsyncBucket, self).__init__(credentials, retry_params,
+                                          transport)
+        self.name = name
+
+    @retry
+    async def _get_data(self, **kwargs):
+        r = await self._request(parse=True, **kwargs)
+        if r.status_code == requests.codes.not_modified:
+            return None
+        return transport.parse_json(r)
+
+    @common.is_complete
+    def list(self, prefix=None, maxResults=None, versions=None, delimiter=None,
+             projection=None, pageToken=None, fields=None):
+        """Iterate asynchronously over Objects in the Bucket.
+
+        Accepts the same arguments as gcs_client.Bucket.list.
+
+        :returns: Asynchronous iterator of objects and prefixes.
+        :rtype: AsyncListIterator of AsyncObject and AsyncPrefix
+        """
+        return AsyncListIterator(
+            self, self._list_url,
+            dict(prefix=prefix, maxResults=maxResults, versions=versions,
+                 delimiter=delimiter, projection=projection,
+                 pageToken=pageToken, fields=fields),
+            self._list_item_fields)
+
+    @common.is_complete
+    @retry
+    async def delete(self, if_metageneration_match=None,
+                     if_metageneration_not_match=None):
+        """Permanently deletes an empty bucket from a Project.
+
+        Accepts the same arguments as gcs_client.Bucket.delete.
+        """
+        await self._request(
+            op='DELETE', ok=(requests.codes.no_content,),
+            ifMetagenerationMatch=if_metageneration_match,
+            ifMetagenerationNotMatch=if_metageneration_not_match)
+        gcs_cache.MetadataCache.get_default().invalidate(self.name)
+
+    def open(self, name, mode='r', generation=None, chunksize=None):
+        """Open an object from the Bucket.
+
+        Accepts the same arguments as gcs_client.Bucket.open.
+
+        :returns: File that must be awaited or used as an asynchronous context
+                  manager to be opened.
+        :rtype: AsyncGCSObjFile
+        """
+        return AsyncGCSObjFile(self.name, name, self.credentials, mode,
+                               chunksize, self.retry_params, generation,
+                               self._transport)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return ("%s.%s('%s') #etag: %s" %
+                (self.__module__, self.__class__.__name__, self.name,
+                 getattr(self, 'etag', '?')))
+
+
+class AsyncPrefix(AsyncGCS):
+    """Asynchronous GCS Prefix Object representation."""
+
+    kind = prefix.Prefix.kind
+    _required_attributes = prefix.Prefix._required_attributes
+    _URL = prefix.Prefix._URL
+    _list_item_fields = prefix.Prefix._list_item_fields
+
+    def __init__(self, name, prefix, delimiter=None, credentials=None,
+                 retry_params=None, transport=None):
+        """Initialize a prefix representation.
+
+        :param name: Name of the bucket this prefix belongs to.
+        :type name: String
+        :param prefix: Prefix name (like the full path of a directory).
+        :type prefix: String
+        :param delimiter: Delimiter used on the listing
+        :type delimiter: String
+        :param credentials: A credentials object to authorize the connection.
+        :type credentials: gcs_client.Credentials
+        :param retry_params: Retry configuration used for communications with
+                             GCS.  If None is passed default retries will be
+                             used.
+        :type retry_params: RetryParams or NoneType
+        :param transport: Transport used for communications with GCS.
+        :type transport: AsyncTransport or NoneType
+        """
+        super(AsyncPrefix, self).__init__(credentials, retry_params,
+                                          transport)
+        self.name = name
+        self.prefix = prefix
+        self.delimiter = delimiter
+
+    @common.is_complete
+    def list(self, prefix='', maxResults=None, versions=None, delimiter=None,
+             projection=None, pageToken=None, fields=None):
+        """Iterate asynchronously over Objects in this prefix.
+
+        Accepts the same arguments as gcs_client.Prefix.list.
+
+        :returns: Asynchronous iterator of objects and prefixes.
+        :rtype: AsyncListIterator of AsyncObject and AsyncPrefix
+        """
+        if delimiter is None:
+            delimiter = self.delimiter
+        return AsyncListIterator(
+            self, self._URL,
+            dict(prefix=self.prefix + prefix, maxResults=maxResults,
+                 versions=versions, delimiter=delimiter,
+                 projection=projection, pageToken=pageToken, fields=fields),
+            self._list_item_fields)
+
+    def __str__(self):
+        return self.prefix
+
+    def __repr__(self):
+        return ("%s.%s('%s', '%s')" % (self.__module__,
+                self.__class__.__name__, self.name, self.prefix))
+
+
+class AsyncObject(AsyncFillable):
+    """Asynchronous GCS Stored Object Object representation.
+
+    Has the same attributes as gcs_client.Object once reloaded.
+    """
+
+    kind = gcs_object.Object.kind
+    _required_attributes = gcs_object.Object._required_attributes
+    _URL = gcs_object.Object._URL
+
+    def __init__(self, bucket=None, name=None, generation=None,
+                 credentials=None, retry_params=None, chunksize=None,
+                 transport=None):
+        """Initialize an AsyncObject object.
+
+        :param bucket: Name of the bucket to use.
+        :type bucket: String
+        :param name: Name of the object.
+        :type name: String
+        :param generation: If present, selects a specific revision of this
+                           object (as opposed to the latest version, the
+                           default).
+        :type generation: long
+        :param credentials: A credentials object to authorize the connection.
+        :type credentials: Credentials
+        :param retry_params: Retry configuration used for communications with
+                             GCS.  If None is passed default retries will be
+                             used.
+        :type retry_params: RetryParams or NoneType
+        :param chunksize: Size in bytes of the payload to send/receive to/from
+                          GCS.  Default is gcs_client.DEFAULT_BLOCK_SIZE
+        :type chunksize: int
+        :param transport: Transport used for communications with GCS.
+        :type transport: AsyncTransport or NoneType
+        """
+        super(AsyncObject, self).__init__(credentials, retry_params,
+                                          transport)
+        self.name = name
+        self.bucket = bucket
+        self.generation = generation
+        # Generation we retrieve, generation is replaced by retrieved metadata
+        self._generation = generation
+        self._chunksize = chunksize
+
+    @retry
+    async def _get_data(self, **kwargs):
+        r = await self._request(parse=True, generation=self._generation,
+                                **kwargs)
+        if r.status_code == requests.codes.not_modified:
+            return None
+        return transport.parse_json(r)
+
+    @common.is_complete
+    @retry
+    async def delete(self, generation=None, if_generation_match=None,
+                     if_generation_not_match=None,
+                     if_metageneration_match=None,
+                     if_metageneration_not_match=None):
+        """Deletes an object and its metadata.
+
+        Accepts the same arguments as gcs_client.Object.delete.
+        """
+        await self._request(
+            op='DELETE', ok=(requests.codes.no_content,),
+            generation=generation or self.generation,
+            ifGenerationMatch=if_generation_match,
+            ifGenerationNotMatch=if_generation_not_match,
+            ifMetagenerationMatch=if_metageneration_match,
+            ifMetagenerationNotMatch=if_metageneration_not_match)
+        gcs_cache.MetadataCache.get_default().invalidate(self.bucket,
+                                                         self.name)
+
+    @common.is_complete
+    def open(self, mode='r', chunksize=None):
+        """Open this object.
+
+        Accepts the same arguments as gcs_client.Object.open.
+
+        :returns: File that must be awaited or used as an asynchronous context
+                  manager to be opened.
+        :rtype: AsyncGCSObjFile
+        """
+        return AsyncGCSObjFile(self.bucket, self.name, self.credentials, mode,
+                               chunksize or self._chunksize,
+                               self.retry_params, self.generation,
+                               self._transport)
+
+    def __str__(self):
+        return '%s/%s' % (self.bucket, self.name)
+
+    def __repr__(self):
+        return ("%s.%s('%s', '%s', '%s') #etag: %s" % (self.__module__,
+                self.__class__.__name__, self.bucket, self.name,
+                self.generation, getattr(self, 'etag', '?')))
+
+
+_classes = {'storage#buckets': AsyncBucket,
+            'storage#objects': AsyncObject}
+
+
+class AsyncGCSObjFile(object):
+    """Asynchronous Reader/Writer for GCS Objects.
+
+    Provides the same functionality as gcs_client.GCSObjFile, but read, write
+    and close are coroutines.
+
+    Instances must be awaited, or used as asynchronous context managers, to
+    open them.
+    """
+    _URL = gcs_object.GCSObjFile._URL
+    _URL_UPLOAD = gcs_object.GCSObjFile._URL_UPLOAD
+
+    def __init__(self, bucket, name, credentials, mode='r', chunksize=None,
+                 retry_params=None, generation=None, transport=None):
+        """Initialize asynchronous reader/writer of GCS object.
+
+        Accepts the same arguments as gcs_client.GCSObjFile plus:
+
+        :param transport: Transport used for communications with GCS.
+        :type transport: AsyncTransport or NoneType
+        """
+        if mode not in ('r', 'w'):
+            raise IOError('Only r or w modes supported')
+        self.mode = mode
+
+        self._chunksize = chunksize or gcs_object.DEFAULT_BLOCK_SIZE
+        assert self._chunksize % gcs_object.BLOCK_MULTIPLE == 0, \
+            'chunksize must be multiple of %s' % gcs_object.BLOCK_MULTIPLE
+        self.name = name
+        self.bucket = bucket
+        self.size = None
+        self._offset = 0
+        self._eof = False
+        self._gcs_offset = 0
+        self._credentials = credentials
+        self._buffer = gcs_object._Buffer()
+        self._retry_params = retry_params
+        self._generation = generation
+        self._transport = transport or AsyncTransport.get_default()
+        self._location = None
+        self.closed = True
+
+    async def _ensure_open(self):
+        if self._location is None:
+            try:
+                await self._open()
+            except errors.NotFound:
+                raise IOError('Object %s does not exist in bucket %s' %
+                              (self.name, self.bucket))
+        return self
+
+    def __await__(self):
+        return self._ensure_open().__await__()
+
+    async def __aenter__(self):
+        return await self._ensure_open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    _is_readable = gcs_object.GCSObjFile._is_readable
+    _is_writable = gcs_object.GCSObjFile._is_writable
+    _check_is_writable = gcs_object.GCSObjFile._check_is_writable
+    _check_is_readable = gcs_object.GCSObjFile._check_is_readable
+    _check_is_open = gcs_object.GCSObjFile._check_is_open
+
+    @retry
+    async def _open(self):
+        safe_bucket = requests.utils.quote(self.bucket, safe='')
+        safe_name = requests.utils.quote(self.name, safe='')
+        if self._is_readable():
+            location = self._URL % (safe_bucket, safe_name)
+            params = {'fields': 'size', 'generation': self._generation}
+            headers = {'Authorization': self._credentials.authorization}
+            r = await self._transport.get(location, params=params,
+                                          headers=headers)
+            if r.status_code == requests.codes.ok:
+                try:
+                    self.size = int(transport.parse_json(r)['size'])
+                except Exception as exc:
+                    raise errors.Error('Bad data returned by GCS %s' % exc)
+
+        else:
+            self.size = 0
+            initial_url = self._URL_UPLOAD % safe_bucket
+            params = {'uploadType': 'resumable', 'name': self.name}
+            headers = {'x-goog-resumable': 'start',
+                       'Authorization': self._credentials.authorization,
+                       'Content-type': 'application/octet-stream'}
+            r = await self._transport.post(initial_url, params=params,
+                                           headers=headers)
+            if r.status_code == requests.codes.ok:
+                location = r.headers['Location']
+
+        if r.status_code != requests.codes.ok:
+            raise errors.create_http_exception(
+                r.status_code,
+                'Error opening object %s in bucket %s: %s-%s' %
+                (self.name, self.bucket, r.status_code, r.content))
+        self._location = location
+        self.closed = False
+
+    tell = gcs_object.GCSObjFile.tell
+    seek = gcs_object.GCSObjFile.seek
+
+    async def write(self, data):
+        """Write a string to the file.
+
+        Due to buffering, the string may not actually show up in the file until
+        we close the file or enough data to send another chunk has been
+        buffered.
+
+        :param data: Data to write to the object.
+        :type data: bytes
+        :returns: None
+        """
+        self._check_is_open()
+        self._check_is_writable()
+
+        self.size += len(data)
+
+        self._buffer.write(data)
+        while len(self._buffer) >= self._chunksize:
+            data = self._buffer.read(self._chunksize)
+            await self._send_data(data, self._gcs_offset)
+            self._gcs_offset += len(data)
+
+    @retry
+    async def _send_data(self, data, begin=0, finalize=False):
+        if not (data or finalize):
+            return
+
+        if not data:
+            size = self.size
+            data_range = 'bytes */%s' % size
+        else:
+            end = begin + len(data) - 1
+            size = self.size if finalize else '*'
+            data_range = 'bytes %s-%s/%s' % (begin, end, size)
+
+        headers = {'Authorization': self._credentials.authorization,
+                   'Content-Range': data_range}
+        r = await self._transport.put(self._location, data=bytes(data),
+                                      headers=headers)
+
+        if size == '*':
+            expected = requests.codes.resume_incomplete
+        else:
+            expected = requests.codes.ok
+
+        if r.status_code != expected:
+            raise errors.create_http_exception(
+                r.status_code,
+                'Error writting to object %s in bucket %s: %s-%s' %
+                (self.name, self.bucket, r.status_code, r.content))
+
+    async def close(self):
+        """Close the file.
+
+        Calling close() more than once is allowed.
+        """
+        if not self.closed:
+            if self._is_writable():
+                await self._send_data(self._buffer.read(), self._gcs_offset,
+                                      finalize=True)
+                gcs_cache.MetadataCache.get_default().invalidate(self.bucket,
+                                                                 self.name)
+            self.closed = True
+
+    async def read(self, size=None):
+        """Read data from the file.
+
+        Read at most size bytes from the file (less if the read hits EOF before
+        obtaining size bytes).  If the size argument is None, read all data
+        until EOF is reached.
+
+        :param size: Number of bytes to read.
+        :type size: int
+        :returns: Bytes with read data from GCS.
+        :rtype: bytes
+        """
+        self._check_is_open()
+        self._check_is_readable()
+
+        if size == 0 or self._eof:
+            return b''
+
+        while not self._eof and (not size or len(self._buffer) < size):
+            data, self._eof = await self._get_data(self._chunksize,
+                                                   self._gcs_offset)
+            self._gcs_offset += len(data)
+            self._buffer.write(data)
+
+        data = self._buffer.read(size)
+        self._offset += len(data)
+        return data.tobytes()
+
+    @retry
+    async def _get_data(self, size, begin=0):
+        end = begin + size - 1
+        headers = {'Authorization': self._credentials.authorization,
+                   'Range': 'bytes=%d-%d' % (begin, end)}
+        params = {'alt': 'media'}
+        r = await self._transport.get(self._location, params=params,
+                                      headers=headers)
+        expected = (requests.codes.ok, requests.codes.partial_content,
+                    requests.codes.requested_range_not_satisfiable)
+
+        if r.status_code not in expected:
+            raise errors.create_http_exception(
+                r.status_code,
+                'Error reading object %s in bucket %s: %s-%s' %
+                (self.name, self.bucket, r.status_code, r.content))
+
+        if r.status_code == requests.codes.requested_range_not_satisfiable:
+            return (b'', True)
+
+        eof = len(r.content) < size
+        content_range = r.headers.get('Content-Range')
+        if content_range:
+            try:
+                self.size = int(content_range.split('/')[-1])
+                eof = self.size <= begin + len(r.content)
+            except Exception:
+                pass
+
+        return (r.content, eof)
@@ -16,12 +16,22 @@
 from __future__ import absolute_import
 
 import abc
+import collections
+import copy
+import re
 import six
+import sys
+import threading
 
 import requests
 
+from gcs_client import batch
+from gcs_client import cache as gcs_cache
+from gcs_client import checkpoint as gcs_checkpoint
 from gcs_client import common
 from gcs_client import errors as gcs_errors
+from gcs_client import jsonstream
+from gcs_client import transport
 
 
 class GCS(object):
@@ -45,17 +55,20 @@ class GCS(object):
         self._retry_params = retry_params or common.RetryParams.get_default()
 
     def _request(self, op='GET', headers=None, body=None, parse=False,
-                 ok=(requests.codes.ok,), url=None, format_url=True, **params):
+                 ok=(requests.codes.ok,), url=None, format_url=True,
+                 stream=False, **params):
         """Request actions on a GCS resource.
 
         :param op: Operation to perform (GET, PUT, POST, HEAD, DELETE).
         :type op: six.string_types
-        :param headers: Headers to send in the request.  Authentication will be
-                        added.
+        :param headers: Headers to send in the request.  Authentication and
+                        gzip negotiation headers will be added.
         :type headers: dict
         :param body: Body to send in the request.
         :type body: Dictionary, bytes or file-like object.
-        :param parse: If we want to check that response body is JSON.
+        :param parse: If we want to check that response body is JSON.  The
+                      document is parsed only once, use transport.parse_json
+                      to retrieve it.
         :type parse: bool
         :param ok: Response status codes to consider as OK.
         :type ok: Iterable of integer numbers
@@ -63,37 +76,45 @@ class GCS(object):
         :type url: six.string_types
         :param format_url: If we want provided url to be formatted with params
         :type format_url: bool
+        :param stream: If we want the body to be read as it's consumed,
+                       using iter_content on the response.
+        :type stream: bool
         :param params: All params to send as URL params in the request.
         :returns: requests.Request
         :"""
-        headers = {} if not headers else headers.copy()
+        headers = dict(transport.GZIP_HEADERS, **(headers or {}))
         headers['Authorization'] = self._credentials.authorization
 
         if not url:
             url = self._URL
 
         if format_url:
-            format_args = {
-                x: requests.utils.quote(six.text_type(getattr(self, x)),
-                                        safe='')
-                for x in self._required_attributes}
-            url = url.format(**format_args)
+            url = self._format_url(url)
 
-        r = requests.request(op, url, params=params, headers=headers,
-                             json=body)
+        kwargs = {'stream': True} if stream else {}
+        r = transport.Transport.get_default().request(
+            op, url, params=params, headers=headers, json=body, **kwargs)
 
         if r.status_code not in ok:
             raise gcs_errors.create_http_exception(r.status_code, r.content)
 
-        if parse:
+        # Not modified responses have no body
+        if parse and r.status_code != requests.codes.not_modified:
             try:
-                r.json()
+                transport.parse_json(r)
             except Exception:
                 raise gcs_errors.Error('GCS response is not JSON: %s' %
                                        r.content)
 
         return r
 
+    def _format_url(self, url):
+        """Fill url placeholders with quoted values of required attributes."""
+        format_args = {
+            x: requests.utils.quote(six.text_type(getattr(self, x)), safe='')
+            for x in self._required_attributes}
+        return url.format(**format_args)
+
     @property
     def retry_params(self):
         """Get retry configuration used by this instance for accessing GCS."""
@@ -131,104 +152,766 @@ class GCS(object):
             return False
         return True
 
+    def submit(self, method, *args, **kwargs):
+        """Run a method of this instance on the shared Executor.
+
+        :param method: Name of the method to run, for example 'exists'.
+        :type method: String
+        :param args: Positional arguments for the method.
+        :param kwargs: Keyword arguments for the method.
+        :returns: Future that will hold the result of the method.
+        :rtype: concurrent.futures.Future
+        """
+        return common.Executor.get_default().submit(getattr(self, method),
+                                                    *args, **kwargs)
+
+    def batch(self, max_size=batch.MAX_BATCH_SIZE):
+        """Create a Batch using credentials and retries of this instance.
+
+        .. code-block:: python
+
+            with bucket.batch() as b:
+                for obj in bucket.list(prefix='tmp/'):
+                    b.delete(obj)
+
+        :param max_size: Maximum number of operations to send in each batch
+                         request.
+        :type max_size: int
+        :returns: A new batch.
+        :rtype: gcs_client.Batch
+        """
+        return batch.Batch(self.credentials, self.retry_params, max_size)
+
+
+_MISSING = object()
+
 
+class Field(object):
+    """Attribute of a resource declared in its field schema.
+
+    Values are stored in the instance dictionary, so this non data descriptor
+    is only reached when the attribute has no value yet.  It then retrieves
+    the metadata of the resource from GCS, once, and returns the field's
+    default, or raises AttributeError, if the field is still missing.
+    """
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default=_MISSING):
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._load_field(self.name, self.default)
+
+
+class _Schema(abc.ABCMeta):
+    """Create a Field descriptor for each name in the _fields of a class.
+
+    Fields with a value in _field_defaults return it when GCS doesn't return
+    them, and names already defined in the class are left untouched.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        defaults = namespace.get('_field_defaults', {})
+        for field in namespace.get('_fields', ()):
+            if field not in namespace:
+                namespace[field] = Field(field, defaults.get(field, _MISSING))
+        return super(_Schema, mcs).__new__(mcs, name, bases, namespace)
+
+
+@six.add_metaclass(_Schema)
 class Fillable(GCS):
+    """Base class for resources whose metadata is retrieved on access.
+
+    Subclasses declare the fields returned by GCS in _fields.  Accessing one
+    of them when it has no value retrieves the resource's metadata, and the
+    result, including a missing field or a resource that doesn't exist, is
+    remembered so GCS is not asked again until reload is called.  Names that
+    are not declared are only available once retrieved metadata includes
+    them, and raise AttributeError without contacting GCS otherwise.  Mutable
+    defaults are copied so each instance gets its own.
+
+    Resources with a _cache_key share retrieved metadata through the default
+    MetadataCache when it's enabled.
+    """
+
+    #: Names of the fields of the resource in GCS.
+    _fields = ()
+
+    #: Values returned for fields that GCS doesn't return.
+    _field_defaults = {}
+
     def __init__(self, credentials, retry_params=None):
-        super(Fillable, self).__setattr__('_gcs_attrs', {})
-        # We need to set a default value for _credentials, otherwise we would
-        # end up calling __get_attr__ on GCS base class
-        self._credentials = not credentials
         super(Fillable, self).__init__(credentials, retry_params)
         self._data_retrieved = False
         self._exists = None
 
     @classmethod
-    def _obj_from_data(cls, data, credentials=None, retry_params=None):
+    def _obj_from_data(cls, data, credentials=None, retry_params=None,
+                       partial=False):
         obj = cls(credentials=credentials, retry_params=retry_params)
-        obj._fill_with_data(data)
+        obj._fill_with_data(data, partial)
         return obj
 
-    def __getattribute__(self, name):
-        gcs_attrs = super(Fillable, self).__getattribute__('_gcs_attrs')
-        if name in gcs_attrs:
-            return gcs_attrs[name]
-        return super(Fillable, self).__getattribute__(name)
-
-    def __getattr__(self, name):
-        def attr_error():
-            raise AttributeError("'%s' object has no attribute '%s'" %
-                                 (self.__class__.__name__, name))
-
-        if self._data_retrieved or self._exists is False:
-            attr_error()
-
+    def _cache_key(self):
+        """Return (bucket, name, generation) key of the metadata cache."""
+        return None
+
+    def _invalidate_cache(self):
+        """Discard cached metadata after changing the resource."""
+        key = self._cache_key()
+        if key is not None:
+            gcs_cache.MetadataCache.get_default().invalidate(*key[:2])
+
+    def _get_cached_data(self):
+        """Return metadata from the shared cache or retrieve it."""
+        cache = gcs_cache.MetadataCache.get_default()
+        key = self._cache_key()
+        if key is None or not cache.enabled:
+            return self._get_data()
+
+        data = cache.get(*key)
+        if data is gcs_cache.NOT_FOUND:
+            raise gcs_errors.NotFound()
+        if data is not None:
+            return data
+
+        # Expired metadata is only downloaded again if it has changed
+        stale = cache.get_stale(*key) or {}
+        etag = stale.get('etag')
         try:
-            data = self._get_data()
-            self._exists = True
+            data = self._get_data(**self._conditions(etag)) if etag else \
+                self._get_data()
         except gcs_errors.NotFound:
-            self._exists = False
-            attr_error()
-
-        self._fill_with_data(data)
-        return getattr(self, name)
-
-    def __setattr__(self, name, value, force_gcs=False):
-        if force_gcs or name in self._gcs_attrs:
-            self._gcs_attrs[name] = value
+            cache.put(*key)
+            raise
+        if data is None:
+            cache.renew(*key, etag=etag)
+            return stale
+        cache.put(*key, data=data)
+        return data
+
+    @staticmethod
+    def _conditions(etag=None, metageneration=None):
+        """Return _get_data arguments to only retrieve changed metadata."""
+        kwargs = {'ok': (requests.codes.ok, requests.codes.not_modified)}
+        if etag:
+            kwargs['headers'] = {'If-None-Match': etag}
         else:
-            super(Fillable, self).__setattr__(name, value)
+            kwargs['ifMetagenerationNotMatch'] = metageneration
+        return kwargs
 
-    def _fill_with_data(self, data):
-        self._data_retrieved = True
+    def _load_field(self, name, default=_MISSING):
+        """Return a field without value, retrieving metadata if needed."""
+        if not self._data_retrieved and self._exists is not False:
+            try:
+                data = self._get_cached_data()
+                self._exists = True
+            except gcs_errors.NotFound:
+                self._exists = False
+            else:
+                self._fill_with_data(data)
+                if name in self.__dict__:
+                    return self.__dict__[name]
+
+        if default is not _MISSING:
+            if isinstance(default, (dict, list, set)):
+                # Each instance gets its own copy of mutable defaults
+                default = self.__dict__[name] = copy.deepcopy(default)
+            return default
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (self.__class__.__name__, name))
+
+    def _fill_with_data(self, data, partial=False):
+        # Missing attributes of partial data will be retrieved when accessed
+        if not partial:
+            self._data_retrieved = True
+        values = self.__dict__
         for k, v in data.items():
             if isinstance(v, dict) and len(v) == 1:
                 if six.PY3:
                     v = tuple(v.values())[0]
                 else:
                     v = v.values()[0]
-            self.__setattr__(k, v, True)
+            values[k] = v
+
+    def _get_data(self, fields=None, **kwargs):
+        """Retrieve metadata of the resource.
 
-    def _get_data(self):
+        Additional arguments are passed to _request, and None is returned
+        when GCS replies that the metadata has not been modified.
+        """
         raise NotImplementedError
 
+    def reload(self, fields=None):
+        """Retrieve attributes from GCS, even if they were already retrieved.
+
+        :param fields: Partial response selector to only retrieve some
+                       attributes, like 'size,updated'.  Attributes that are
+                       not retrieved will be retrieved when they are first
+                       accessed.
+        :type fields: String
+        :returns: The instance itself.
+        """
+        cache = gcs_cache.MetadataCache.get_default()
+        key = self._cache_key()
+        try:
+            data = self._get_data(fields=fields) if fields else \
+                self._get_data()
+        except gcs_errors.NotFound:
+            self._exists = False
+            if key is not None:
+                cache.put(*key)
+            raise
+        self._exists = True
+        if key is not None and not fields:
+            cache.put(*key, data=data)
+        self._fill_with_data(data, partial=bool(fields))
+        return self
+
+    def refresh(self):
+        """Retrieve attributes from GCS only if they have changed.
+
+        The request is conditional on the etag of the attributes we have, or
+        on their metageneration if there's no etag, and GCS only returns the
+        attributes when they don't match.  Without any of them the
+        attributes are reloaded.
+
+        :returns: Whether attributes were retrieved.
+        :rtype: bool
+        """
+        values = self.__dict__
+        etag = values.get('etag')
+        metageneration = values.get('metageneration')
+        if not (etag or metageneration):
+            self.reload()
+            return True
+
+        cache = gcs_cache.MetadataCache.get_default()
+        key = self._cache_key()
+        try:
+            data = self._get_data(**self._conditions(etag, metageneration))
+        except gcs_errors.NotFound:
+            self._exists = False
+            if key is not None:
+                cache.put(*key)
+            raise
+        self._exists = True
+        if data is None:
+            if key is not None and etag:
+                cache.renew(*key, etag=etag)
+            return False
+        if key is not None:
+            cache.put(*key, data=data)
+        self._fill_with_data(data)
+        return True
+
+    def exists(self):
+        """Check if exists in GCS server."""
+        cache = gcs_cache.MetadataCache.get_default()
+        key = self._cache_key()
+        if key is not None and cache.enabled:
+            data = cache.get(*key)
+            if data is not None:
+                return data is not gcs_cache.NOT_FOUND
+
+        result = super(Fillable, self).exists()
+        if key is not None and not result:
+            cache.put(*key)
+        return result
+
+    def submit_reload(self):
+        """Retrieve attributes from GCS on the shared Executor.
+
+        :returns: Future that will hold the instance itself.
+        :rtype: concurrent.futures.Future
+        """
+        return self.submit('reload')
+
+
+def _add_fields(fields, *names):
+    """Add top level fields to a partial response selector if missing."""
+    top_level = fields
+    # Remove sub-selections, innermost first
+    while '(' in top_level:
+        top_level = re.sub(r'\([^()]*\)', '', top_level)
+    present = set(f.split('/')[0].strip() for f in top_level.split(','))
+    missing = [name for name in names if name not in present]
+    return ','.join([fields] + missing)
+
+
+def _split_fields(fields):
+    """Split a partial response selector in its top level selections."""
+    selections = []
+    depth = start = 0
+    for i, char in enumerate(fields):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and not depth:
+            selections.append(fields[start:i].strip())
+            start = i + 1
+    selections.append(fields[start:].strip())
+    return selections
+
+
+def _add_item_fields(fields, *names):
+    """Add fields of the items to a partial response selector if missing."""
+    selections = _split_fields(fields)
+    present = set()
+    sub_selection = None
+    for i, selection in enumerate(selections):
+        if selection == 'items':
+            # All fields of the items are already selected
+            return fields
+        if selection.startswith('items('):
+            sub_selection = i
+            present.update(f.split('/')[0] for f in
+                           _split_fields(selection[len('items('):-1]))
+        elif selection.startswith('items/'):
+            present.add(selection[len('items/'):].split('/')[0])
+    missing = [name for name in names if name not in present]
+    if not missing:
+        return fields
+    if sub_selection is None:
+        selections.append('items(%s)' % ','.join(missing))
+    else:
+        selections[sub_selection] = '%s,%s)' % (
+            selections[sub_selection][:-1], ','.join(missing))
+    return ','.join(selections)
+
+
+#: Size of the chunks read from the body of streamed listing pages.
+STREAM_CHUNK_SIZE = 16 * 1024
+
+_END = object()
+
+
+def _stream_members(r):
+    """Parse the members of a streamed listing page as they are received.
+
+    It doesn't reference the iterator that requested the page, so discarding
+    the iterator in the middle of a page also closes its response.
+    """
+    try:
+        for member in jsonstream.iter_object(
+                r.iter_content(STREAM_CHUNK_SIZE), ('items', 'prefixes')):
+            yield member
+    finally:
+        close = getattr(r, 'close', None)
+        if close:
+            close()
+
+
+class ListIterator(six.Iterator):
+    """Iterator over the results of a listing.
+
+    Pages are requested from GCS as they are needed, so only one page of
+    results is held in memory at any given time and iteration can be stopped
+    at any point without retrieving the rest of the listing.
+
+    :ivar page_token: Token to continue the listing from the first result that
+                      has not been returned yet, None if listing has not
+                      started or it has been completed.  If the iteration is
+                      stopped in the middle of a page, results from that page
+                      that had already been returned will be returned again
+                      when continuing the listing using this token.
+    :vartype page_token: String
+
+    :ivar count: Number of results returned.
+    :vartype count: int
+
+    :ivar pages: Number of pages retrieved from GCS.
+    :vartype pages: int
+
+    :ivar requests: Number of page requests sent to GCS, including retries.
+    :vartype requests: int
+
+    :ivar retries: Number of page requests that were retries of a failed
+                   request.
+    :vartype retries: int
+
+    Retries on transient errors are done per page, continuing from the last
+    page that was successfully retrieved.
+
+    When params include a fields partial response selector, the nextPageToken
+    field is added to it if missing.  When there is no item factory so are the
+    kind field and the item_fields of the items, and Fillable instances
+    created from the items will retrieve the attributes that were not
+    included the first time they are accessed.
+
+    When prefetch is enabled pages are requested on the shared Executor ahead
+    of the consumer, so up to prefetch pages will be held in memory.  When
+    the consumer is one of the Executor's workers they are requested in its
+    thread instead.
+
+    When stream is enabled pages are parsed as their body is received, and
+    results are returned as soon as they have been decoded, so neither the
+    whole body nor all the results of a page are held in memory.  Prefixes of
+    the page are returned after its items, like in the other modes.  Errors
+    reading the body in the middle of a page are not retried, and if
+    iteration continues after one the page will be requested again from its
+    start.
+
+    With a checkpoint the position is saved each time the consumer asks for
+    more results after having received a whole page, and it is removed once
+    the listing completes.
+    """
+
+    def __init__(self, parent, url, params, limit=None, prefetch=0,
+                 item_factory=None, checkpoint=None, stream=False,
+                 item_fields=()):
+        """Initialize a listing iterator.
+
+        :param parent: Instance whose contents we are listing.
+        :type parent: gcs_client.base.Listable
+        :param url: URL of the listing, it will be formatted with parent's
+                    attributes.
+        :type url: String
+        :param params: URL params for the listing requests.
+        :type params: dict
+        :param limit: Maximum number of results to return.
+        :type limit: int
+        :param prefetch: Number of pages to retrieve in the background ahead
+                         of the page being consumed.  Default is 0, which
+                         disables prefetching.
+        :type prefetch: int
+        :param item_factory: Callable that receives the data of an item and
+                             the parent and returns the result for the item.
+                             Default is to create the instance corresponding
+                             to the kind of item.
+        :type item_factory: callable
+        :param checkpoint: Checkpoint, or path to its file, used to save the
+                           position of the listing and to resume it.
+        :type checkpoint: gcs_client.checkpoint.Checkpoint or String
+        :param stream: Whether pages are parsed incrementally as they are
+                       received.  Cannot be used with prefetch.
+        :type stream: bool
+        :param item_fields: Fields of the items needed to create their
+                            instances, added to partial response selectors.
+        :type item_fields: tuple of strings
+        :raises: errors.Error if the checkpoint belongs to another listing.
+        :raises: ValueError if both prefetch and stream are requested.
+        """
+        if stream and prefetch:
+            raise ValueError('Streamed listings cannot prefetch pages')
+        fields = params.get('fields')
+        if isinstance(fields, six.string_types):
+            required = ('nextPageToken',)
+            if not item_factory:
+                required = ('kind',) + required
+                fields = _add_item_fields(fields, *item_fields)
+            params = dict(params, fields=_add_fields(fields, *required))
+        self.parent = parent
+        self.url = url
+        self.params = params
+        self.limit = limit
+        self.prefetch = prefetch
+        self.item_factory = item_factory
+        self.stream = stream
+        self.count = 0
+        self.pages = 0
+        self.requests = 0
+        self.retries = 0
+        self._retry_params = parent.retry_params
+        self.page_token = params.get('pageToken')
+        self._next_token = self.page_token
+        self._page = collections.deque()
+        self._started = False
+        # Number of results retrieved from GCS
+        self._fetched = 0
+        # Prefetching state
+        self._lock = threading.Condition(threading.RLock())
+        self._pages = collections.deque()
+        self._fetching = False
+        self._prefetch_token = self.page_token
+        self._prefetch_done = False
+        # Streaming state
+        self._stream = None
+        self._stream_kind = None
+        self._stream_items = []
+        self._stream_prefixes = []
+        self._stream_token = None
+        self._stream_error = None
+        # Checkpointing state
+        self._checkpoint = gcs_checkpoint.Checkpoint.get(checkpoint)
+        self._checkpoint_due = False
+        if self._checkpoint:
+            self._resume()
+
+    def _checkpoint_id(self):
+        return {'url': self.parent._format_url(self.url),
+                'params': self.params, 'limit': self.limit}
+
+    def _resume(self):
+        state = self._checkpoint.check('list', self._checkpoint_id())
+        if state:
+            self.page_token = state['page_token']
+            self._next_token = self._prefetch_token = self.page_token
+            self.count = self._fetched = state['count']
+            # A checkpoint without token was saved after the last page
+            self._started = not self.page_token
+
+    def _save_checkpoint(self):
+        self._checkpoint.save('list', self._checkpoint_id(),
+                              page_token=self.page_token, count=self.count)
+        self._checkpoint_due = False
+
+    def __iter__(self):
+        return self
+
+    @property
+    def done(self):
+        """Whether all results have already been returned."""
+        if self.limit is not None and self.count >= self.limit:
+            return True
+        return (self._started and not self._page and self._stream is None and
+                not self._next_token)
+
+    def __next__(self):
+        if self._stream_error:
+            exc_info, self._stream_error = self._stream_error, None
+            six.reraise(*exc_info)
+
+        # Consumer is done with the previous page, we can record it
+        if self._checkpoint_due:
+            self._save_checkpoint()
+
+        while not self._page:
+            if self._stream is not None:
+                self._pull_stream()
+                continue
+            if self.done:
+                if self._checkpoint:
+                    self._checkpoint.remove()
+                raise StopIteration
+            if self.stream:
+                self._stream = self._stream_page(self._next_token)
+            else:
+                self._page.extend(self._fetch_page())
+
+        if self.limit is not None and self.count >= self.limit:
+            if self._checkpoint:
+                self._checkpoint.remove()
+            raise StopIteration
+
+        self.count += 1
+        item = self._page.popleft()
+        # Read ahead to know if this was the last result of a streamed page
+        if not self._page and self._stream is not None:
+            try:
+                self._pull_stream()
+            except Exception:
+                # Return this result and raise the error on the next call
+                self._stream_error = sys.exc_info()
+                return item
+        # Once all items from the page have been returned we can move forward
+        if not self._page:
+            self.page_token = self._next_token
+            self._checkpoint_due = self._checkpoint is not None
+        return item
+
+    def _page_params(self, page_token):
+        params = dict(self.params, pageToken=page_token)
+        if self.limit is not None:
+            remaining = self.limit - self._fetched
+            max_results = params.get('maxResults')
+            if not max_results or max_results > remaining:
+                params['maxResults'] = remaining
+        return params
+
+    def _request_page(self, page_token):
+        """Request a page from GCS.
+
+        :returns: Tuple with the results and the token for the next page.
+        """
+        sent = self.requests
+        try:
+            r = self._get_page(self._page_params(page_token))
+        finally:
+            # Every request after the first one for this page was a retry
+            self.retries += self.requests - sent - 1
+        self.pages += 1
+        results = self._page_results(r)
+        self._fetched += len(results)
+        return results, r.get('nextPageToken')
+
+    @common.retry
+    def _get_page(self, params):
+        self.requests += 1
+        return transport.parse_json(
+            self.parent._request(parse=True, url=self.url, **params))
+
+    def _fetch_page(self):
+        """Retrieve next page of results."""
+        if self.prefetch:
+            results, next_token = self._get_prefetched_page()
+        else:
+            results, next_token = self._request_page(self._next_token)
+        self._started = True
+        self._next_token = next_token
+        return results
+
+    def _pull_stream(self):
+        """Move next results of the page being streamed to the page."""
+        while not self._page:
+            try:
+                member = next(self._stream, _END)
+            except Exception:
+                # Page will be requested again if iteration continues
+                self._stream = None
+                raise
+            if member is _END:
+                self._end_stream()
+                return
+            key, value = member
+            if key == 'items':
+                # Without item factory we need the kind of the items
+                if self.item_factory or self._stream_kind:
+                    self._fetched += 1
+                    self._page.append(
+                        self._item_result(self._stream_kind, value))
+                else:
+                    self._stream_items.append(value)
+            elif key == 'prefixes':
+                self._stream_prefixes.append(value)
+            elif key == 'kind':
+                self._stream_kind = value
+            elif key == 'nextPageToken':
+                self._stream_token = value
+
+    def _end_stream(self):
+        """Add results held until the streamed page was parsed to the page."""
+        self._stream = None
+        self._started = True
+        self._next_token = self._stream_token
+        results = [self._item_result(self._stream_kind, data)
+                   for data in self._stream_items]
+        results.extend(self._prefix_result(prefix)
+                       for prefix in self._stream_prefixes)
+        self._fetched += len(results)
+        self._page.extend(results)
+
+    @common.retry
+    def _open_stream(self, params):
+        self.requests += 1
+        return self.parent._request(url=self.url, stream=True, **params)
+
+    def _stream_page(self, page_token):
+        """Request a page from GCS to parse it as it's received.
+
+        :returns: Generator of the members of the page, see _pull_stream.
+        """
+        sent = self.requests
+        try:
+            r = self._open_stream(self._page_params(page_token))
+        finally:
+            self.retries += self.requests - sent - 1
+        self.pages += 1
+        self._stream_kind = self._stream_token = None
+        self._stream_items = []
+        self._stream_prefixes = []
+        return _stream_members(r)
+
+    def _get_prefetched_page(self):
+        with self._lock:
+            while not self._pages:
+                self._prefetch_pages()
+                if not self._pages:
+                    if not self._fetching:
+                        return [], None
+                    # Wait for the page in flight to request the next one
+                    self._lock.wait()
+            future = self._pages.popleft()
+        try:
+            result = future.result()
+        except Exception:
+            with self._lock:
+                while self._fetching:
+                    self._lock.wait()
+                # Failed page will be requested again if iteration continues
+                self._prefetch_done = False
+            raise
+        # We have made room for another page
+        self._prefetch_pages()
+        return result
+
+    def _prefetch_pages(self):
+        """Request next page if there's room for it and none is in flight."""
+        with self._lock:
+            if (self._fetching or self._prefetch_done or
+                    len(self._pages) >= self.prefetch):
+                return
+            self._fetching = True
+            future = common.Executor.get_default().nested().submit(
+                self._request_page, self._prefetch_token)
+            self._pages.append(future)
+            future.add_done_callback(self._page_prefetched)
+
+    def _page_prefetched(self, future):
+        with self._lock:
+            self._fetching = False
+            if future.exception():
+                self._prefetch_done = True
+            else:
+                self._prefetch_token = future.result()[1]
+                self._prefetch_done = not self._prefetch_token or (
+                    self.limit is not None and self._fetched >= self.limit)
+            self._prefetch_pages()
+            self._lock.notify_all()
+
+    def _item_result(self, kind, data):
+        """Transform data of an item into its result."""
+        parent = self.parent
+        if self.item_factory:
+            return self.item_factory(data, parent)
+        # Items of partial responses are missing some attributes
+        kwargs = {'partial': True} if self.params.get('fields') else {}
+        return gcs_factory(kind, data, parent.credentials,
+                           parent.retry_params, **kwargs)
+
+    def _prefix_result(self, prefix):
+        """Transform a prefix into its result."""
+        parent = self.parent
+        return gcs_factory('storage#prefix', parent.name, prefix,
+                           self.params.get('delimiter'), parent.credentials,
+                           parent.retry_params)
+
+    def _page_results(self, r):
+        """Transform data from a page in GCS into class instances."""
+        items = r.get('items', [])
+        kind = r['kind'] if items and not self.item_factory else None
+        result = [self._item_result(kind, b) for b in items]
+        result.extend(self._prefix_result(prefix)
+                      for prefix in r.get('prefixes', ()))
+        return result
+
 
 class Listable(GCS):
     __metaclass__ = abc.ABCMeta
 
     @common.is_complete
-    @common.retry
-    def _list(self, _list_url=None, **kwargs):
-        # Get url and child class
-        if not _list_url:
-            _list_url = self._list_url
-
-        # Retrieve the list from GCS
-        result = []
-        while True:
-            # Get the first page of items
-            r = self._request(parse=True, url=_list_url, **kwargs).json()
-
-            # Transform data from GCS into classes
-            result.extend(gcs_factory(r['kind'], b, self.credentials,
-                                      self.retry_params)
-                          for b in r.get('items', []))
-
-            if r.get('prefixes'):
-                result.extend(gcs_factory('storage#prefix', self.name, prefix,
-                                          kwargs.get('delimiter'),
-                                          self.credentials,
-                                          self.retry_params)
-                              for prefix in r.get('prefixes', []))
-
-            kwargs['pageToken'] = r.get('nextPageToken')
-            if not kwargs['pageToken']:
-                break
+    def _iter_list(self, _list_url=None, _limit=None, _prefetch=0,
+                   _item_factory=None, _checkpoint=None, _stream=False,
+                   **kwargs):
+        return ListIterator(self, _list_url or self._list_url, kwargs, _limit,
+                            _prefetch, _item_factory, _checkpoint, _stream,
+                            self._list_item_fields)
 
-        return result
+    @common.is_complete
+    def _list(self, _list_url=None, **kwargs):
+        # Retrieve the whole list from GCS, pages are retried individually
+        return list(self._iter_list(_list_url, **kwargs))
 
     list = _list
+    iter_list = _iter_list
 
     _list_url = None
+    # Fields of the listed items needed to create their instances
+    _list_item_fields = ()
 
 
 def all_subclasses(cls):
@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from __future__ import absolute_import
+
+from concurrent import futures
+import json
+import re
+import time
+import uuid
+
+import requests
+import six
+from six.moves.urllib import parse
+
+from gcs_client import cache as gcs_cache
+from gcs_client import common
+from gcs_client import errors
+from gcs_client import transport
+
+
+#: Maximum number of calls GCS accepts in a single batch request.
+MAX_BATCH_SIZE = 100
+
+
+def _camel_case(name):
+    first, __, rest = name.partition('_')
+    return first + ''.join(word.capitalize() for word in rest.split('_'))
+
+
+class _Operation(object):
+    def __init__(self, method, path, params, body, on_success, on_error):
+        self.method = method
+        self.path = path
+        self.params = params
+        self.body = body
+        self.on_success = on_success
+        self.on_error = on_error
+        self.future = futures.Future()
+
+    def encode(self, content_id):
+        params = [(k, six.text_type(v)) for k, v in self.params.items()
+                  if v is not None]
+        path = self.path
+        if params:
+            path += ('&' if '?' in path else '?') + parse.urlencode(params)
+        lines = ['Content-Type: application/http',
+                 'Content-Transfer-Encoding: binary',
+                 'Content-ID: <%s>' % content_id,
+                 '',
+                 '%s %s HTTP/1.1' % (self.method, path)]
+        body = ''
+        if self.body is not None:
+            body = json.dumps(self.body)
+            lines.append('Content-Type: application/json; charset=UTF-8')
+            lines.append('Content-Length: %s' % len(body.encode('utf-8')))
+        lines.extend(('', body))
+        return '\r\n'.join(lines)
+
+    def resolve(self, status_code, content):
+        try:
+            if status_code in (requests.codes.ok, requests.codes.no_content):
+                self.future.set_result(self.on_success(content))
+            else:
+                self.future.set_result(
+                    self.on_error(
+                        errors.create_http_exception(status_code, content)))
+        except Exception as exc:
+            self.future.set_exception(exc)
+
+
+def _raise(exc):
+    raise exc
+
+
+def _generation(resource):
+    # The generation Objects were created for, not the retrieved one.  Don't
+    # use getattr, buckets don't have a generation.
+    return vars(resource).get('_generation')
+
+
+def _cache_put(resource, generation, data=None):
+    # Share complete metadata, or that the resource doesn't exist, under the
+    # generation that was requested
+    cache = gcs_cache.MetadataCache.get_default()
+    key = cache.enabled and resource._cache_key()
+    if key:
+        cache.put(key[0], key[1],
+                  None if generation is None else str(generation), data=data)
+
+
+class Batch(object):
+    """Group operations on GCS resources in JSON API batch requests.
+
+    Operations are queued and sent in multipart batch requests of up to
+    MAX_BATCH_SIZE calls when flush is called, or when leaving the context if
+    the batch is used as a context manager.  Each operation returns a
+    concurrent.futures.Future that will hold its result or exception once the
+    batch has been flushed.
+
+    .. code-block:: python
+
+        with bucket.batch() as b:
+            deleted = [b.delete(obj) for obj in bucket.list(prefix='tmp/')]
+        errors = [f.exception() for f in deleted if f.exception()]
+
+    Operations failing with transient errors are retried according to the
+    retry configuration.
+    """
+    _URL = transport.DEFAULT_ENDPOINT + '/batch/storage/v1'
+
+    def __init__(self, credentials, retry_params=None,
+                 max_size=MAX_BATCH_SIZE):
+        """Initialize a batch.
+
+        :param credentials: A credentials object to authorize the connection.
+        :type credentials: gcs_client.Credentials
+        :param retry_params: Retry configuration used for communications with
+                             GCS.  If None is passed default retries will be
+                             used.
+        :type retry_params: RetryParams or NoneType
+        :param max_size: Maximum number of operations to send in each batch
+                         request.  Cannot be greater than MAX_BATCH_SIZE.
+        :type max_size: int
+        """
+        assert 0 < max_size <= MAX_BATCH_SIZE, \
+            'max_size must be between 1 and %s' % MAX_BATCH_SIZE
+        self.credentials = credentials
+        self._retry_params = retry_params or common.RetryParams.get_default()
+        self.max_size = max_size
+        self._operations = []
+
+    def __len__(self):
+        return len(self._operations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def _add(self, method, resource, params=None, body=None,
+             on_success=None, on_error=_raise):
+        path = resource._format_url(resource._URL)
+        path = path[len(transport.DEFAULT_ENDPOINT):]
+        params = dict(params or {})
+        # Objects refer to the generation they were created for, if any
+        if 'generation' in params and not params['generation']:
+            params['generation'] = _generation(resource)
+        op = _Operation(method, path, params, body,
+                        on_success or (lambda content: None), on_error)
+        self._operations.append(op)
+        return op.future
+
+    @staticmethod
+    def _params(kwargs):
+        return {_camel_case(k): v for k, v in kwargs.items()}
+
+    def get(self, resource, **kwargs):
+        """Queue retrieval of the attributes of an Object or Bucket.
+
+        The resource will be filled with the retrieved data.
+
+        :param resource: Resource to retrieve.
+        :type resource: gcs_client.Object or gcs_client.Bucket
+        :param kwargs: Additional parameters for the call, like projection.
+        :returns: Future that will hold the resource.
+        :rtype: concurrent.futures.Future
+        """
+        params = self._params(kwargs)
+        generation = params.get('generation') or _generation(resource)
+
+        def on_success(content):
+            data = transport.loads(content)
+            if not params.get('fields'):
+                _cache_put(resource, generation, data)
+            resource._exists = True
+            resource._fill_with_data(data)
+            return resource
+
+        def on_error(exc):
+            if isinstance(exc, errors.NotFound):
+                _cache_put(resource, generation)
+                resource._exists = False
+            raise exc
+
+        params['generation'] = generation
+        return self._add('GET', resource, params, on_success=on_success,
+                         on_error=on_error)
+
+    def exists(self, resource):
+        """Queue an existence check of an Object or Bucket.
+
+        :param resource: Resource to check.
+        :type resource: gcs_client.Object or gcs_client.Bucket
+        :returns: Future that will hold True or False.
+        :rtype: concurrent.futures.Future
+        """
+        generation = _generation(resource)
+
+        def on_error(exc):
+            if isinstance(exc, errors.NotFound):
+                _cache_put(resource, generation)
+            if isinstance(exc, (errors.NotFound, errors.BadRequest)):
+                return False
+            raise exc
+
+        return self._add('GET', resource,
+                         {'fields': 'name', 'generation': generation},
+                         on_success=lambda content: True, on_error=on_error)
+
+    def delete(self, resource, **kwargs):
+        """Queue deletion of an Object or Bucket.
+
+        :param resource: Resource to delete.
+        :type resource: gcs_client.Object or gcs_client.Bucket
+        :param kwargs: Same arguments as the delete method of the resource,
+                       like if_generation_match.
+        :returns: Future that will hold None.
+        :rtype: concurrent.futures.Future
+        """
+        params = self._params(kwargs)
+        params.setdefault('generation', None)
+        return self._add('DELETE', resource, params,
+                         on_success=lambda content:
+                         resource._invalidate_cache())
+
+    def patch(self, resource, body, **kwargs):
+        """Queue an update of the metadata of an Object or Bucket.
+
+        Only the attributes present in body will be modified, and the
+        resource will be filled with the resulting metadata.
+
+        :param resource: Resource to update.
+        :type resource: gcs_client.Object or gcs_client.Bucket
+        :param body: Attributes to change, for example
+                     {'metadata': {'key': 'value'}}.
+        :type body: dict
+        :param kwargs: Additional parameters for the call, like
+                       if_metageneration_match.
+        :returns: Future that will hold the resource.
+        :rtype: concurrent.futures.Future
+        """
+        def on_success(content):
+            resource._invalidate_cache()
+            resource._exists = True
+            resource._fill_with_data(transport.loads(content))
+            return resource
+
+        params = self._params(kwargs)
+        params.setdefault('generation', None)
+        return self._add('PATCH', resource, params, body, on_success)
+
+    def flush(self):
+        """Send all queued operations to GCS.
+
+        Results of the operations are available on their futures once this
+        method returns.
+        """
+        operations, self._operations = self._operations, []
+        for i in range(0, len(operations), self.max_size):
+            self._send(operations[i:i + self.max_size])
+
+    def _send(self, operations):
+        retry_params = self._retry_params
+        delay = 0
+        n = 0  # Retry number
+        while operations:
+            responses = self._request(operations)
+            failed = []
+            for op, (status_code, content) in zip(operations, responses):
+                if (status_code in common.DEFAULT_RETRY_CODES and
+                        retry_params and n < retry_params.max_retries):
+                    failed.append(op)
+                else:
+                    op.resolve(status_code, content)
+
+            operations = failed
+            if operations:
+                n += 1
+                delay, wait = common._backoff(retry_params, n, delay)
+                time.sleep(wait)
+
+    @common.retry
+    def _request(self, operations):
+        boundary = uuid.uuid4().hex
+        parts = ['--%s\r\n%s' % (boundary, op.encode(i))
+                 for i, op in enumerate(operations)]
+        body = '\r\n'.join(parts) + '\r\n--%s--\r\n' % boundary
+        headers = dict(transport.GZIP_HEADERS,
+                       Authorization=self.credentials.authorization)
+        headers['Content-Type'] = 'multipart/mixed; boundary=%s' % boundary
+        r = transport.Transport.get_default().post(
+            self._URL, headers=headers, data=body.encode('utf-8'))
+        if r.status_code != requests.codes.ok:
+            raise errors.create_http_exception(r.status_code, r.content)
+
+        responses = parse_multipart(r.headers.get('Content-Type', ''),
+                                    r.content)
+        result = []
+        for i in range(len(operations)):
+            response = responses.get('response-%s' % i)
+            if response is None:
+                response = (requests.codes.internal_server_error,
+                            b'Missing response in batch')
+            result.append(response)
+        return result
+
+
+def encode_multipart(responses):
+    """Build a multipart batch response.
+
+    :param responses: List of (content_id, status_code, headers, content)
+    :returns: Tuple with the content type and the body of the response.
+    """
+    boundary = 'batch_' + uuid.uuid4().hex
+    parts = []
+    for content_id, status_code, headers, content in responses:
+        lines = ['--' + boundary,
+                 'Content-Type: application/http',
+                 'Content-ID: <response-%s>' % content_id,
+                 '',
+                 'HTTP/1.1 %s %s' % (status_code,
+                                     requests.status_codes._codes.get(
+                                         status_code, ('',))[0].upper())]
+        lines.extend('%s: %s' % item for item in headers.items())
+        lines.extend(('', ''))
+        parts.append('\r\n'.join(lines).encode('utf-8') + content)
+    body = b'\r\n'.join(parts) + ('\r\n--%s--\r\n' % boundary).encode('utf-8')
+    return 'multipart/mixed; boundary=' + boundary, body
+
+
+def _split_multipart(content_type, content):
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise errors.Error('Batch response is not multipart: %s' % content)
+    delimiter = b'--' + match.group(1).encode('ascii')
+    for part in content.split(delimiter)[1:]:
+        if part.startswith(b'--'):
+            break
+        headers, __, payload = part.lstrip(b'\r\n').partition(b'\r\n\r\n')
+        headers = dict(
+            (k.strip().lower(), v.strip()) for k, __, v in
+            (line.partition(':') for line in
+             headers.decode('utf-8').split('\r\n') if line))
+        content_id = headers.get('content-id', '').strip('<>')
+        yield content_id, payload
+
+
+def parse_multipart(content_type, content):
+    """Parse a multipart batch response.
+
+    :param content_type: Content-Type header of the response.
+    :type content_type: String
+    :param content: Body of the response.
+    :type content: bytes
+    :returns: Dictionary mapping Content-ID to (status_code, content)
+    :rtype: dict
+    """
+    result = {}
+    for content_id, payload in _split_multipart(content_type, content):
+        status_line, __, rest = payload.partition(b'\r\n')
+        __, __, body = rest.partition(b'\r\n\r\n')
+        if body.endswith(b'\r\n'):
+            body = body[:-2]
+        status_code = int(status_line.split()[1])
+        result[content_id] = (status_code, body)
+    return result
+
+
+def parse_multipart_request(content_type, content):
+    """Parse a multipart batch request.
+
+    :param content_type: Content-Type header of the request.
+    :type content_type: String
+    :param content: Body of the request.
+    :type content: bytes
+    :returns: List of (content_id, method, path, headers, body)
+    :rtype: list
+    """
+    result = []
+    for content_id, payload in _split_multipart(content_type, content):
+        head, __, body = payload.partition(b'\r\n\r\n')
+        if body.endswith(b'\r\n'):
+            body = body[:-2]
+        lines = head.decode('utf-8').split('\r\n')
+        method, path = lines[0].split()[:2]
+        headers = dict((k.strip(), v.strip()) for k, __, v in
+                       (line.partition(':') for line in lines[1:] if line))
+        result.append((content_id, method, path, headers, body))
+    return result
@@ -15,11 +15,118 @@
 
 from __future__ import absolute_import
 
+import bisect
+import collections
+from concurrent import futures
+import os
+import string
+
 import requests
 
 from gcs_client import base
+from gcs_client import batch as gcs_batch
+from gcs_client import cache as gcs_cache
+from gcs_client import checkpoint as gcs_checkpoint
+from gcs_client import columns
 from gcs_client import common
+from gcs_client import diff as gcs_diff
+from gcs_client import errors
 from gcs_client import gcs_object
+from gcs_client import prefix as gcs_prefix
+from gcs_client import query as gcs_query
+from gcs_client import transport
+from gcs_client import usage as gcs_usage
+
+
+def _alphabet(chars):
+    """Sorted characters that can be used in a position of a name."""
+    chars = set(chars)
+    # Sampled names come from the beginning of the key space, so when we see
+    # a digit or a letter we assume the whole class is used.
+    for char_class in (string.digits, string.ascii_lowercase,
+                       string.ascii_uppercase):
+        if chars.intersection(char_class):
+            chars.update(char_class)
+    return sorted(chars)
+
+
+def _points_after(common, names, start, count, end):
+    """Split points for the names starting with common.
+
+    :returns: Tuple with the split points and whether the names are likely
+              to continue after the ones starting with common.
+    """
+    suffixes = [name[len(common):] for name in names]
+    default = _alphabet(c for suffix in suffixes for c in suffix)
+    if len(default) < 2:
+        default = _alphabet(default + ['0', 'z'])
+
+    alphabets = []
+    size = 1
+    while size < count * 16:
+        position = len(alphabets)
+        alphabet = _alphabet(s[position] for s in suffixes
+                             if len(s) > position)
+        alphabets.append(alphabet or default)
+        size *= len(alphabets[-1])
+
+    def value(name):
+        suffix = name[len(common):]
+        num = 0
+        for i, alphabet in enumerate(alphabets):
+            digit = 0
+            if i < len(suffix):
+                digit = max(0, bisect.bisect_right(alphabet, suffix[i]) - 1)
+            num = num * len(alphabet) + digit
+        return num
+
+    low = value(start) + 1
+    high = size
+    # An end outside of common is after all the names starting with it
+    if end is not None and end.startswith(common):
+        high = value(end)
+        beyond = False
+    else:
+        # Sample covers more key space than what's left for common
+        beyond = high - low < low - value(min(names))
+
+    points = []
+    for i in range(1, count):
+        num = low + (high - low) * i // count
+        digits = []
+        for alphabet in reversed(alphabets):
+            num, digit = divmod(num, len(alphabet))
+            digits.append(alphabet[digit])
+        point = common + ''.join(reversed(digits))
+        if (point > start and (not points or point > points[-1]) and
+                (end is None or point < end)):
+            points.append(point)
+    return points, beyond
+
+
+def _split_points(names, prefix, start, count, end=None):
+    """Choose names that split the key space after start in count ranges.
+
+    Names after the longest prefix shared by the sampled names and start are
+    considered numbers, whose digits in each position are the characters
+    seen in that position of the sampled names, and the interval between
+    start and the end of the key space for that shared prefix is divided in
+    count ranges of the same size.  If the sample suggests names continue
+    after that space, the shared prefix is shortened.
+
+    :returns: Sorted list of up to count - 1 names greater than start and
+              lower than end.
+    """
+    names = list(names) + [start]
+    common = os.path.commonprefix(names)
+    # With a single distinct name we don't know which characters change
+    if common == start or len(common) < len(prefix):
+        common = prefix
+    while True:
+        points, beyond = _points_after(common, names, start, count, end)
+        if (points and not beyond) or len(common) <= len(prefix):
+            return points
+        common = common[:-1]
 
 
 class Bucket(base.Fillable, base.Listable):
@@ -70,9 +177,19 @@ class Bucket(base.Fillable, base.Listable):
     """
 
     kind = 'storage#buckets'
+    _fields = ('acl', 'autoclass', 'billing', 'cors',
+               'customPlacementConfig', 'defaultEventBasedHold',
+               'defaultObjectAcl', 'encryption', 'etag',
+               'hierarchicalNamespace', 'iamConfiguration', 'id', 'labels',
+               'lifecycle', 'location', 'locationType', 'logging',
+               'metageneration', 'name', 'objectRetention', 'owner',
+               'projectNumber', 'retentionPolicy', 'rpo', 'satisfiesPZS',
+               'selfLink', 'softDeletePolicy', 'storageClass', 'timeCreated',
+               'updated', 'versioning', 'website')
     _required_attributes = base.GCS._required_attributes + ['name']
     _URL = base.Fillable._URL + '/{name}'
     _list_url = base.Fillable._URL + '/{name}/o'
+    _list_item_fields = ('bucket', 'name')
 
     def __init__(self, name=None, credentials=None, retry_params=None):
         """Initialize a Bucket object.
@@ -89,13 +206,21 @@ class Bucket(base.Fillable, base.Listable):
         super(Bucket, self).__init__(credentials, retry_params)
         self.name = name
 
+    def _cache_key(self):
+        return (self.name, None, None)
+
     @common.retry
-    def _get_data(self):
-        r = self._request(parse=True)
-        return r.json()
+    def _get_data(self, fields=None, **kwargs):
+        params = {'fields': fields} if fields else {}
+        params.update(kwargs)
+        r = self._request(parse=True, **params)
+        if r.status_code == requests.codes.not_modified:
+            return None
+        return transport.parse_json(r)
 
     def list(self, prefix=None, maxResults=None, versions=None, delimiter=None,
-             projection=None, pageToken=None):
+             projection=None, pageToken=None, records=False, matchGlob=None,
+             fields=None):
         """List Objects matching the criteria contained in the Bucket.
 
         In conjunction with the prefix filter, the use of the delimiter
@@ -150,12 +275,137 @@ class Bucket(base.Fillable, base.Listable):
                            new object in subsequent listing results if it is in
                            part of the object namespace already listed.
         :type pageToken: String
+        :param records: If True objects will be returned as ObjectRecord
+                        instances instead of Object instances.
+        :type records: bool
+        :param matchGlob: Filter results on the server to objects whose names
+                          match this glob.  See gcs_client.query for the
+                          syntax.
+        :type matchGlob: String
+        :param fields: Partial response selector to only retrieve some
+                       attributes, for example 'items(size),prefixes'.  The
+                       bucket and name of the objects are always included,
+                       and objects will retrieve attributes that were not
+                       included when they are first accessed.
+        :type fields: String
         :returns: List of objects and prefixes that match the criteria.
         :rtype: List of gcs_client.Object and gcs_client.Prefix.
         """
+        kwargs = gcs_object.ObjectRecord._list_kwargs(records, fields)
         return self._list(prefix=prefix, maxResults=maxResults,
                           versions=versions, delimiter=delimiter,
-                          projection=projection, pageToken=pageToken)
+                          projection=projection, pageToken=pageToken,
+                          matchGlob=matchGlob,
+                          **kwargs)
+
+    def iter_list(self, prefix=None, maxResults=None, versions=None,
+                  delimiter=None, projection=None, pageToken=None,
+                  limit=None, prefetch=0, records=False, checkpoint=None,
+                  matchGlob=None, fields=None, stream=False):
+        """Iterate over Objects matching the criteria contained in the Bucket.
+
+        Same as list, but results are retrieved from GCS one page at a time
+        as they are consumed instead of retrieving all of them beforehand.
+
+        Arguments are the same as in list, with the addition of:
+
+        :param limit: Maximum number of results to return.
+        :type limit: int
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being consumed.  Default is 0, which
+                         disables prefetching.
+        :type prefetch: int
+        :param records: If True objects will be returned as ObjectRecord
+                        instances instead of Object instances.
+        :type records: bool
+        :param checkpoint: Checkpoint, or path to its file, where the position
+                           of the listing is saved as results are consumed,
+                           and from which an interrupted listing with the same
+                           arguments is resumed.
+        :type checkpoint: gcs_client.checkpoint.Checkpoint or String
+        :param stream: If True pages are parsed as they are received and
+                       results are returned as soon as they are decoded, which
+                       reduces memory usage of large pages.  Cannot be used
+                       with prefetch.
+        :type stream: bool
+        :returns: Iterator over the results, its page_token attribute can be
+                  used to continue the listing later.
+        :rtype: gcs_client.base.ListIterator
+        """
+        kwargs = gcs_object.ObjectRecord._list_kwargs(records, fields)
+        return self._iter_list(prefix=prefix, maxResults=maxResults,
+                               versions=versions, delimiter=delimiter,
+                               projection=projection, pageToken=pageToken,
+                               matchGlob=matchGlob, _limit=limit,
+                               _prefetch=prefetch, _checkpoint=checkpoint,
+                               _stream=stream, **kwargs)
+
+    def query(self, pattern=None, prefix=None, match_glob=True,
+              versions=None, records=False, prefetch=0):
+        """Create a query to list Objects filtering them by name, size or time.
+
+        .. code-block:: python
+
+            query = bucket.query('logs/2026-10-*/*.parquet')
+            recent = query.updated(after='2026-10-15T00:00:00Z')
+            for obj in recent.size(min_size=1):
+                process(obj)
+
+        :param pattern: Glob that object names must match.  The listing will
+                        start from its literal prefix.
+        :type pattern: String
+        :param prefix: Only return objects whose names begin with this prefix.
+        :type prefix: String
+        :param match_glob: Whether the glob is sent to GCS in the matchGlob
+                           parameter.  If False directory levels of the glob
+                           are listed using the "/" delimiter instead.
+        :type match_glob: bool
+        :param versions: If True, lists all versions of an object as distinct
+                         results.  The default is False.
+        :type versions: bool
+        :param records: If True objects will be returned as ObjectRecord
+                        instances instead of Object instances.
+        :type records: bool
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being consumed.
+        :type prefetch: int
+        :returns: Query that can be iterated and further filtered.
+        :rtype: gcs_client.query.Query
+        """
+        result = gcs_query.Query(self, prefix, match_glob, versions, records,
+                                 prefetch)
+        return result.glob(pattern) if pattern is not None else result
+
+    def list_columns(self, prefix=None, versions=None, delimiter=None,
+                     maxResults=None, prefetch=0):
+        """List Objects in the Bucket into columns.
+
+        Instead of creating an instance for each object, attributes are
+        appended page by page to compact columns.
+
+        :param prefix: Filter results to objects whose names begin with this
+                       prefix.
+        :type prefix: String
+        :param versions: If True, lists all versions of an object as distinct
+                         results.  The default is False.
+        :type versions: bool
+        :param delimiter: Returns results in a directory-like mode, prefixes
+                          will be available in the prefixes attribute of the
+                          result.
+        :type delimiter: String
+        :param maxResults: Maximum number of items plus prefixes per page.
+        :type maxResults: Unsigned integer
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being processed.
+        :type prefetch: int
+        :returns: Columns with the attributes of the objects.
+        :rtype: gcs_client.columns.ObjectColumns
+        """
+        result = columns.ObjectColumns()
+        return result.extend(self._iter_list(
+            prefix=prefix, versions=versions, delimiter=delimiter,
+            maxResults=maxResults, fields=result.FIELDS, _prefetch=prefetch,
+            _item_factory=result._append))
 
     @common.retry
     def delete(self, if_metageneration_match=None,
@@ -177,6 +427,7 @@ class Bucket(base.Fillable, base.Listable):
         self._request(op='DELETE', ok=(requests.codes.no_content,),
                       ifMetagenerationMatch=if_metageneration_match,
                       ifMetagenerationNotMatch=if_metageneration_not_match)
+        self._invalidate_cache()
 
     def open(self, name, mode='r', generation=None, chunksize=None):
         """Open an object from the Bucket.
@@ -199,6 +450,450 @@ class Bucket(base.Fillable, base.Listable):
                                 self.retry_params, chunksize)
         return obj.open(mode)
 
+    def submit_list(self, *args, **kwargs):
+        """List Objects in the Bucket on the shared Executor.
+
+        Accepts the same arguments as the list method.
+
+        :returns: Future that will hold the list of objects and prefixes.
+        :rtype: concurrent.futures.Future
+        """
+        return self.submit('list', *args, **kwargs)
+
+    def _read(self, name, generation=None, chunksize=None):
+        with self.open(name, 'r', generation, chunksize) as f:
+            return f.read()
+
+    def submit_read(self, name, generation=None, chunksize=None):
+        """Read the contents of an object on the shared Executor.
+
+        :param name: Name of the object to read.
+        :type name: String
+        :param generation: If present, selects a specific revision of this
+                           object (as opposed to the latest version, the
+                           default).
+        :type generation: long
+        :param chunksize: Size in bytes of the payload to receive from GCS.
+                          Default is gcs_client.DEFAULT_BLOCK_SIZE
+        :type chunksize: int
+        :returns: Future that will hold the bytes of the object.
+        :rtype: concurrent.futures.Future
+        """
+        return self.submit('_read', name, generation, chunksize)
+
+    def _write(self, name, data, chunksize=None):
+        with self.open(name, 'w', chunksize=chunksize) as f:
+            f.write(data)
+
+    def submit_write(self, name, data, chunksize=None):
+        """Upload an object to the Bucket on the shared Executor.
+
+        :param name: Name of the object to write.
+        :type name: String
+        :param data: Contents of the object.
+        :type data: bytes
+        :param chunksize: Size in bytes of the payload to send to GCS.
+                          Default is gcs_client.DEFAULT_BLOCK_SIZE
+        :type chunksize: int
+        :returns: Future that will hold None once the object is written.
+        :rtype: concurrent.futures.Future
+        """
+        return self.submit('_write', name, data, chunksize)
+
+    def _stat_objects(self, names, exists):
+        objects = [gcs_object.Object(self.name, name, None, self.credentials,
+                                     self.retry_params) for name in names]
+        with self.batch(len(objects)) as b:
+            results = [b.exists(obj) if exists else b.get(obj)
+                       for obj in objects]
+        if exists:
+            return [future.result() for future in results]
+
+        found = []
+        for obj, future in zip(objects, results):
+            try:
+                future.result()
+            except errors.NotFound:
+                obj = None
+            found.append(obj)
+        return found
+
+    def _stat_many(self, names, concurrency, batch_size, exists):
+        names = list(names)
+        results = [None] * len(names)
+        cache = gcs_cache.MetadataCache.get_default()
+        missing = []
+        for i, name in enumerate(names):
+            data = cache.get(self.name, name) if cache.enabled else None
+            if data is None:
+                missing.append(i)
+            elif exists:
+                results[i] = data is not gcs_cache.NOT_FOUND
+            elif data is not gcs_cache.NOT_FOUND:
+                results[i] = gcs_object.Object._obj_from_data(
+                    data, self.credentials, self.retry_params)
+
+        chunks = collections.deque(missing[i:i + batch_size]
+                                   for i in range(0, len(missing), batch_size))
+        executor = common.Executor.get_default().nested()
+        # Positions of the names each running future is retrieving
+        running = {}
+        try:
+            while chunks or running:
+                while chunks and len(running) < concurrency:
+                    chunk = chunks.popleft()
+                    future = executor.submit(self._stat_objects,
+                                             [names[i] for i in chunk],
+                                             exists)
+                    running[future] = chunk
+                done, __ = futures.wait(running,
+                                        return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    chunk = running.pop(future)
+                    for i, result in zip(chunk, future.result()):
+                        results[i] = result
+        finally:
+            for future in running:
+                future.cancel()
+        return results
+
+    def get_objects(self, names, concurrency=10,
+                    batch_size=gcs_batch.MAX_BATCH_SIZE):
+        """Retrieve the metadata of many objects of the Bucket.
+
+        Names are grouped in batch requests of batch_size calls that are sent
+        concurrently on the shared Executor, and metadata already in the
+        default MetadataCache is not requested again.
+
+        .. code-block:: python
+
+            objects = bucket.get_objects(manifest)
+            missing = [n for n, o in zip(manifest, objects) if o is None]
+
+        :param names: Names of the objects.
+        :type names: Iterable of strings
+        :param concurrency: Maximum number of batch requests in flight.
+        :type concurrency: int
+        :param batch_size: Number of objects retrieved in each batch request.
+                           Cannot be greater than MAX_BATCH_SIZE.
+        :type batch_size: int
+        :returns: Filled gcs_client.Object instances, in the same order as
+                  names, with None for the objects that don't exist.
+        :rtype: list
+        """
+        return self._stat_many(names, concurrency, batch_size, exists=False)
+
+    def exists_many(self, names, concurrency=10,
+                    batch_size=gcs_batch.MAX_BATCH_SIZE):
+        """Check if many objects exist in the Bucket.
+
+        Checks are done like retrievals in get_objects, but only the name of
+        each object is requested.
+
+        :param names: Names of the objects.
+        :type names: Iterable of strings
+        :param concurrency: Maximum number of batch requests in flight.
+        :type concurrency: int
+        :param batch_size: Number of objects checked in each batch request.
+                           Cannot be greater than MAX_BATCH_SIZE.
+        :type batch_size: int
+        :returns: Booleans in the same order as names.
+        :rtype: list
+        """
+        return self._stat_many(names, concurrency, batch_size, exists=True)
+
+    def _walk_level(self, prefix, delimiter, versions, projection):
+        prefixes = []
+        objects = []
+        for item in self._list(prefix=prefix, delimiter=delimiter,
+                               versions=versions, projection=projection):
+            if isinstance(item, gcs_prefix.Prefix):
+                prefixes.append(item)
+            else:
+                objects.append(item)
+        return prefix, prefixes, objects
+
+    def walk(self, prefix='', delimiter='/', concurrency=10, versions=None,
+             projection=None):
+        """Walk the tree of prefixes in the Bucket, like os.walk.
+
+        Each prefix is listed using delimiter and all discovered prefixes are
+        listed concurrently on the shared Executor, with up to concurrency
+        listings in flight at any given time.
+
+        For every listed prefix a (prefix, prefixes, objects) tuple is
+        yielded, where prefixes is a list of gcs_client.Prefix instances and
+        objects is a list of gcs_client.Object instances.  Like with os.walk,
+        the caller can modify prefixes in place to remove the ones it doesn't
+        want to visit.
+
+        Tuples are yielded as listings complete, so a prefix will always come
+        before its sub-prefixes but there is no ordering among siblings.
+
+        :param prefix: Prefix where the walk starts.  Default is the root of
+                       the bucket.
+        :type prefix: String
+        :param delimiter: Delimiter used to separate levels.
+        :type delimiter: String
+        :param concurrency: Maximum number of concurrent listings.
+        :type concurrency: int
+        :param versions: If True, lists all versions of an object as distinct
+                         results.  The default is False.
+        :type versions: bool
+        :param projection: Set of properties to return. Defaults to noAcl.
+        :type projection: String
+        :returns: Generator of (prefix, prefixes, objects) tuples.
+        """
+        executor = common.Executor.get_default().nested()
+        pending = collections.deque([prefix])
+        running = set()
+        try:
+            while pending or running:
+                while pending and len(running) < concurrency:
+                    running.add(executor.submit(self._walk_level,
+                                                pending.popleft(), delimiter,
+                                                versions, projection))
+                done, running = futures.wait(
+                    running, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    level = future.result()
+                    yield level
+                    pending.extend(p.prefix for p in level[1])
+        finally:
+            for future in running:
+                future.cancel()
+
+    def diff(self, target, prefix='', target_prefix=None,
+             compare=gcs_diff.DEFAULT_COMPARE, unchanged=False):
+        """Compare objects in the Bucket with another bucket or local tree.
+
+        Both sides are listed at the same time and merged in a single pass,
+        so memory usage doesn't depend on the number of objects.
+
+        .. code-block:: python
+
+            for change in bucket.diff('/srv/data', prefix='data/'):
+                if change.status != 'removed':
+                    upload(change.target.path, 'data/' + change.name)
+
+        :param target: Bucket or path of a local directory to compare with.
+        :type target: gcs_client.Bucket or String
+        :param prefix: Only compare objects starting with this prefix, names
+                       are relative to it.
+        :type prefix: String
+        :param target_prefix: Prefix in target bucket, defaults to prefix.
+                              Ignored for local directories.
+        :type target_prefix: String
+        :param compare: Attributes compared to tell if an object has changed.
+        :type compare: Iterable of strings
+        :param unchanged: Whether to return objects that have not changed.
+        :type unchanged: bool
+        :returns: Generator of gcs_client.diff.Change tuples, objects only in
+                  target are added and objects only in this bucket are
+                  removed.
+        """
+        source = gcs_diff.listing(self, prefix)
+        if isinstance(target, Bucket):
+            if target_prefix is None:
+                target_prefix = prefix
+            target = gcs_diff.listing(target, target_prefix)
+        else:
+            target = gcs_diff.local_tree(target)
+        return gcs_diff.diff(source, target, compare, unchanged)
+
+    def usage(self, prefix='', depth=1, concurrency=10, delimiter='/',
+              versions=None):
+        """Aggregate object counts and sizes per prefix.
+
+        Prefixes are listed concurrently on the shared Executor, requesting
+        only the name, size and storageClass fields, and objects are added to
+        the totals as pages arrive without creating instances for them.
+
+        .. code-block:: python
+
+            usage = bucket.usage(depth=1)
+            for name, child in sorted(usage.children.items()):
+                print(name, child.count, child.size)
+
+        :param prefix: Prefix whose usage we want.
+        :type prefix: String
+        :param depth: Number of levels of sub-prefixes to report, 0 only
+                      returns the totals of prefix.
+        :type depth: int
+        :param concurrency: Maximum number of prefixes listed concurrently.
+        :type concurrency: int
+        :param delimiter: Delimiter separating prefix levels.
+        :type delimiter: String
+        :param versions: If True, all versions of objects are counted.  The
+                         default is False.
+        :type versions: bool
+        :returns: Usage of prefix, with its sub-prefixes in the children
+                  attribute up to depth levels.
+        :rtype: gcs_client.usage.Usage
+        """
+        return gcs_usage.aggregate(self, prefix, depth, concurrency,
+                                   delimiter, versions)
+
+    def _list_range_page(self, start, end, skip, page_token, params):
+        it = self._iter_list(startOffset=start, endOffset=end, **params)
+        items, next_token = it._request_page(page_token)
+        return ([o for o in items if (o.name, o.generation) not in skip],
+                next_token)
+
+    def parallel_list(self, prefix=None, concurrency=10, ordered=True,
+                      splits=None, sample_pages=1, maxResults=None,
+                      versions=None, projection=None, checkpoint=None):
+        """List Objects concurrently splitting the key space in ranges.
+
+        First sample_pages pages of the listing are retrieved sequentially
+        and then the rest of the key space is split in lexicographic ranges,
+        choosing split points from the names seen in the sample, that are
+        listed concurrently on the shared Executor using startOffset and
+        endOffset filters.
+
+        Ranges are listed one page at a time and their objects are returned
+        as pages arrive.  When there are fewer ranges left than concurrency,
+        the rest of the range being returned is split again using the names
+        of its last page.
+
+        This is meant for buckets with a flat namespace, so no delimiter can
+        be used.
+
+        :param prefix: Filter results to objects whose names begin with this
+                       prefix.
+        :type prefix: String
+        :param concurrency: Maximum number of ranges listed concurrently.
+        :type concurrency: int
+        :param ordered: If True objects are returned in name order, otherwise
+                        pages are returned as soon as they are listed.
+                        Either way only one page per range being listed is
+                        held in memory.
+        :type ordered: bool
+        :param splits: Number of ranges to split the key space, or the rest
+                       of a range, in.  Default is 4 times the concurrency.
+        :type splits: int
+        :param sample_pages: Number of pages to list sequentially to choose
+                             the split points.
+        :type sample_pages: int
+        :param maxResults: Maximum number of items per page.
+        :type maxResults: Unsigned integer
+        :param versions: If True, lists all versions of an object as distinct
+                         results.  The default is False.
+        :type versions: bool
+        :param projection: Set of properties to return. Defaults to noAcl.
+        :type projection: String
+        :param checkpoint: Checkpoint, or path to its file, where the ranges
+                           that have not been completely consumed yet are
+                           saved, and from which an interrupted listing with
+                           the same arguments is resumed without sampling.
+                           Objects of partially consumed ranges are returned
+                           again when resuming.
+        :type checkpoint: gcs_client.checkpoint.Checkpoint or String
+        :returns: Generator of gcs_client.Object instances.
+        """
+        params = {'prefix': prefix, 'maxResults': maxResults,
+                  'versions': versions, 'projection': projection}
+        checkpoint = gcs_checkpoint.Checkpoint.get(checkpoint)
+        identity = {'url': self._format_url(self._list_url),
+                    'params': params}
+        state = checkpoint and checkpoint.check('parallel_list', identity)
+
+        def split(listed, end):
+            """Split key space between last listed object and end."""
+            # Ranges start at last listed name, skipping what we already have
+            start = listed[-1].name
+            skip = set((o.name, o.generation) for o in listed
+                       if o.name == start)
+            points = _split_points([o.name for o in listed], prefix or '',
+                                   start, splits or concurrency * 4, end)
+            return list(zip([start] + points, points + [end],
+                            [skip] + [set()] * len(points)))
+
+        if state:
+            remaining = [(start, end, set(tuple(s) for s in skip))
+                         for start, end, skip in state['ranges']]
+        else:
+            it = self._iter_list(**params)
+            sample = []
+            while not it._started or (it._next_token and
+                                      (len(sample) < sample_pages or
+                                       not sample[-1])):
+                sample.append(it._fetch_page())
+            sample = [o for page in sample for o in page]
+            for item in sample:
+                yield item
+            if not it._next_token:
+                if checkpoint:
+                    checkpoint.remove()
+                return
+
+            remaining = split(sample, None)
+
+        def save():
+            checkpoint.save('parallel_list', identity,
+                            ranges=[(start, end, sorted(skip))
+                                    for start, end, skip in remaining])
+
+        if checkpoint and not state:
+            save()
+
+        executor = common.Executor.get_default().nested()
+        # Ranges not completely listed in key order, with the future of the
+        # page being retrieved for the ones that have been started.
+        pending = [[rng, None] for rng in remaining]
+
+        def submit(rng, page_token=None):
+            return executor.submit(self._list_range_page, *rng,
+                                   page_token=page_token, params=params)
+
+        try:
+            while pending:
+                started = sum(1 for __, future in pending if future)
+                for entry in pending:
+                    if started >= concurrency:
+                        break
+                    if not entry[1]:
+                        entry[1] = submit(entry[0])
+                        started += 1
+
+                if ordered:
+                    index = 0
+                else:
+                    done, __ = futures.wait(
+                        [future for __, future in pending if future],
+                        return_when=futures.FIRST_COMPLETED)
+                    index = next(i for i, (__, future) in enumerate(pending)
+                                 if future in done)
+                rng, future = pending[index]
+                items, page_token = future.result()
+                for item in items:
+                    yield item
+
+                # Consumer has asked for more, so page is processed
+                if page_token:
+                    ranges = []
+                    if items and len(pending) < concurrency:
+                        # Workers are idle, split what's left of the range
+                        ranges = split(items, rng[1])
+                    if len(ranges) < 2:
+                        pending[index][1] = submit(rng, page_token)
+                        continue
+                    pending[index:index + 1] = [[r, None] for r in ranges]
+                    position = remaining.index(rng)
+                    remaining[position:position + 1] = ranges
+                else:
+                    del pending[index]
+                    remaining.remove(rng)
+                if checkpoint:
+                    save()
+        finally:
+            for __, future in pending:
+                if future:
+                    future.cancel()
+
+        if checkpoint:
+            checkpoint.remove()
+
     def __str__(self):
         return self.name
 
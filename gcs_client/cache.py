@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Process wide cache of Object and Bucket metadata.
+
+The cache is disabled by default.  Once enabled, metadata retrieved when
+accessing attributes of Object and Bucket instances, and the result of their
+exists method, is shared by all instances referring to the same resource, so
+only the first of them contacts GCS:
+
+.. code-block:: python
+
+    import gcs_client
+
+    gcs_client.MetadataCache.set_default(max_size=10000, ttl=30)
+    obj = gcs_client.Object('bucket', 'name', credentials=credentials)
+    print(obj.size)
+
+Deletes, uploads and metadata changes done through this library invalidate
+the affected entries.  Changes made by other processes are seen once entries
+expire, and expired metadata is revalidated with its etag, so it's only
+downloaded again if it has changed.
+"""
+
+from __future__ import absolute_import
+
+import collections
+import copy
+import threading
+import time
+
+
+__all__ = ('NOT_FOUND', 'MetadataCache')
+
+
+#: Value returned by MetadataCache.get for resources known not to exist.
+NOT_FOUND = object()
+
+
+class MetadataCache(object):
+    """LRU cache of resource metadata with expiration and negative entries.
+
+    Entries are keyed by bucket name, object name, which is None for buckets,
+    and generation, which is None for the latest generation.  All generations
+    of an object count as one entry for the size limit and are invalidated
+    together.
+
+    Metadata is copied when it's stored and when it's returned, so instances
+    filled from the cache can modify their attributes.
+
+    :ivar hits: Number of lookups found in the cache.
+    :vartype hits: int
+
+    :ivar misses: Number of lookups not found in the cache.
+    :vartype misses: int
+
+    :ivar renewals: Number of expired entries renewed after GCS reported
+                    they had not been modified.
+    :vartype renewals: int
+    """
+
+    def __init__(self, max_size=0, ttl=60, negative_ttl=None):
+        """Initialize cache configuration.
+
+        :param max_size: Maximum number of resources in the cache, least
+                         recently used ones are evicted first.  0 disables
+                         the cache.
+        :type max_size: int
+        :param ttl: Seconds metadata is kept in the cache.
+        :type ttl: int or float
+        :param negative_ttl: Seconds resources that don't exist are kept in
+                             the cache.  Defaults to ttl.
+        :type negative_ttl: int or float or NoneType
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.renewals = 0
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    @classmethod
+    def get_default(cls):
+        """Return default cache (simpleton patern)."""
+        if not hasattr(cls, 'default'):
+            cls.default = cls()
+        return cls.default
+
+    @classmethod
+    def set_default(cls, *args, **kwargs):
+        """Set default cache configuration.
+
+        Methods acepts a MetadataCache instance or the same arguments as the
+        __init__ method.  Cached entries are discarded.
+        """
+        default = cls.get_default()
+        if len(args) == 1 and isinstance(args[0], MetadataCache):
+            other = args[0]
+            default.__init__(other.max_size, other.ttl, other.negative_ttl)
+        else:
+            default.__init__(*args, **kwargs)
+
+    @property
+    def enabled(self):
+        """Whether the cache stores anything."""
+        return self.max_size > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, bucket, name=None, generation=None):
+        """Look up the metadata of a resource.
+
+        :returns: Metadata dictionary, NOT_FOUND if the resource is known not
+                  to exist, or None if it's not in the cache.
+        """
+        key = (bucket, name)
+        with self._lock:
+            group = self._entries.get(key)
+            entry = group and group.get(generation)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.time():
+                # Expired metadata is kept to be revalidated with its etag
+                if entry[1] is None:
+                    del group[generation]
+                    if not group:
+                        del self._entries[key]
+                self.misses += 1
+                return None
+            # Most recently used resources are kept at the end
+            self._entries[key] = self._entries.pop(key)
+            self.hits += 1
+        # Stored metadata is never modified, so it's copied without the lock
+        if entry[1] is None:
+            return NOT_FOUND
+        return copy.deepcopy(entry[1])
+
+    def get_stale(self, bucket, name=None, generation=None):
+        """Look up metadata of a resource even if it has expired.
+
+        :returns: Metadata dictionary or None if it's not in the cache.
+        """
+        with self._lock:
+            entry = self._entries.get((bucket, name), {}).get(generation)
+        if entry is None or entry[1] is None:
+            return None
+        return copy.deepcopy(entry[1])
+
+    def renew(self, bucket, name=None, generation=None, etag=None):
+        """Extend the expiration of metadata GCS reported as not modified.
+
+        :param etag: Entity tag that was revalidated, the entry is only
+                     renewed if its metadata has the same etag.
+        :type etag: String
+        :returns: Whether the entry was renewed.
+        :rtype: bool
+        """
+        key = (bucket, name)
+        with self._lock:
+            group = self._entries.get(key)
+            entry = group and group.get(generation)
+            if (entry is None or entry[1] is None or
+                    entry[1].get('etag') != etag):
+                return False
+            group[generation] = (time.time() + self.ttl, entry[1])
+            self._entries[key] = self._entries.pop(key)
+            self.renewals += 1
+            return True
+
+    def put(self, bucket, name=None, generation=None, data=None):
+        """Store the metadata of a resource.
+
+        :param data: Metadata, None stores that the resource doesn't exist.
+        :type data: dict or NoneType
+        """
+        if not self.enabled:
+            return
+        if data is None:
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl
+            data = copy.deepcopy(data)
+        key = (bucket, name)
+        with self._lock:
+            group = self._entries.pop(key, {})
+            group[generation] = (time.time() + ttl, data)
+            self._entries[key] = group
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, bucket, name=None):
+        """Remove all generations of a resource from the cache."""
+        with self._lock:
+            self._entries.pop((bucket, name), None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
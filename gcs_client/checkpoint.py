@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Checkpoints for resumable listings.
+
+Listing buckets with hundreds of millions of objects can take hours, and a
+crash or a deploy in the middle means starting over.  Passing a checkpoint to
+a listing makes it save its position as results are consumed, so running the
+same listing again with the same checkpoint continues where it stopped:
+
+.. code-block:: python
+
+    for obj in bucket.iter_list(prefix='logs/', checkpoint='/tmp/logs.ckpt'):
+        process(obj)
+
+Delivery is at-least-once: results returned after the last saved position are
+returned again when resuming.
+"""
+
+from __future__ import absolute_import
+
+import json
+import os
+import tempfile
+
+import six
+
+from gcs_client import errors
+
+
+__all__ = ('Checkpoint',)
+
+
+# os.rename doesn't replace existing files on Windows
+_replace = getattr(os, 'replace', os.rename)
+
+
+class Checkpoint(object):
+    """File storing the position of a long running listing.
+
+    Listings that receive a checkpoint save their position to it once the
+    results returned so far have been processed, and when started again with
+    the same checkpoint and arguments they will continue from that position.
+    The file is removed once the listing completes.
+
+    Files are replaced atomically, so a crash while saving will leave the
+    previous checkpoint in place.
+    """
+
+    def __init__(self, path):
+        """Initialize a checkpoint.
+
+        :param path: Path of the checkpoint file.
+        :type path: String
+        """
+        self.path = path
+
+    @classmethod
+    def get(cls, checkpoint):
+        """Return a Checkpoint from a Checkpoint, a path or None."""
+        if checkpoint is None or isinstance(checkpoint, cls):
+            return checkpoint
+        return cls(checkpoint)
+
+    def load(self):
+        """Load the checkpoint.
+
+        :returns: Saved state or None if there is no checkpoint.
+        :rtype: dict or NoneType
+        """
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, OSError):
+            if os.path.exists(self.path):
+                raise
+            return None
+
+    def check(self, kind, identity):
+        """Load the checkpoint for a specific listing.
+
+        :param kind: Kind of listing.
+        :type kind: String
+        :param identity: JSON serializable data identifying the listing, like
+                         its URL and arguments.
+        :returns: Saved state or None if there is no checkpoint.
+        :rtype: dict or NoneType
+        :raises: errors.Error if the checkpoint belongs to another listing.
+        """
+        state = self.load()
+        if state is None:
+            return None
+        # Normalize identity the same way it was stored
+        identity = json.loads(json.dumps(identity))
+        if state.get('kind') != kind or state.get('identity') != identity:
+            raise errors.Error('Checkpoint %s belongs to a different listing' %
+                               self.path)
+        return state
+
+    def save(self, kind, identity, **state):
+        """Atomically save the state of a listing.
+
+        :param kind: Kind of listing.
+        :type kind: String
+        :param identity: JSON serializable data identifying the listing.
+        :param state: JSON serializable position of the listing.
+        """
+        state.update(kind=kind, identity=identity)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory,
+                                        prefix=os.path.basename(self.path),
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                data = json.dumps(state)
+                f.write(data if six.PY3 else data.decode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            _replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def remove(self):
+        """Remove the checkpoint file if it exists."""
+        try:
+            os.unlink(self.path)
+        except OSError:
+            if os.path.exists(self.path):
+                raise
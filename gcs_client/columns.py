@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Columnar representation of object listings.
+
+Listing huge buckets into Object instances, or even ObjectRecord instances,
+requires one Python object per listed object.  ObjectColumns stores each
+attribute in its own compact column instead, using int64 arrays for numbers
+and packed UTF-8 buffers for strings, so tens of millions of entries can be
+held and aggregated in a single process:
+
+.. code-block:: python
+
+    columns = bucket.list_columns(prefix='logs/')
+    total = sum(columns.size)
+
+    # With NumPy installed
+    arrays = columns.to_numpy()
+    big = arrays['name'][arrays['size'] > 2 ** 30]
+"""
+
+from __future__ import absolute_import
+
+from array import array
+import calendar
+import datetime
+
+import six
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = ('ObjectColumns', 'StringColumn')
+
+
+#: Value stored in numeric columns when GCS doesn't return the attribute.
+MISSING = -1
+
+try:
+    INT64 = array('q').typecode
+except ValueError:
+    # Python 2 has no long long arrays, long is 64 bits on LP64 platforms
+    INT64 = 'l'
+
+
+def rfc3339_to_epoch(value):
+    """Convert a GCS RFC 3339 UTC timestamp to seconds since the epoch."""
+    return calendar.timegm((int(value[0:4]), int(value[5:7]),
+                            int(value[8:10]), int(value[11:13]),
+                            int(value[14:16]), int(value[17:19]), 0, 0, 0))
+
+
+def to_epoch(value):
+    """Convert a time to seconds since the epoch.
+
+    :param value: Time as seconds since the epoch, datetime (naive ones are
+                  considered UTC), RFC 3339 UTC string or None.
+    :returns: Seconds since the epoch, or None if value is None.
+    """
+    if isinstance(value, datetime.datetime):
+        return calendar.timegm(value.utctimetuple())
+    if isinstance(value, six.string_types):
+        return rfc3339_to_epoch(value)
+    return value
+
+
+class StringColumn(object):
+    """Sequence of strings packed in a single UTF-8 buffer."""
+
+    def __init__(self, values=()):
+        self._data = bytearray()
+        self._offsets = array(INT64, [0])
+        for value in values:
+            self.append(value)
+
+    def append(self, value):
+        self._data.extend(value.encode('utf-8'))
+        self._offsets.append(len(self._data))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('StringColumn index out of range')
+        return self._data[self._offsets[index]:
+                          self._offsets[index + 1]].decode('utf-8')
+
+    def __iter__(self):
+        data = self._data
+        offsets = self._offsets
+        for i in range(len(self)):
+            yield data[offsets[i]:offsets[i + 1]].decode('utf-8')
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, list(self))
+
+
+class ObjectColumns(object):
+    """Columns of attributes of listed objects.
+
+    Row i of every column belongs to the same object.  Missing numeric values
+    are stored as MISSING and missing strings as empty strings.
+
+    :ivar name: Names of the objects.
+    :vartype name: StringColumn
+
+    :ivar size: Sizes in bytes.
+    :vartype size: array.array of int64
+
+    :ivar generation: Content generations.
+    :vartype generation: array.array of int64
+
+    :ivar updated: Modification time as seconds since the epoch.
+    :vartype updated: array.array of int64
+
+    :ivar md5Hash: MD5 hashes encoded using base64.
+    :vartype md5Hash: StringColumn
+
+    :ivar crc32c: CRC32c checksums encoded using base64.
+    :vartype crc32c: StringColumn
+
+    :ivar prefixes: Prefixes returned by listings with delimiter.
+    :vartype prefixes: list of strings
+    """
+
+    #: Partial response fields needed to build the columns.
+    FIELDS = ('items(name,size,generation,md5Hash,crc32c,updated),prefixes,'
+              'nextPageToken')
+
+    def __init__(self):
+        self.name = StringColumn()
+        self.size = array(INT64)
+        self.generation = array(INT64)
+        self.updated = array(INT64)
+        self.md5Hash = StringColumn()
+        self.crc32c = StringColumn()
+        self.prefixes = []
+
+    def __len__(self):
+        return len(self.name)
+
+    def _append(self, data, parent=None):
+        """Add an item from a listing, returns its row number."""
+        self.name.append(data['name'])
+        self.size.append(int(data.get('size', MISSING)))
+        self.generation.append(int(data.get('generation', MISSING)))
+        updated = data.get('updated')
+        self.updated.append(rfc3339_to_epoch(updated) if updated
+                            else MISSING)
+        self.md5Hash.append(data.get('md5Hash', ''))
+        self.crc32c.append(data.get('crc32c', ''))
+        return len(self) - 1
+
+    def extend(self, iterator):
+        """Consume a listing iterator created with _append as item factory.
+
+        :param iterator: Listing iterator.
+        :type iterator: gcs_client.base.ListIterator
+        :returns: The instance itself.
+        """
+        for item in iterator:
+            if not isinstance(item, six.integer_types):
+                self.prefixes.append(item.prefix)
+        return self
+
+    def row(self, index):
+        """Return a dictionary with the attributes of an object."""
+        return {'name': self.name[index],
+                'size': self.size[index],
+                'generation': self.generation[index],
+                'updated': self.updated[index],
+                'md5Hash': self.md5Hash[index],
+                'crc32c': self.crc32c[index]}
+
+    def to_numpy(self):
+        """Return the columns as NumPy arrays.
+
+        Numeric columns are int64 arrays sharing memory with the columns, so
+        no more rows can be added while they exist, and string columns are
+        object arrays.
+
+        :returns: Dictionary mapping attribute names to arrays.
+        :rtype: dict
+        """
+        if numpy is None:
+            raise ImportError('to_numpy requires numpy')
+        result = {name: numpy.frombuffer(getattr(self, name), numpy.int64)
+                  for name in ('size', 'generation', 'updated')}
+        result.update((name, numpy.array(list(getattr(self, name)),
+                                         dtype=object))
+                      for name in ('name', 'md5Hash', 'crc32c'))
+        return result
+
+    def __repr__(self):
+        return '<%s with %s objects and %s prefixes>' % (
+            self.__class__.__name__, len(self), len(self.prefixes))
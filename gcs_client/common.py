@@ -15,9 +15,11 @@
 
 from __future__ import absolute_import
 
+from concurrent import futures
 from functools import wraps
 import math
 import random
+import threading
 import time
 
 from gcs_client import errors as errors
@@ -119,6 +121,164 @@ class RetryParams(object):
             default.__init__(*args, **kwargs)
 
 
+#: Per thread state, records the Executor a worker thread belongs to.
+_worker = threading.local()
+
+
+class InlineExecutor(object):
+    """Executor look-alike that runs callables in the calling thread."""
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) and return a completed Future."""
+        future = futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def map(self, fn, *iterables):
+        """Equivalent of map(fn, *iterables)."""
+        return (fn(*args) for args in zip(*iterables))
+
+
+class Executor(object):
+    """Bounded pool of worker threads shared by GCS resources.
+
+    Concurrent operations, like the submit methods of the resources, run on
+    the Executor returned by Executor.get_default(), so fan-out work is bounded
+    and shares the same connection pool instead of every caller creating its
+    own threads.
+
+    Operations that submit work and wait for it must get the executor for it
+    from nested(), because when they are themselves running on one of the
+    workers waiting for work queued behind them could exhaust the pool.
+
+    Worker threads are only created when work is submitted.
+    """
+
+    def __init__(self, max_workers=10):
+        """Initialize executor configuration.
+
+        :param max_workers: Maximum number of worker threads.  It's
+                            recommended to keep it at or below the max_size
+                            of the ConnectionPool.
+        :type max_workers: int
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls):
+        """Return default executor (simpleton patern)."""
+        if not hasattr(cls, 'default'):
+            cls.default = cls()
+        return cls.default
+
+    @classmethod
+    def set_default(cls, *args, **kwargs):
+        """Set default executor configuration.
+
+        Methods acepts an Executor instance or the same arguments as the
+        __init__ method.  Work already submitted to the default executor will
+        still be completed.
+        """
+        default = cls.get_default()
+        default.shutdown(wait=False)
+        if len(args) == 1 and isinstance(args[0], Executor):
+            default.__init__(args[0].max_workers)
+        else:
+            default.__init__(*args, **kwargs)
+
+    def _get_executor(self):
+        with self._lock:
+            if not self._executor:
+                self._executor = futures.ThreadPoolExecutor(self.max_workers)
+            return self._executor
+
+    def _run(self, fn, args, kwargs):
+        _worker.executor = self
+        return fn(*args, **kwargs)
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs) to be run.
+
+        :returns: Future representing the execution of the callable.
+        :rtype: concurrent.futures.Future
+        """
+        return self._get_executor().submit(self._run, fn, args, kwargs)
+
+    def map(self, fn, *iterables):
+        """Concurrent equivalent of map(fn, *iterables).
+
+        :returns: Iterator with results in the same order as the arguments.
+        """
+        return self._get_executor().map(lambda *args: self._run(fn, args, {}),
+                                        *iterables)
+
+    @property
+    def in_worker(self):
+        """Whether the calling thread is one of our workers."""
+        return getattr(_worker, 'executor', None) is self
+
+    def nested(self):
+        """Return the executor for work the caller will wait for.
+
+        :returns: This executor, or an InlineExecutor when called from one of
+                  its workers.
+        :rtype: Executor or InlineExecutor
+        """
+        return InlineExecutor() if self.in_worker else self
+
+    def shutdown(self, wait=True):
+        """Stop worker threads.
+
+        The executor can still be used after the shutdown, new threads will be
+        created as needed.
+
+        :param wait: Whether to wait for pending work to complete.
+        :type wait: bool
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait)
+
+
+def _get_retry_params(instance, param):
+    """Get retry configuration for a retry decorator parameter."""
+    # If retry configuration is none or a RetryParams instance, use it
+    if isinstance(param, (type(None), RetryParams)):
+        return param
+    # If it's an attribute name try to retrieve it
+    return getattr(instance, param, RetryParams.get_default())
+
+
+def _backoff(retry_params, n, delay):
+    """Calculate backoff for a retry.
+
+    :param retry_params: Retry configuration.
+    :type retry_params: RetryParams
+    :param n: Retry number, starting with 1.
+    :type n: int
+    :param delay: Delay used for previous retry, 0 for the first retry.
+    :type delay: int or float
+    :returns: Tuple with the new delay and the actual time to wait, which
+              includes the random delay.
+    """
+    # If we haven't reached maximum backoff yet calculate new delay
+    if delay < retry_params.max_backoff:
+        backoff = (math.pow(retry_params.backoff_factor, n-1) *
+                   retry_params.initial_delay)
+        delay = min(retry_params.max_backoff, backoff)
+
+    random_delay = 0
+    if retry_params.randomize:
+        random_delay = random.random() * retry_params.initial_delay
+    return delay, delay + random_delay
+
+
 def retry(param='_retry_params', error_codes=DEFAULT_RETRY_CODES):
     """Truncated Exponential Backoff decorator.
 
@@ -164,14 +324,8 @@ def retry(param='_retry_params', error_codes=DEFAULT_RETRY_CODES):
     def _retry(f):
         @wraps(f)
         def wrapped(self, *args, **kwargs):
-            # If retry configuration is none or a RetryParams instance, use it
-            if isinstance(param, (type(None), RetryParams)):
-                retry_params = param
-            # If it's an attribute name try to retrieve it
-            else:
-                retry_params = getattr(self, param, RetryParams.get_default())
+            retry_params = _get_retry_params(self, param)
             delay = 0
-            random_delay = 0
 
             n = 0  # Retry number
             while True:
@@ -183,15 +337,8 @@ def retry(param='_retry_params', error_codes=DEFAULT_RETRY_CODES):
                             exc.code not in error_codes):
                         raise exc
                 n += 1
-                # If we haven't reached maximum backoff yet calculate new delay
-                if delay < retry_params.max_backoff:
-                    backoff = (math.pow(retry_params.backoff_factor, n-1) *
-                               retry_params.initial_delay)
-                    delay = min(retry_params.max_backoff, backoff)
-
-                if retry_params.randomize:
-                    random_delay = random.random() * retry_params.initial_delay
-                time.sleep(delay + random_delay)
+                delay, wait = _backoff(retry_params, n, delay)
+                time.sleep(wait)
 
         return wrapped
 
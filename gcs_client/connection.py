@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from __future__ import absolute_import
+
+import threading
+import time
+import weakref
+
+import requests
+from requests import adapters
+
+
+#: Watches of responses that have not been consumed yet.
+_watches = set()
+
+#: Subclasses of response classes created by when_consumed.
+_watched_classes = {}
+
+
+class _Watch(object):
+    """Callbacks of a response watched by when_consumed.
+
+    It only has a weak reference to the response, so discarded responses are
+    still collected as soon as they are not referenced.
+    """
+
+    def __init__(self, response):
+        self.callbacks = []
+        self.chunk_callbacks = []
+        # Popping from a list is atomic, so callbacks are only called once
+        self._token = [True]
+        self._ref = weakref.ref(response, self.done)
+        _watches.add(self)
+
+    def done(self, ref=None):
+        try:
+            self._token.pop()
+        except IndexError:
+            return
+        _watches.discard(self)
+        response = self._ref()
+        for callback in self.callbacks:
+            callback(response)
+
+    def read(self, chunks):
+        for chunk in chunks:
+            for callback in self.chunk_callbacks:
+                callback(chunk)
+            yield chunk
+        self.done()
+
+
+class _WatchedResponse(object):
+    """Mixin for responses watched by when_consumed."""
+
+    def close(self):
+        try:
+            close = getattr(super(_WatchedResponse, self), 'close', None)
+            if close:
+                close()
+        finally:
+            self._watch.done()
+
+    def iter_content(self, *args, **kwargs):
+        # Chunks keep the response alive until they are read
+        return self._watch.read(
+            super(_WatchedResponse, self).iter_content(*args, **kwargs))
+
+
+def when_consumed(response, callback, on_chunk=None):
+    """Call callback once a streamed response is done with.
+
+    That is when the response is closed, when its content has been completely
+    read with iter_content, or when it's garbage collected without any of
+    them happening, and then callback receives None instead of the response.
+
+    :param response: Response to watch.
+    :type response: requests.Response or compatible object.
+    :param callback: Callable that receives the response.
+    :type callback: callable
+    :param on_chunk: Callable that receives each chunk read with
+                     iter_content.
+    :type on_chunk: callable
+    """
+    watch = vars(response).get('_watch')
+    if watch is None:
+        cls = type(response)
+        watched = _watched_classes.get(cls)
+        if watched is None:
+            watched = _watched_classes[cls] = type(
+                cls.__name__, (_WatchedResponse, cls), {})
+        watch = response._watch = _Watch(response)
+        response.__class__ = watched
+    watch.callbacks.append(callback)
+    if on_chunk:
+        watch.chunk_callbacks.append(on_chunk)
+
+
+class ConnectionPool(object):
+    """Pool of keep-alive HTTP connections shared by GCS resources.
+
+    All communications with GCS go through a ConnectionPool, so TCP and TLS
+    handshakes are only paid when a new connection is really needed instead of
+    on every request.  By default all instances of Bucket, Object, Prefix,
+    Project and GCSObjFile share the same pool, the one returned by
+    ConnectionPool.get_default().
+
+    Pools are thread safe.  Connections that have been idle for longer than
+    idle_timeout seconds are discarded before the next request, as servers
+    will have probably closed them already.
+    """
+
+    def __init__(self, max_hosts=10, max_size=10, max_connections=None,
+                 idle_timeout=60):
+        """Initialize connection pool configuration.
+
+        :param max_hosts: Number of different hosts to keep connections for.
+        :type max_hosts: int
+        :param max_size: Maximum number of connections to keep per host.
+        :type max_size: int
+        :param max_connections: Maximum number of simultaneous requests that
+                                can be in flight using this pool.  If None is
+                                passed there will be no limit, and
+                                connections in excess of max_size will just
+                                not be kept once they are finished.
+        :type max_connections: int or NoneType
+        :param idle_timeout: Seconds a connection can remain unused before it
+                             is discarded.  If None is passed connections will
+                             never be discarded.
+        :type idle_timeout: int or float or NoneType
+        """
+        self.max_hosts = max_hosts
+        self.max_size = max_size
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._session = None
+        self._last_used = None
+        if max_connections:
+            self._semaphore = threading.BoundedSemaphore(max_connections)
+        else:
+            self._semaphore = None
+
+    @classmethod
+    def get_default(cls):
+        """Return default pool (simpleton patern)."""
+        if not hasattr(cls, 'default'):
+            cls.default = cls()
+        return cls.default
+
+    @classmethod
+    def set_default(cls, *args, **kwargs):
+        """Set default connection pool configuration.
+
+        Methods acepts a ConnectionPool instance or the same arguments as the
+        __init__ method.
+        """
+        default = cls.get_default()
+        default.close()
+        # For ConnectionPool argument copy configuration to default instance
+        # so all references to the default pool will use the new values.
+        if len(args) == 1 and isinstance(args[0], ConnectionPool):
+            other = args[0]
+            default.__init__(other.max_hosts, other.max_size,
+                             other.max_connections, other.idle_timeout)
+
+        # For individual arguments call __init__ method on default instance
+        else:
+            default.__init__(*args, **kwargs)
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = adapters.HTTPAdapter(pool_connections=self.max_hosts,
+                                       pool_maxsize=self.max_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _get_session(self):
+        with self._lock:
+            now = time.time()
+            if (self._session and self.idle_timeout is not None and
+                    now - self._last_used > self.idle_timeout):
+                self._session.close()
+                self._session = None
+
+            if not self._session:
+                self._session = self._new_session()
+            self._last_used = now
+            return self._session
+
+    def reap(self):
+        """Discard connections if they have been idle for too long."""
+        with self._lock:
+            if (self._session and self.idle_timeout is not None and
+                    time.time() - self._last_used > self.idle_timeout):
+                self._session.close()
+                self._session = None
+
+    def close(self):
+        """Close all connections in the pool.
+
+        Pool can still be used after being closed, new connections will be
+        created as needed.
+        """
+        with self._lock:
+            if self._session:
+                self._session.close()
+                self._session = None
+
+    def request(self, method, url, **kwargs):
+        """Send an HTTP request using a pooled connection.
+
+        Accepts the same arguments as requests.request.
+
+        When max_connections is set and the body is streamed, the request
+        counts against the limit until the response is closed, its content
+        has been completely consumed or it's discarded.
+
+        :returns: requests.Response
+        """
+        session = self._get_session()
+        if not self._semaphore:
+            return session.request(method, url, **kwargs)
+
+        if not kwargs.get('stream'):
+            with self._semaphore:
+                return session.request(method, url, **kwargs)
+
+        self._semaphore.acquire()
+        try:
+            r = session.request(method, url, **kwargs)
+        except Exception:
+            self._semaphore.release()
+            raise
+        when_consumed(r, lambda response: self._semaphore.release())
+        return r
+
+    def get(self, url, **kwargs):
+        """Send a GET request, accepts the same arguments as requests.get."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request, accepts the same arguments as requests.post."""
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        """Send a PUT request, accepts the same arguments as requests.put."""
+        return self.request('PUT', url, **kwargs)
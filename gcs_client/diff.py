@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Streaming comparison of listings.
+
+GCS returns listings in name order, so two listings can be compared merging
+them in a single pass, holding only the current entry of each side in memory.
+Listings are iterables of (name, entry) tuples sorted by name, where names are
+relative to whatever is being compared and entries are objects, records,
+dictionaries or LocalFile instances:
+
+.. code-block:: python
+
+    from gcs_client import diff
+
+    source = diff.listing(bucket, 'backups/2026-10-15/')
+    target = diff.local_tree('/srv/backups/2026-10-15')
+    for change in diff.diff(source, target):
+        print(change.status, change.name)
+"""
+
+from __future__ import absolute_import
+
+import base64
+import collections
+import hashlib
+import os
+
+
+__all__ = ('ADDED', 'REMOVED', 'CHANGED', 'UNCHANGED', 'Change', 'LocalFile',
+           'diff', 'listing', 'local_tree')
+
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+#: Default attributes compared to detect changes.
+DEFAULT_COMPARE = ('size', 'md5Hash')
+
+_READ_SIZE = 1024 * 1024
+
+#: Difference between source and target, source or target is None for added
+#: and removed entries.
+Change = collections.namedtuple('Change',
+                                ('status', 'name', 'source', 'target'))
+
+
+class LocalFile(object):
+    """File in a local tree with the attributes used to compare objects.
+
+    md5Hash is calculated when it's first accessed, so files are only read
+    when their hash needs to be compared.
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        stat = os.stat(path)
+        self.size = stat.st_size
+        self.updated = stat.st_mtime
+        self._md5 = None
+
+    @property
+    def md5Hash(self):
+        """MD5 hash of the contents encoded using base64, like GCS does."""
+        if self._md5 is None:
+            md5 = hashlib.md5()
+            with open(self.path, 'rb') as f:
+                for data in iter(lambda: f.read(_READ_SIZE), b''):
+                    md5.update(data)
+            self._md5 = base64.b64encode(md5.digest()).decode('ascii')
+        return self._md5
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.path)
+
+
+def local_tree(path, prefix=''):
+    """Iterate over the files in a directory in GCS name order.
+
+    Names are relative to path and use "/" as separator.  Only one directory
+    level is sorted at a time, and symbolic links to directories are not
+    followed.
+
+    :param path: Directory to list.
+    :type path: String
+    :param prefix: Prefix to add to the names.
+    :type prefix: String
+    :returns: Generator of (name, LocalFile) tuples.
+    """
+    entries = []
+    for filename in os.listdir(path):
+        full_path = os.path.join(path, filename)
+        if os.path.isdir(full_path) and not os.path.islink(full_path):
+            # Trailing separator places contents in the right position
+            entries.append((prefix + filename + '/', full_path, True))
+        elif os.path.isfile(full_path):
+            entries.append((prefix + filename, full_path, False))
+    entries.sort()
+
+    for name, full_path, is_dir in entries:
+        if is_dir:
+            for entry in local_tree(full_path, name):
+                yield entry
+        else:
+            yield name, LocalFile(full_path, name)
+
+
+def listing(bucket, prefix='', prefetch=1):
+    """Iterate over objects of a bucket with names relative to a prefix.
+
+    :param bucket: Bucket to list.
+    :type bucket: gcs_client.Bucket
+    :param prefix: Only list objects starting with this prefix, it's removed
+                   from the names.
+    :type prefix: String
+    :param prefetch: Number of pages to request in the background.
+    :type prefetch: int
+    :returns: Generator of (name, gcs_object.ObjectRecord) tuples.
+    """
+    strip = len(prefix)
+    for record in bucket.iter_list(prefix=prefix or None, records=True,
+                                   prefetch=prefetch):
+        yield record.name[strip:], record
+
+
+def _value(entry, attribute):
+    if isinstance(entry, dict):
+        return entry.get(attribute)
+    return getattr(entry, attribute, None)
+
+
+def _changed(source, target, compare):
+    for attribute in compare:
+        source_value = _value(source, attribute)
+        if source_value is None:
+            continue
+        target_value = _value(target, attribute)
+        if target_value is None:
+            continue
+        if attribute in ('size', 'generation'):
+            source_value, target_value = int(source_value), int(target_value)
+        if source_value != target_value:
+            return True
+    return False
+
+
+def _ordered(entries, side):
+    """Check entries are strictly increasing by name."""
+    last = None
+    for name, entry in entries:
+        if last is not None and name <= last:
+            raise ValueError('%s listing is not in name order: %r after %r' %
+                             (side, name, last))
+        last = name
+        yield name, entry
+
+
+def diff(source, target, compare=DEFAULT_COMPARE, unchanged=False):
+    """Compare two name ordered listings in a single pass.
+
+    Attributes missing in any of the entries, like md5Hash of composite
+    objects, are not compared.  Use ('generation',) to compare two listings of
+    the same bucket taken at different times.
+
+    :param source: Iterable of (name, entry) tuples sorted by name.
+    :param target: Iterable of (name, entry) tuples sorted by name.
+    :param compare: Attributes compared, in order, to tell if an entry in
+                    both listings has changed.  Put cheap attributes first,
+                    comparison stops at the first difference.
+    :type compare: Iterable of strings
+    :param unchanged: Whether to return entries that have not changed.
+    :type unchanged: bool
+    :returns: Generator of Change tuples in name order, entries only in
+              target are ADDED and entries only in source are REMOVED.
+    :raises: ValueError if a listing is not sorted by name.
+    """
+    source = _ordered(source, 'Source')
+    target = _ordered(target, 'Target')
+    missing = (None, None)
+    src_name, src = next(source, missing)
+    tgt_name, tgt = next(target, missing)
+    while src_name is not None or tgt_name is not None:
+        if tgt_name is None or (src_name is not None and src_name < tgt_name):
+            yield Change(REMOVED, src_name, src, None)
+            src_name, src = next(source, missing)
+        elif src_name is None or tgt_name < src_name:
+            yield Change(ADDED, tgt_name, None, tgt)
+            tgt_name, tgt = next(target, missing)
+        else:
+            if _changed(src, tgt, compare):
+                yield Change(CHANGED, src_name, src, tgt)
+            elif unchanged:
+                yield Change(UNCHANGED, src_name, src, tgt)
+            src_name, src = next(source, missing)
+            tgt_name, tgt = next(target, missing)
@@ -0,0 +1,607 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""In-memory GCS backend.
+
+FakeTransport implements the subset of the JSON, upload and media endpoints
+used by this library entirely in memory, so the client can be exercised and
+benchmarked without any network access:
+
+.. code-block:: python
+
+    import gcs_client
+    from gcs_client import fake
+
+    backend = fake.FakeTransport()
+    gcs_client.Transport.set_default(backend)
+    backend.create_bucket('my_bucket')
+    backend.create_object('my_bucket', 'dir/file.txt', b'data')
+
+    bucket = gcs_client.Bucket('my_bucket', fake.FakeCredentials())
+    print(bucket.list())
+"""
+
+from __future__ import absolute_import
+
+import base64
+import bisect
+import hashlib
+import itertools
+import json
+import threading
+import time
+import zlib
+
+import requests
+from requests import structures
+import six
+from six.moves import http_client as httplib
+from six.moves.urllib import parse
+
+from gcs_client import batch
+from gcs_client import query as gcs_query
+from gcs_client import transport
+
+
+class FakeCredentials(object):
+    """Credentials that can be used with FakeTransport."""
+    authorization = 'Bearer fake'
+
+
+class _HttpError(Exception):
+    def __init__(self, code, message=None):
+        self.code = code
+        self.message = message or httplib.responses.get(code, 'Error')
+
+
+def _timestamp(when):
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(when)) + (
+        '.%03dZ' % (int(when * 1000) % 1000))
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def _encode_token(name):
+    return base64.urlsafe_b64encode(name.encode('utf-8')).decode('ascii')
+
+
+def _decode_token(token):
+    try:
+        return base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8')
+    except Exception:
+        raise _HttpError(requests.codes.bad_request, 'Invalid pageToken')
+
+
+def _merge_fields(spec, name, sub):
+    if name not in spec:
+        spec[name] = sub
+    elif spec[name] is None or sub is None:
+        spec[name] = None
+    else:
+        for key, value in sub.items():
+            _merge_fields(spec[name], key, value)
+
+
+def _parse_fields(fields, i=0):
+    """Parse a partial response selector.
+
+    :returns: Tuple with a dictionary mapping selected fields to their own
+              selection, or None if all their contents are selected, and the
+              position where parsing stopped.
+    """
+    spec = {}
+    while i < len(fields):
+        j = i
+        while j < len(fields) and fields[j] not in ',()':
+            j += 1
+        path = [p.strip() for p in fields[i:j].split('/')]
+        sub = None
+        if j < len(fields) and fields[j] == '(':
+            sub, j = _parse_fields(fields, j + 1)
+        if path[0]:
+            for name in reversed(path[1:]):
+                sub = {name: sub}
+            _merge_fields(spec, path[0], sub)
+        if j < len(fields) and fields[j] == ')':
+            return spec, j + 1
+        i = j + 1
+    return spec, i
+
+
+def _select_fields(data, spec):
+    if spec is None:
+        return data
+    if isinstance(data, list):
+        return [_select_fields(item, spec) for item in data]
+    if not isinstance(data, dict):
+        return data
+    if '*' in spec:
+        return {k: _select_fields(v, spec['*']) for k, v in data.items()}
+    return {k: _select_fields(data[k], v) for k, v in spec.items()
+            if k in data}
+
+
+class FakeTransport(transport.Transport):
+    """Transport with an in-memory implementation of GCS.
+
+    Supports buckets (create, get, patch, list, delete), objects (get, patch,
+    list with pagination, prefixes, delimiters, offsets and matchGlob,
+    delete), resumable and media uploads, ranged media downloads, batch
+    requests, fields partial responses, metadata reads conditional on the
+    etag or metageneration, and gzip compression of JSON responses for
+    clients that negotiate it.
+    Only the latest generation of each object is kept.
+
+    Instances are thread safe.
+    """
+    blocking = False
+
+    API = '/storage/v1/b'
+    UPLOAD = '/upload/storage/v1/b'
+    BATCH = '/batch/storage/v1'
+
+    def __init__(self, endpoint=None, project_number='0'):
+        """Initialize an empty in-memory GCS.
+
+        :param endpoint: Endpoint that will be reported in links and upload
+                         locations.  Defaults to DEFAULT_ENDPOINT.
+        :type endpoint: String
+        :param project_number: Project number reported on buckets.
+        :type project_number: String
+        """
+        super(FakeTransport, self).__init__(endpoint)
+        self.project_number = project_number
+        self._base_path = parse.urlsplit(self.endpoint).path
+        self._buckets = {}
+        self._uploads = {}
+        self._generation = itertools.count(int(time.time() * 1000000))
+        self._upload_id = itertools.count(1)
+        self._lock = threading.RLock()
+
+    # Helpers to populate the backend
+
+    def create_bucket(self, name, **metadata):
+        """Create a bucket directly in the backend.
+
+        :param name: Name of the bucket.
+        :type name: String
+        :param metadata: Additional bucket metadata, like location.
+        :returns: Bucket metadata
+        :rtype: dict
+        """
+        with self._lock:
+            if name in self._buckets:
+                raise _HttpError(requests.codes.conflict,
+                                 'Bucket %s already exists' % name)
+            now = time.time()
+            meta = {'kind': 'storage#bucket',
+                    'id': name,
+                    'name': name,
+                    'selfLink': self.endpoint + self.API + '/' + name,
+                    'projectNumber': self.project_number,
+                    'metageneration': '1',
+                    'location': 'US',
+                    'storageClass': 'STANDARD',
+                    'etag': 'CAE=',
+                    'timeCreated': _timestamp(now),
+                    'updated': _timestamp(now)}
+            meta.update(metadata)
+            self._buckets[name] = {'meta': meta, 'objects': {}, 'names': []}
+            return dict(meta)
+
+    def create_object(self, bucket, name, data=b'',
+                      content_type='application/octet-stream'):
+        """Create or replace an object directly in the backend.
+
+        :param bucket: Name of the bucket, it must already exist.
+        :type bucket: String
+        :param name: Name of the object.
+        :type name: String
+        :param data: Contents of the object.
+        :type data: bytes
+        :param content_type: Content type of the object.
+        :type content_type: String
+        :returns: Object metadata
+        :rtype: dict
+        """
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+        data = bytes(data)
+        with self._lock:
+            bkt = self._get_bucket(bucket)
+            generation = next(self._generation)
+            now = time.time()
+            quoted = parse.quote(name, safe='')
+            meta = {'kind': 'storage#object',
+                    'id': '%s/%s/%s' % (bucket, name, generation),
+                    'selfLink': '%s%s/%s/o/%s' % (self.endpoint, self.API,
+                                                  bucket, quoted),
+                    'mediaLink': '%s/download/storage/v1/b/%s/o/%s?'
+                                 'generation=%s&alt=media' %
+                                 (self.endpoint, bucket, quoted, generation),
+                    'name': name,
+                    'bucket': bucket,
+                    'generation': str(generation),
+                    'metageneration': '1',
+                    'contentType': content_type,
+                    'storageClass': bkt['meta']['storageClass'],
+                    'size': str(len(data)),
+                    'md5Hash': _b64(hashlib.md5(data).digest()),
+                    'etag': _b64(('%s/1' % generation).encode('ascii')),
+                    'timeCreated': _timestamp(now),
+                    'updated': _timestamp(now)}
+            if name not in bkt['objects']:
+                bisect.insort(bkt['names'], name)
+            bkt['objects'][name] = (meta, data)
+            return dict(meta)
+
+    def get_object_data(self, bucket, name):
+        """Return contents of an object stored in the backend."""
+        with self._lock:
+            return self._get_object(bucket, name)[1]
+
+    # Request routing
+
+    def _request(self, method, url, params=None, headers=None, json=None,
+                 data=None, **kwargs):
+        split = parse.urlsplit(url)
+        path = split.path[len(self._base_path):]
+        query = dict(parse.parse_qsl(split.query))
+        query.update((k, six.text_type(v)) for k, v in (params or {}).items()
+                     if v is not None)
+        headers = structures.CaseInsensitiveDict(headers or {})
+        if data is not None and not isinstance(data, six.binary_type):
+            data = bytes(data)
+
+        response = self._handle(method.upper(), path, query, headers, json,
+                                data)
+        if method.upper() == 'HEAD':
+            response.content = b''
+        elif (response.content and query.get('alt') != 'media' and
+                'gzip' in headers.get('Accept-Encoding', '') and
+                'gzip' in headers.get('User-Agent', '')):
+            # Content is returned decompressed, like requests does, but the
+            # headers tell the size it would have had on the wire.
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            wire = compressor.compress(response.content) + compressor.flush()
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Content-Length'] = str(len(wire))
+        return response
+
+    def _handle(self, method, path, query, headers, body, data):
+        try:
+            with self._lock:
+                response = self._route(method, path, query, headers, body,
+                                       data)
+            if (query.get('fields') and query.get('alt') != 'media' and
+                    response.status_code == requests.codes.ok):
+                spec = _parse_fields(query['fields'])[0]
+                response = transport.Response(
+                    response.status_code,
+                    _select_fields(response.json(), spec), response.headers)
+            return response
+        except _HttpError as exc:
+            body = {'error': {'code': exc.code, 'message': exc.message,
+                              'errors': [{'message': exc.message}]}}
+            return transport.Response(exc.code, body)
+
+    def _batch(self, headers, data):
+        content_type = headers.get('Content-Type', '')
+        try:
+            calls = batch.parse_multipart_request(content_type, data)
+        except Exception:
+            raise _HttpError(requests.codes.bad_request, 'Invalid batch')
+        if len(calls) > batch.MAX_BATCH_SIZE:
+            raise _HttpError(requests.codes.bad_request,
+                             'Too many requests in batch')
+
+        responses = []
+        for content_id, method, url, sub_headers, sub_data in calls:
+            split = parse.urlsplit(url)
+            body = json.loads(sub_data.decode('utf-8')) if sub_data else None
+            r = self._handle(method, split.path,
+                             dict(parse.parse_qsl(split.query)),
+                             structures.CaseInsensitiveDict(sub_headers),
+                             body, sub_data)
+            responses.append((content_id, r.status_code,
+                              {'Content-Type': 'application/json'},
+                              r.content))
+        content_type, content = batch.encode_multipart(responses)
+        return transport.Response(requests.codes.ok, content,
+                                  {'Content-Type': content_type})
+
+    def _route(self, method, path, query, headers, body, data):
+        if path == self.BATCH and method == 'POST':
+            return self._batch(headers, data)
+
+        if path.startswith(self.UPLOAD):
+            parts = self._split(path[len(self.UPLOAD):])
+            if len(parts) == 2 and parts[1] == 'o':
+                if method == 'POST':
+                    return self._upload_start(parts[0], query, headers, data)
+                if method == 'PUT':
+                    return self._upload_chunk(query, headers, data)
+            raise _HttpError(requests.codes.not_found)
+
+        if not path.startswith(self.API):
+            raise _HttpError(requests.codes.not_found)
+
+        parts = self._split(path[len(self.API):])
+        if not parts:
+            if method in ('GET', 'HEAD'):
+                return transport.Response(requests.codes.ok,
+                                          self._list_buckets(query))
+            if method == 'POST':
+                return transport.Response(requests.codes.ok,
+                                          self.create_bucket(**body))
+
+        elif len(parts) == 1:
+            if method in ('GET', 'HEAD'):
+                return self._metadata(self._get_bucket(parts[0])['meta'],
+                                      query, headers)
+            if method == 'PATCH':
+                bkt = self._get_bucket(parts[0])
+                return transport.Response(requests.codes.ok,
+                                          self._patch(bkt['meta'], query,
+                                                      body))
+            if method == 'DELETE':
+                self._delete_bucket(parts[0], query)
+                return transport.Response(requests.codes.no_content)
+
+        elif len(parts) == 2 and parts[1] == 'o':
+            if method == 'GET':
+                return transport.Response(requests.codes.ok,
+                                          self._list_objects(parts[0], query))
+
+        elif len(parts) == 3 and parts[1] == 'o':
+            bucket, name = parts[0], parts[2]
+            if method in ('GET', 'HEAD'):
+                if query.get('alt') == 'media':
+                    return self._download(bucket, name, query, headers)
+                return self._metadata(self._get_object(bucket, name,
+                                                       query)[0],
+                                      query, headers)
+            if method == 'PATCH':
+                meta = self._get_object(bucket, name, query)[0]
+                self._check_generation(meta, query)
+                return transport.Response(requests.codes.ok,
+                                          self._patch(meta, query, body))
+            if method == 'DELETE':
+                self._delete_object(bucket, name, query)
+                return transport.Response(requests.codes.no_content)
+
+        raise _HttpError(requests.codes.method_not_allowed)
+
+    @staticmethod
+    def _metadata(meta, query, headers):
+        # Reads conditional on metadata having changed reply Not Modified
+        if (headers.get('If-None-Match') == meta['etag'] or
+                query.get('ifMetagenerationNotMatch') ==
+                meta['metageneration']):
+            return transport.Response(requests.codes.not_modified)
+        return transport.Response(requests.codes.ok, meta)
+
+    @staticmethod
+    def _split(path):
+        return [parse.unquote(p) for p in path.split('/') if p]
+
+    # Buckets
+
+    def _get_bucket(self, name):
+        try:
+            return self._buckets[name]
+        except KeyError:
+            raise _HttpError(requests.codes.not_found)
+
+    def _list_buckets(self, query):
+        prefix = query.get('prefix', '')
+        names = sorted(n for n in self._buckets if n.startswith(prefix))
+        entries, next_name = self._page(names, query)
+        result = {'kind': 'storage#buckets',
+                  'items': [dict(self._buckets[n]['meta'])
+                            for n, __ in entries]}
+        if next_name is not None:
+            result['nextPageToken'] = _encode_token(next_name)
+        return result
+
+    def _delete_bucket(self, name, query):
+        bkt = self._get_bucket(name)
+        self._check_metageneration(bkt['meta'], query)
+        if bkt['objects']:
+            raise _HttpError(requests.codes.conflict,
+                             'The bucket you tried to delete was not empty.')
+        del self._buckets[name]
+
+    def _patch(self, meta, query, body):
+        """Update metadata in place with patch semantics."""
+        self._check_metageneration(meta, query)
+        for key, value in (body or {}).items():
+            if key == 'metadata' and value is not None:
+                metadata = meta.setdefault('metadata', {})
+                metadata.update(value)
+                for k, v in value.items():
+                    if v is None:
+                        del metadata[k]
+            elif value is None:
+                meta.pop(key, None)
+            else:
+                meta[key] = value
+        metageneration = str(int(meta['metageneration']) + 1)
+        meta['metageneration'] = metageneration
+        meta['etag'] = _b64(('%s/%s' % (meta.get('generation', '0'),
+                                        metageneration)).encode('ascii'))
+        meta['updated'] = _timestamp(time.time())
+        return dict(meta)
+
+    # Objects
+
+    def _get_object(self, bucket, name, query=None):
+        bkt = self._get_bucket(bucket)
+        try:
+            meta, data = bkt['objects'][name]
+        except KeyError:
+            raise _HttpError(requests.codes.not_found)
+        generation = (query or {}).get('generation')
+        if generation and generation != meta['generation']:
+            raise _HttpError(requests.codes.not_found)
+        return meta, data
+
+    def _check_generation(self, meta, query):
+        if ('ifGenerationMatch' in query and
+                query['ifGenerationMatch'] != meta['generation']):
+            raise _HttpError(requests.codes.precondition_failed)
+        if ('ifGenerationNotMatch' in query and
+                query['ifGenerationNotMatch'] == meta['generation']):
+            raise _HttpError(requests.codes.precondition_failed)
+
+    def _check_metageneration(self, meta, query):
+        if ('ifMetagenerationMatch' in query and
+                query['ifMetagenerationMatch'] != meta['metageneration']):
+            raise _HttpError(requests.codes.precondition_failed)
+        if ('ifMetagenerationNotMatch' in query and
+                query['ifMetagenerationNotMatch'] == meta['metageneration']):
+            raise _HttpError(requests.codes.precondition_failed)
+
+    def _delete_object(self, bucket, name, query):
+        meta, __ = self._get_object(bucket, name, query)
+        self._check_generation(meta, query)
+        self._check_metageneration(meta, query)
+        bkt = self._buckets[bucket]
+        del bkt['objects'][name]
+        del bkt['names'][bisect.bisect_left(bkt['names'], name)]
+
+    def _page(self, names, query, delimiter=None, prefix=''):
+        """Select a page of names.
+
+        Returns a list of (name, is_prefix) entries and next name to list.
+        """
+        max_results = int(query.get('maxResults') or 1000)
+        start = query.get('pageToken')
+        i = bisect.bisect_left(names, _decode_token(start)) if start else 0
+        entries = []
+        while i < len(names) and len(entries) < max_results:
+            name = names[i]
+            i += 1
+            pos = name.find(delimiter, len(prefix)) if delimiter else -1
+            if pos != -1:
+                name = name[:pos + len(delimiter)]
+                while i < len(names) and names[i].startswith(name):
+                    i += 1
+            entries.append((name, pos != -1))
+        return entries, (names[i] if i < len(names) else None)
+
+    def _list_objects(self, bucket, query):
+        bkt = self._get_bucket(bucket)
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        names = bkt['names']
+        if prefix:
+            begin = bisect.bisect_left(names, prefix)
+            end = begin
+            while end < len(names) and names[end].startswith(prefix):
+                end += 1
+            names = names[begin:end]
+        if query.get('startOffset'):
+            names = names[bisect.bisect_left(names, query['startOffset']):]
+        if query.get('endOffset'):
+            names = names[:bisect.bisect_left(names, query['endOffset'])]
+        if query.get('matchGlob'):
+            regex = gcs_query.glob_to_regex(query['matchGlob'])
+            names = [name for name in names if regex.match(name)]
+
+        entries, next_name = self._page(names, query, delimiter, prefix)
+        result = {'kind': 'storage#objects'}
+        items = [dict(bkt['objects'][n][0]) for n, is_prefix in entries
+                 if not is_prefix]
+        prefixes = [n for n, is_prefix in entries if is_prefix]
+        if items:
+            result['items'] = items
+        if prefixes:
+            result['prefixes'] = prefixes
+        if next_name is not None:
+            result['nextPageToken'] = _encode_token(next_name)
+        return result
+
+    def _download(self, bucket, name, query, headers):
+        meta, data = self._get_object(bucket, name, query)
+        data_range = headers.get('Range')
+        if not data_range:
+            return transport.Response(requests.codes.ok, data)
+
+        begin, __, end = data_range.split('=', 1)[1].partition('-')
+        begin = int(begin)
+        end = min(int(end) if end else len(data) - 1, len(data) - 1)
+        if begin >= len(data):
+            raise _HttpError(requests.codes.requested_range_not_satisfiable)
+        return transport.Response(
+            requests.codes.partial_content, data[begin:end + 1],
+            {'Content-Range': 'bytes %s-%s/%s' % (begin, end, len(data))})
+
+    # Uploads
+
+    def _upload_start(self, bucket, query, headers, data):
+        self._get_bucket(bucket)
+        name = query.get('name')
+        if not name:
+            raise _HttpError(requests.codes.bad_request, 'Missing name')
+        content_type = headers.get('Content-type',
+                                   'application/octet-stream')
+        upload_type = query.get('uploadType')
+
+        if upload_type == 'media':
+            meta = self.create_object(bucket, name, data or b'', content_type)
+            return transport.Response(requests.codes.ok, meta)
+
+        if upload_type != 'resumable':
+            raise _HttpError(requests.codes.bad_request,
+                             'Unsupported uploadType %s' % upload_type)
+
+        upload_id = six.text_type(next(self._upload_id))
+        self._uploads[upload_id] = (bucket, name, content_type, bytearray())
+        location = '%s%s/%s/o?uploadType=resumable&upload_id=%s' % (
+            self.endpoint, self.UPLOAD, parse.quote(bucket, safe=''),
+            upload_id)
+        return transport.Response(requests.codes.ok, b'',
+                                  {'Location': location})
+
+    def _upload_chunk(self, query, headers, data):
+        try:
+            bucket, name, content_type, buf = self._uploads[
+                query.get('upload_id')]
+        except KeyError:
+            raise _HttpError(requests.codes.not_found, 'Unknown upload')
+
+        data_range = headers.get('Content-Range', '')
+        try:
+            positions, total = data_range.split(' ', 1)[1].split('/')
+            if positions != '*':
+                begin = int(positions.split('-')[0])
+                buf[begin:] = data or b''
+        except Exception:
+            raise _HttpError(requests.codes.bad_request,
+                             'Invalid Content-Range %s' % data_range)
+
+        if total == '*' or int(total) != len(buf):
+            headers = {'Range': 'bytes=0-%s' % (len(buf) - 1)} if buf else {}
+            return transport.Response(requests.codes.resume_incomplete, b'',
+                                      headers)
+
+        del self._uploads[query['upload_id']]
+        return transport.Response(requests.codes.ok,
+                                  self.create_object(bucket, name, bytes(buf),
+                                                     content_type))
@@ -16,18 +16,20 @@
 from __future__ import absolute_import
 
 import collections
-import json
 import os
 import six
 
 import requests
 
 from gcs_client import base
+from gcs_client import cache as gcs_cache
 from gcs_client import common
 from gcs_client import errors
+from gcs_client import transport
 
 
-__all__ = ('BLOCK_MULTIPLE', 'DEFAULT_BLOCK_SIZE', 'Object', 'GCSObjFile')
+__all__ = ('BLOCK_MULTIPLE', 'DEFAULT_BLOCK_SIZE', 'Object', 'ObjectRecord',
+           'GCSObjFile')
 
 
 BLOCK_MULTIPLE = 256 * 1024
@@ -107,8 +109,16 @@ class Object(base.Fillable):
     """
 
     kind = 'storage#objects'
-    timeDeleted = None
-    metadata = {}
+    _fields = ('acl', 'bucket', 'cacheControl', 'componentCount',
+               'contentDisposition', 'contentEncoding', 'contentLanguage',
+               'contentType', 'crc32c', 'customTime', 'customerEncryption',
+               'etag', 'eventBasedHold', 'generation', 'hardDeleteTime', 'id',
+               'kmsKeyName', 'md5Hash', 'mediaLink', 'metadata',
+               'metageneration', 'name', 'owner', 'restoreToken', 'retention',
+               'retentionExpirationTime', 'selfLink', 'size', 'softDeleteTime',
+               'storageClass', 'temporaryHold', 'timeCreated', 'timeDeleted',
+               'timeStorageClassUpdated', 'updated')
+    _field_defaults = {'timeDeleted': None, 'metadata': {}}
     _required_attributes = base.GCS._required_attributes + ['bucket', 'name']
     _URL = base.Fillable._URL + '/{bucket}/o/{name}'
 
@@ -138,12 +148,23 @@ class Object(base.Fillable):
         self.name = name
         self.bucket = bucket
         self.generation = generation
+        # Generation we retrieve, generation is replaced by retrieved metadata
+        self._generation = generation
         self._chunksize = chunksize
 
+    def _cache_key(self):
+        generation = self._generation
+        return (self.bucket, self.name,
+                None if generation is None else str(generation))
+
     @common.retry
-    def _get_data(self):
-        r = self._request(parse=True, generation=self.generation)
-        return r.json()
+    def _get_data(self, fields=None, **kwargs):
+        params = {'fields': fields} if fields else {}
+        params.update(kwargs)
+        r = self._request(parse=True, generation=self._generation, **params)
+        if r.status_code == requests.codes.not_modified:
+            return None
+        return transport.parse_json(r)
 
     @common.is_complete
     @common.retry
@@ -187,6 +208,7 @@ class Object(base.Fillable):
                       ifGenerationNotMatch=if_generation_not_match,
                       ifMetagenerationMatch=if_metageneration_match,
                       ifMetagenerationNotMatch=if_metageneration_not_match)
+        self._invalidate_cache()
 
     @common.is_complete
     def open(self, mode='r', chunksize=None):
@@ -205,6 +227,32 @@ class Object(base.Fillable):
                           chunksize or self._chunksize, self.retry_params,
                           self.generation)
 
+    def submit_delete(self, *args, **kwargs):
+        """Delete the object on the shared Executor.
+
+        Accepts the same arguments as the delete method.
+
+        :returns: Future that will hold None once the object is deleted.
+        :rtype: concurrent.futures.Future
+        """
+        return self.submit('delete', *args, **kwargs)
+
+    def _read(self, chunksize=None):
+        with self.open('r', chunksize) as f:
+            return f.read()
+
+    def submit_read(self, chunksize=None):
+        """Read the contents of the object on the shared Executor.
+
+        :param chunksize: Size in bytes of the payload to receive from GCS.
+                          Default chunksize is the one defined on object's
+                          initialization.
+        :type chunksize: int
+        :returns: Future that will hold the bytes of the object.
+        :rtype: concurrent.futures.Future
+        """
+        return self.submit('_read', chunksize)
+
     def __str__(self):
         return '%s/%s' % (self.bucket, self.name)
 
@@ -214,6 +262,104 @@ class Object(base.Fillable):
                 self.generation, getattr(self, 'etag', '?')))
 
 
+class ObjectRecord(object):
+    """Compact representation of a listed object.
+
+    Records only hold a few attributes of the object, don't have per instance
+    dictionaries and never request data from GCS, so they are much lighter
+    than Object instances when listing huge numbers of objects.  They can be
+    converted to a full Object with to_object.
+
+    :ivar bucket: The name of the bucket containing this object.
+    :vartype bucket: string
+
+    :ivar name: The name of this object.
+    :vartype name: string
+
+    :ivar size: Content-Length of the data in bytes.
+    :vartype size: int
+
+    :ivar generation: The content generation of this object.
+    :vartype generation: int
+
+    :ivar md5Hash: MD5 hash of the data; encoded using base64.
+    :vartype md5Hash: string
+
+    :ivar crc32c: CRC32c checksum, encoded using base64 in big-endian byte
+                  order.
+    :vartype crc32c: string
+
+    :ivar updated: The modification time of the object metadata in RFC 3339
+                   format.
+    :vartype updated: string
+    """
+    __slots__ = ('_parent', 'name', 'size', 'generation', 'md5Hash', 'crc32c',
+                 'updated')
+
+    #: Partial response fields needed to build records from a listing.
+    FIELDS = ('items(name,size,generation,md5Hash,crc32c,updated),prefixes,'
+              'nextPageToken')
+
+    def __init__(self, parent, name, size=None, generation=None, md5Hash=None,
+                 crc32c=None, updated=None):
+        """Initialize a record.
+
+        :param parent: Bucket or Prefix the object was listed from.
+        :type parent: gcs_client.Bucket or gcs_client.Prefix
+        """
+        self._parent = parent
+        self.name = name
+        self.size = size
+        self.generation = generation
+        self.md5Hash = md5Hash
+        self.crc32c = crc32c
+        self.updated = updated
+
+    @classmethod
+    def _from_data(cls, data, parent):
+        size = data.get('size')
+        generation = data.get('generation')
+        return cls(parent, data['name'],
+                   None if size is None else int(size),
+                   None if generation is None else int(generation),
+                   data.get('md5Hash'), data.get('crc32c'),
+                   data.get('updated'))
+
+    @classmethod
+    def _list_kwargs(cls, records, fields=None):
+        """Additional arguments for a listing of records or with fields."""
+        if not records:
+            return {'fields': fields} if fields else {}
+        return {'fields': fields or cls.FIELDS,
+                '_item_factory': cls._from_data}
+
+    @property
+    def bucket(self):
+        return self._parent.name
+
+    def to_object(self, chunksize=None):
+        """Return a full Object for the latest generation of this object.
+
+        Object attributes will be retrieved from GCS when accessed.
+
+        :param chunksize: Size in bytes of the payload to send/receive to/from
+                          GCS.  Default is gcs_client.DEFAULT_BLOCK_SIZE
+        :type chunksize: int
+        :returns: Object instance.
+        :rtype: gcs_client.Object
+        """
+        return Object(self.bucket, self.name, None, self._parent.credentials,
+                      self._parent.retry_params, chunksize)
+
+    def __str__(self):
+        return '%s/%s' % (self.bucket, self.name)
+
+    def __repr__(self):
+        return ("%s.%s('%s', '%s', %s)" % (self.__module__,
+                self.__class__.__name__, self.bucket, self.name,
+                self.generation))
+
+
 class GCSObjFile(object):
     """Reader/Writer for GCS Objects.
 
@@ -275,6 +421,7 @@ class GCSObjFile(object):
         self._buffer = _Buffer()
         self._retry_params = retry_params
         self._generation = generation
+        self._transport = transport.Transport.get_default()
         self.closed = True
         try:
             self._open()
@@ -308,10 +455,11 @@ class GCSObjFile(object):
             self._location = self._URL % (safe_bucket, safe_name)
             params = {'fields': 'size', 'generation': self._generation}
             headers = {'Authorization': self._credentials.authorization}
-            r = requests.get(self._location, params=params, headers=headers)
+            r = self._transport.get(self._location, params=params,
+                                    headers=headers)
             if r.status_code == requests.codes.ok:
                 try:
-                    self.size = int(json.loads(r.content)['size'])
+                    self.size = int(transport.loads(r.content)['size'])
                 except Exception as exc:
                     raise errors.Error('Bad data returned by GCS %s' % exc)
 
@@ -322,7 +470,8 @@ class GCSObjFile(object):
             headers = {'x-goog-resumable': 'start',
                        'Authorization': self._credentials.authorization,
                        'Content-type': 'application/octet-stream'}
-            r = requests.post(initial_url, params=params, headers=headers)
+            r = self._transport.post(initial_url, params=params,
+                                     headers=headers)
             if r.status_code == requests.codes.ok:
                 self._location = r.headers['Location']
 
@@ -369,6 +518,7 @@ class GCSObjFile(object):
         # TODO: This could be optimized to not discard all buffer for small
         # movements.
         self._offset = self._gcs_offset = position
+        self._eof = False
         self._buffer.clear()
 
     def write(self, data):
@@ -408,7 +558,7 @@ class GCSObjFile(object):
 
         headers = {'Authorization': self._credentials.authorization,
                    'Content-Range': data_range}
-        r = requests.put(self._location, data=data, headers=headers)
+        r = self._transport.put(self._location, data=data, headers=headers)
 
         if size == '*':
             expected = requests.codes.resume_incomplete
@@ -432,6 +582,8 @@ class GCSObjFile(object):
             if self._is_writable():
                 self._send_data(self._buffer.read(), self._gcs_offset,
                                 finalize=True)
+                gcs_cache.MetadataCache.get_default().invalidate(self.bucket,
+                                                                 self.name)
             self.closed = True
 
     def read(self, size=None):
@@ -476,7 +628,7 @@ class GCSObjFile(object):
         headers = {'Authorization': self._credentials.authorization,
                    'Range': 'bytes=%d-%d' % (begin, end)}
         params = {'alt': 'media'}
-        r = requests.get(self._location, params=params, headers=headers)
+        r = self._transport.get(self._location, params=params, headers=headers)
         expected = (requests.codes.ok, requests.codes.partial_content,
                     requests.codes.requested_range_not_satisfiable)
 
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Persistent local inventory of bucket contents.
+
+An Inventory keeps the metadata of the objects of one or more buckets in a
+SQLite database, so prefix listings, name lookups, size totals and
+modification queries can be answered locally instead of listing the bucket
+every time:
+
+.. code-block:: python
+
+    from gcs_client import inventory
+
+    with inventory.Inventory('/var/lib/inventory.db') as inv:
+        inv.sync(bucket)
+        # Later on, only re-list prefixes we know have changed
+        inv.refresh(bucket, ['logs/2016-11-26/'])
+        count, size = inv.total_size(bucket.name, 'logs/')
+"""
+
+from __future__ import absolute_import
+
+import collections
+import sqlite3
+import time
+
+import six
+
+from gcs_client import columns
+
+
+__all__ = ('Inventory', 'SyncStats')
+
+
+SyncStats = collections.namedtuple('SyncStats',
+                                   ('added', 'changed', 'removed', 'total'))
+
+_COLUMNS = ('name', 'size', 'generation', 'md5Hash', 'crc32c', 'updated')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS objects (
+    bucket TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    generation INTEGER,
+    md5Hash TEXT,
+    crc32c TEXT,
+    updated INTEGER,
+    PRIMARY KEY (bucket, name)
+);
+CREATE INDEX IF NOT EXISTS objects_updated ON objects (bucket, updated);
+CREATE TABLE IF NOT EXISTS syncs (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix)
+);
+'''
+
+
+def _prefix_range(prefix):
+    """SQL condition and arguments to select names starting with prefix."""
+    if not prefix:
+        return '', ()
+    # SQLite compares TEXT with memcmp, and UTF-8 byte order is code point
+    # order, so names with the prefix are the ones in [prefix, upper)
+    upper = prefix[:-1] + six.unichr(ord(prefix[-1]) + 1)
+    return ' AND name >= ? AND name < ?', (prefix, upper)
+
+
+class Inventory(object):
+    """Local SQLite index of the objects in buckets.
+
+    Only the latest generation of each object is kept.  Instances must be
+    used from a single thread.
+    """
+
+    def __init__(self, path=':memory:'):
+        """Open or create an inventory.
+
+        :param path: Path to the SQLite database file.  Default is an in-memory
+                     database.
+        :type path: String
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sync(self, bucket, prefix='', prefetch=1):
+        """Synchronize objects of a bucket with the inventory.
+
+        Lists all objects in the bucket that start with prefix and adds,
+        updates and removes entries in the inventory to match the listing.
+
+        :param bucket: Bucket to synchronize.
+        :type bucket: gcs_client.Bucket
+        :param prefix: Only synchronize objects starting with this prefix.
+        :type prefix: String
+        :param prefetch: Number of listing pages to request in the background
+                         while the current one is stored.
+        :type prefetch: int
+        :returns: Statistics of the synchronization.
+        :rtype: SyncStats
+        """
+        return self.refresh(bucket, [prefix], prefetch)
+
+    def refresh(self, bucket, prefixes, prefetch=1):
+        """Re-list only some prefixes of a bucket.
+
+        GCS has no way to tell which parts of a bucket have changed without
+        listing them, so the caller provides the prefixes that must be
+        refreshed, for example from Pub/Sub object change notifications.
+
+        :param bucket: Bucket to refresh.
+        :type bucket: gcs_client.Bucket
+        :param prefixes: Prefixes that must be listed again.
+        :type prefixes: Iterable of strings
+        :param prefetch: Number of listing pages to request in the background
+                         while the current one is stored.
+        :type prefetch: int
+        :returns: Aggregated statistics of the refreshed prefixes.
+        :rtype: SyncStats
+        """
+        totals = [0, 0, 0, 0]
+        for prefix in prefixes:
+            stats = self._sync_prefix(bucket, prefix, prefetch)
+            totals = [a + b for a, b in zip(totals, stats)]
+        return SyncStats(*totals)
+
+    def _sync_prefix(self, bucket, prefix, prefetch):
+        db = self._db
+        condition, args = _prefix_range(prefix)
+        args = (bucket.name,) + args
+        with db:
+            db.execute('CREATE TEMP TABLE IF NOT EXISTS listing '
+                       '(name TEXT PRIMARY KEY, size INTEGER, '
+                       'generation INTEGER, md5Hash TEXT, crc32c TEXT, '
+                       'updated INTEGER)')
+            db.execute('DELETE FROM listing')
+
+            iterator = bucket.iter_list(prefix=prefix or None, records=True,
+                                        prefetch=prefetch)
+            page = []
+            for record in iterator:
+                page.append((record.name, record.size, record.generation,
+                             record.md5Hash, record.crc32c,
+                             record.updated and
+                             columns.rfc3339_to_epoch(record.updated)))
+                if len(page) >= 1000:
+                    db.executemany('INSERT OR REPLACE INTO listing '
+                                   'VALUES (?, ?, ?, ?, ?, ?)', page)
+                    page = []
+            db.executemany('INSERT OR REPLACE INTO listing '
+                           'VALUES (?, ?, ?, ?, ?, ?)', page)
+
+            total = db.execute('SELECT COUNT(*) FROM listing').fetchone()[0]
+            added = db.execute(
+                'SELECT COUNT(*) FROM listing WHERE name NOT IN '
+                '(SELECT name FROM objects WHERE bucket = ?%s)' % condition,
+                args).fetchone()[0]
+            changed = db.execute(
+                'SELECT COUNT(*) FROM listing l JOIN objects o '
+                'ON o.bucket = ? AND o.name = l.name '
+                'WHERE o.generation IS NOT l.generation '
+                'OR o.size IS NOT l.size', (bucket.name,)).fetchone()[0]
+            removed = db.execute(
+                'DELETE FROM objects WHERE bucket = ?%s AND name NOT IN '
+                '(SELECT name FROM listing)' % condition, args).rowcount
+            db.execute('INSERT OR REPLACE INTO objects SELECT ?, * '
+                       'FROM listing', (bucket.name,))
+            db.execute('INSERT OR REPLACE INTO syncs VALUES (?, ?, ?)',
+                       (bucket.name, prefix, time.time()))
+            db.execute('DELETE FROM listing')
+        return SyncStats(added, changed, removed, total)
+
+    def _rows(self, sql, args):
+        for row in self._db.execute(sql, args):
+            yield dict(zip(_COLUMNS, row))
+
+    def get(self, bucket_name, name):
+        """Look up an object by name.
+
+        :returns: Dictionary with name, size, generation, md5Hash, crc32c and
+                  updated (as seconds since the epoch) or None if the object
+                  is not in the inventory.
+        :rtype: dict or NoneType
+        """
+        rows = list(self._rows('SELECT %s FROM objects WHERE bucket = ? AND '
+                               'name = ?' % ', '.join(_COLUMNS),
+                               (bucket_name, name)))
+        return rows[0] if rows else None
+
+    def list(self, bucket_name, prefix=''):
+        """Iterate over objects starting with prefix in name order.
+
+        :returns: Generator of dictionaries like the ones returned by get.
+        """
+        condition, args = _prefix_range(prefix)
+        return self._rows('SELECT %s FROM objects WHERE bucket = ?%s '
+                          'ORDER BY name' % (', '.join(_COLUMNS), condition),
+                          (bucket_name,) + args)
+
+    def total_size(self, bucket_name, prefix=''):
+        """Number of objects and total size of the objects under prefix.
+
+        :returns: Tuple with the number of objects and their size in bytes.
+        :rtype: tuple
+        """
+        condition, args = _prefix_range(prefix)
+        count, size = self._db.execute(
+            'SELECT COUNT(*), SUM(size) FROM objects WHERE bucket = ?%s' %
+            condition, (bucket_name,) + args).fetchone()
+        return count, size or 0
+
+    def updated_since(self, bucket_name, since, prefix=''):
+        """Iterate over objects modified since a given time.
+
+        :param since: Seconds since the epoch, UTC datetime or RFC 3339
+                      string.
+        :type since: int, float, datetime.datetime or String
+        :returns: Generator of dictionaries like the ones returned by get, in
+                  modification order.
+        """
+        condition, args = _prefix_range(prefix)
+        return self._rows('SELECT %s FROM objects WHERE bucket = ? AND '
+                          'updated >= ?%s ORDER BY updated, name' %
+                          (', '.join(_COLUMNS), condition),
+                          (bucket_name, columns.to_epoch(since)) + args)
+
+    def synced_at(self, bucket_name, prefix=''):
+        """Time of the last synchronization of a prefix.
+
+        :returns: Seconds since the epoch or None if it was never synced.
+        :rtype: float or NoneType
+        """
+        row = self._db.execute('SELECT synced_at FROM syncs WHERE bucket = ? '
+                               'AND prefix = ?',
+                               (bucket_name, prefix)).fetchone()
+        return row and row[0]
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Incremental parsing of JSON documents.
+
+Listing pages are JSON objects whose size is dominated by the items array, so
+the members of the top level object are parsed as the body is received, and
+the elements of the selected arrays are returned one by one, as soon as each
+one has been completely received:
+
+.. code-block:: python
+
+    from gcs_client import jsonstream
+
+    r = transport.get(url, stream=True)
+    for key, value in jsonstream.iter_object(r.iter_content(16384),
+                                             arrays=('items',)):
+        if key == 'items':
+            print(value['name'])
+
+Only the element being parsed and the chunk being read are held in memory.
+
+Parsing is done with the standard json module regardless of the decoder set
+with gcs_client.transport.set_json_decoder, as elements are located and
+decoded in a single step with its raw_decode method.
+"""
+
+from __future__ import absolute_import
+
+import codecs
+import json
+
+import six
+
+
+__all__ = ('iter_object',)
+
+
+_WHITESPACE = ' \t\n\r'
+
+_DECODER = json.JSONDecoder()
+
+
+class _Reader(object):
+    """Text buffer filled from an iterable of byte chunks on demand."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buf = six.text_type()
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            raise ValueError('Unexpected end of JSON document')
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self._decoder.decode(b'', True)
+        else:
+            text = self._decoder.decode(chunk)
+        # Drop text that has already been parsed
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+
+    def peek(self):
+        """Return next non whitespace character without consuming it."""
+        while True:
+            while (self.pos < len(self.buf) and
+                   self.buf[self.pos] in _WHITESPACE):
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._fill()
+
+    def expect(self, chars):
+        """Consume next character, which must be one of chars."""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError('Expecting one of %r at %r' %
+                             (chars, self.buf[self.pos:self.pos + 20]))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Parse a complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # Numbers and literals could continue in the next chunk
+            if end == len(self.buf) and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def end(self):
+        """Check there's nothing but whitespace left."""
+        while True:
+            while (self.pos < len(self.buf) and
+                   self.buf[self.pos] in _WHITESPACE):
+                self.pos += 1
+            if self.pos < len(self.buf):
+                raise ValueError('Extra data after JSON document: %r' %
+                                 self.buf[self.pos:self.pos + 20])
+            if self.eof:
+                return
+            self._fill()
+
+
+def iter_object(chunks, arrays=()):
+    """Parse a JSON object incrementally.
+
+    :param chunks: Body of the document in chunks of bytes encoded in UTF-8,
+                   like the ones returned by iter_content of responses.
+    :type chunks: Iterable of bytes
+    :param arrays: Keys of the members whose array elements will be returned
+                   individually.
+    :type arrays: Iterable of strings
+    :returns: Generator of (key, value) tuples for the members of the object,
+              in the order they are in the document.  Elements of the arrays
+              are returned as (key, element) tuples instead of one tuple for
+              the whole array.
+    :raises: ValueError if the document is not a valid JSON object.
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        reader.end()
+        return
+
+    while True:
+        key = reader.value()
+        if not isinstance(key, six.string_types):
+            raise ValueError('Expecting a string key, got %r' % (key,))
+        reader.expect(':')
+        if key in arrays and reader.peek() == '[':
+            reader.pos += 1
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.expect(',]') == ']':
+                        break
+        else:
+            yield key, reader.value()
+        if reader.expect(',}') == '}':
+            break
+    reader.end()
@@ -16,6 +16,8 @@
 from __future__ import absolute_import
 
 from gcs_client import base
+from gcs_client import columns
+from gcs_client import gcs_object
 
 
 class Prefix(base.Listable):
@@ -44,6 +46,7 @@ class Prefix(base.Listable):
     _URL = base.GCS._URL + '/{name}/o'
     _required_attributes = base.GCS._required_attributes + ['name',
                                                             'prefix']
+    _list_item_fields = ('bucket', 'name')
 
     def __init__(self, name, prefix, delimiter=None, credentials=None,
                  retry_params=None):
@@ -68,7 +71,7 @@ class Prefix(base.Listable):
         self.delimiter = delimiter
 
     def list(self, prefix='', maxResults=None, versions=None, delimiter=None,
-             projection=None, pageToken=None):
+             projection=None, pageToken=None, records=False, fields=None):
         """List Objects matching the criteria contained in the Bucket.
 
         In conjunction with the prefix filter, the use of the delimiter
@@ -129,16 +132,104 @@ class Prefix(base.Listable):
                            new object in subsequent listing results if it is in
                            part of the object namespace already listed.
         :type pageToken: String
+        :param records: If True objects will be returned as ObjectRecord
+                        instances instead of Object instances.
+        :type records: bool
+        :param fields: Partial response selector to only retrieve some
+                       attributes, for example 'items(size),prefixes'.  The
+                       bucket and name of the objects are always included,
+                       and objects will retrieve attributes that were not
+                       included when they are first accessed.
+        :type fields: String
         :returns: List of objects and prefixes that match the criteria.
         :rtype: List of gcs_client.Object and gcs_client.Prefix.
         """
         if delimiter is None:
             delimiter = self.delimiter
+        kwargs = gcs_object.ObjectRecord._list_kwargs(records, fields)
         return self._list(prefix=self.prefix + prefix,
                           maxResults=maxResults, versions=versions,
                           delimiter=delimiter,
                           projection=projection,
-                          pageToken=pageToken)
+                          pageToken=pageToken,
+                          **kwargs)
+
+    def iter_list(self, prefix='', maxResults=None, versions=None,
+                  delimiter=None, projection=None, pageToken=None,
+                  limit=None, prefetch=0, records=False, checkpoint=None,
+                  fields=None, stream=False):
+        """Iterate over Objects matching the criteria contained in the Prefix.
+
+        Same as list, but results are retrieved from GCS one page at a time
+        as they are consumed instead of retrieving all of them beforehand.
+
+        Arguments are the same as in list, with the addition of:
+
+        :param limit: Maximum number of results to return.
+        :type limit: int
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being consumed.  Default is 0, which
+                         disables prefetching.
+        :type prefetch: int
+        :param records: If True objects will be returned as ObjectRecord
+                        instances instead of Object instances.
+        :type records: bool
+        :param checkpoint: Checkpoint, or path to its file, where the position
+                           of the listing is saved as results are consumed,
+                           and from which an interrupted listing with the same
+                           arguments is resumed.
+        :type checkpoint: gcs_client.checkpoint.Checkpoint or String
+        :param stream: If True pages are parsed as they are received and
+                       results are returned as soon as they are decoded, which
+                       reduces memory usage of large pages.  Cannot be used
+                       with prefetch.
+        :type stream: bool
+        :returns: Iterator over the results, its page_token attribute can be
+                  used to continue the listing later.
+        :rtype: gcs_client.base.ListIterator
+        """
+        if delimiter is None:
+            delimiter = self.delimiter
+        kwargs = gcs_object.ObjectRecord._list_kwargs(records, fields)
+        return self._iter_list(prefix=self.prefix + prefix,
+                               maxResults=maxResults, versions=versions,
+                               delimiter=delimiter, projection=projection,
+                               pageToken=pageToken, _limit=limit,
+                               _prefetch=prefetch, _checkpoint=checkpoint,
+                               _stream=stream, **kwargs)
+
+    def list_columns(self, prefix='', versions=None, delimiter=None,
+                     maxResults=None, prefetch=0):
+        """List Objects in the Prefix into columns.
+
+        Instead of creating an instance for each object, attributes are
+        appended page by page to compact columns.
+
+        :param prefix: Filter results to objects whose names begin with this
+                       prefix.
+        :type prefix: String
+        :param versions: If True, lists all versions of an object as distinct
+                         results.  The default is False.
+        :type versions: bool
+        :param delimiter: Returns results in a directory-like mode, prefixes
+                          will be available in the prefixes attribute of the
+                          result.
+        :type delimiter: String
+        :param maxResults: Maximum number of items plus prefixes per page.
+        :type maxResults: Unsigned integer
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being processed.
+        :type prefetch: int
+        :returns: Columns with the attributes of the objects.
+        :rtype: gcs_client.columns.ObjectColumns
+        """
+        if delimiter is None:
+            delimiter = self.delimiter
+        result = columns.ObjectColumns()
+        return result.extend(self._iter_list(
+            prefix=self.prefix + prefix, versions=versions,
+            delimiter=delimiter, maxResults=maxResults, fields=result.FIELDS,
+            _prefetch=prefetch, _item_factory=result._append))
 
     def __str__(self):
         return self.prefix
@@ -17,8 +17,10 @@ from __future__ import absolute_import
 
 from gcs_client import base
 from gcs_client import bucket
+from gcs_client import cache as gcs_cache
 from gcs_client import common
 from gcs_client import constants
+from gcs_client import transport
 
 
 class Project(base.Listable):
@@ -27,6 +29,7 @@ class Project(base.Listable):
     _required_attributes = base.GCS._required_attributes + ['project_id']
     _URL = base.Fillable._URL + '?project={project_id}'
     _list_url = base.Fillable._URL
+    _list_item_fields = ('name',)
 
     def __init__(self, project_id, credentials=None, retry_params=None):
         """Initialize a Project object.
@@ -64,8 +67,12 @@ class Project(base.Listable):
         the bucket might not immediately appear in the returned list of
         buckets.
 
-        :param fields: Limit retrieved data for each bucket to these fields.
-        :type fields: list of strings
+        :param fields: Partial response selector to limit retrieved data, for
+                       example 'items(location)'.  The name of the buckets
+                       is always included, and buckets will retrieve
+                       attributes that were not included when they are first
+                       accessed.
+        :type fields: String
         :param maxResults: Maximum number of buckets to return.
         :type maxResults: Unsigned integer
         :param projection: Set of properties to return. Defaults to noAcl.
@@ -96,6 +103,42 @@ class Project(base.Listable):
                           maxResults=maxResults, projection=projection,
                           prefix=prefix, pageToken=pageToken)
 
+    def iter_list(self, fields=None, maxResults=None, projection=None,
+                  prefix=None, pageToken=None, limit=None, prefetch=0,
+                  checkpoint=None, stream=False):
+        """Iterate over the buckets of the project.
+
+        Same as list, but results are retrieved from GCS one page at a time
+        as they are consumed instead of retrieving all of them beforehand.
+
+        Arguments are the same as in list, with the addition of:
+
+        :param limit: Maximum number of results to return.
+        :type limit: int
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being consumed.  Default is 0, which
+                         disables prefetching.
+        :type prefetch: int
+        :param checkpoint: Checkpoint, or path to its file, where the position
+                           of the listing is saved as results are consumed,
+                           and from which an interrupted listing with the same
+                           arguments is resumed.
+        :type checkpoint: gcs_client.checkpoint.Checkpoint or String
+        :param stream: If True pages are parsed as they are received and
+                       results are returned as soon as they are decoded, which
+                       reduces memory usage of large pages.  Cannot be used
+                       with prefetch.
+        :type stream: bool
+        :returns: Iterator over the results, its page_token attribute can be
+                  used to continue the listing later.
+        :rtype: gcs_client.base.ListIterator
+        """
+        return self._iter_list(project=self.project_id, fields=fields,
+                               maxResults=maxResults, projection=projection,
+                               prefix=prefix, pageToken=pageToken,
+                               _limit=limit, _prefetch=prefetch,
+                               _checkpoint=checkpoint, _stream=stream)
+
     @common.is_complete
     @common.retry
     def create_bucket(self, name, location='US',
@@ -164,7 +207,10 @@ class Project(base.Listable):
             projection=projection,
             body={'name': name, 'location': location,
                   'storageClass': storage_class})
-        return bucket.Bucket._obj_from_data(r.json(), self.credentials)
+        # Forget the bucket was missing
+        gcs_cache.MetadataCache.get_default().invalidate(name)
+        return bucket.Bucket._obj_from_data(transport.parse_json(r),
+                                            self.credentials)
 
     def __str__(self):
         return self.project_id
@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Listing queries with glob, regex, size and time filters.
+
+Queries list as little of the bucket as possible: the listing starts at the
+longest literal prefix of the pattern, glob matching is sent to GCS in the
+matchGlob parameter, and when server side matching is disabled patterns with
+wildcards in directory names are resolved one directory level at a time using
+the "/" delimiter, so directories that can't match are never listed:
+
+.. code-block:: python
+
+    query = bucket.query('logs/2026-10-*/*.parquet').size(min_size=1)
+    for obj in query:
+        process(obj)
+
+Globs follow GCS matchGlob syntax: ``*`` matches any characters except
+``/``, ``**`` matches any characters including ``/``, ``?`` matches one
+character except ``/``, ``[abc]`` and ``[!abc]`` match character classes,
+``{a,b}`` matches any of the alternatives and ``\\`` escapes the next
+character.
+
+Filters are always applied on the client as well, so results are correct even
+when the server ignores matchGlob.
+"""
+
+from __future__ import absolute_import
+
+import copy
+import re
+
+from gcs_client import columns
+from gcs_client import prefix as gcs_prefix
+
+
+__all__ = ('Query', 'glob_prefix', 'glob_to_regex', 'regex_prefix')
+
+
+_LITERAL, _STAR, _GLOBSTAR, _ANY, _CLASS, _ALT = range(6)
+
+
+def _parse(pattern, i=0, in_alt=False):
+    """Parse a glob into tokens.
+
+    :returns: Tuple with the list of tokens and the position where parsing
+              stopped, which for alternatives is the position of the ',' or
+              '}' that ended it.
+    """
+    tokens = []
+    while i < len(pattern):
+        c = pattern[i]
+        if in_alt and c in ',}':
+            break
+        if c == '\\' and i + 1 < len(pattern):
+            tokens.append((_LITERAL, pattern[i + 1]))
+            i += 2
+        elif c == '*':
+            if pattern.startswith('**', i):
+                tokens.append((_GLOBSTAR,))
+                i += 2
+            else:
+                tokens.append((_STAR,))
+                i += 1
+        elif c == '?':
+            tokens.append((_ANY,))
+            i += 1
+        elif c == '[' and _parse_class(pattern, i):
+            regex, i = _parse_class(pattern, i)
+            tokens.append((_CLASS, regex))
+        elif c == '{' and _parse_alt(pattern, i):
+            alternatives, i = _parse_alt(pattern, i)
+            tokens.append((_ALT, alternatives))
+        else:
+            tokens.append((_LITERAL, c))
+            i += 1
+    return tokens, i
+
+
+def _parse_class(pattern, i):
+    """Parse a character class starting at i, None if it's unterminated."""
+    start = i + 1
+    negate = pattern[start:start + 1] == '!'
+    if negate:
+        start += 1
+    # A ']' right after the opening is part of the class
+    end = pattern.find(']', start + 1)
+    if end == -1:
+        return None
+    body = pattern[start:end].replace('\\', '\\\\')
+    if not negate and body.startswith('^'):
+        body = '\\' + body
+    return '[%s%s]' % ('^' if negate else '', body), end + 1
+
+
+def _parse_alt(pattern, i):
+    """Parse alternatives starting at i, None if they are unterminated."""
+    alternatives = []
+    while True:
+        tokens, i = _parse(pattern, i + 1, in_alt=True)
+        alternatives.append(tokens)
+        if i >= len(pattern):
+            return None
+        if pattern[i] == '}':
+            return alternatives, i + 1
+
+
+def _translate(tokens):
+    result = []
+    for token in tokens:
+        kind = token[0]
+        if kind == _LITERAL:
+            result.append(re.escape(token[1]))
+        elif kind == _STAR:
+            result.append('[^/]*')
+        elif kind == _GLOBSTAR:
+            result.append('.*')
+        elif kind == _ANY:
+            result.append('[^/]')
+        elif kind == _CLASS:
+            result.append(token[1])
+        else:
+            alternatives = [_translate(alt) for alt in token[1]]
+            result.append('(?:%s)' % '|'.join(alternatives))
+    return ''.join(result)
+
+
+def _literal(tokens):
+    """Literal characters at the beginning of tokens."""
+    result = []
+    for token in tokens:
+        if token[0] != _LITERAL:
+            break
+        result.append(token[1])
+    return ''.join(result)
+
+
+def _segments(tokens):
+    """Split tokens in the '/' separated segments of the names."""
+    segments = [[]]
+    for token in tokens:
+        if token == (_LITERAL, '/'):
+            segments.append([])
+        else:
+            segments[-1].append(token)
+    return segments
+
+
+def _crosses_dirs(tokens):
+    """Whether tokens can match a '/' other than as a segment separator."""
+    for token in tokens:
+        if token[0] == _GLOBSTAR:
+            return True
+        if token[0] == _CLASS and token[1].startswith('[^'):
+            return True
+        if token[0] == _ALT and any(
+                (_LITERAL, '/') in alt or _crosses_dirs(alt)
+                for alt in token[1]):
+            return True
+    return False
+
+
+def glob_to_regex(pattern):
+    """Compile a glob into a regular expression matching whole names.
+
+    :param pattern: Glob using GCS matchGlob syntax.
+    :type pattern: String
+    :returns: Compiled regular expression.
+    """
+    return re.compile('(?s)%s\\Z' % _translate(_parse(pattern)[0]))
+
+
+def glob_prefix(pattern):
+    """Longest literal prefix of the names matching a glob.
+
+    :param pattern: Glob using GCS matchGlob syntax.
+    :type pattern: String
+    :rtype: String
+    """
+    return _literal(_parse(pattern)[0])
+
+
+def regex_prefix(pattern, flags=0):
+    """Literal prefix of the names matching a regular expression.
+
+    Only simple cases are detected, for anything else an empty prefix is
+    returned, which is always correct.
+
+    :param pattern: Regular expression matched at the beginning of names.
+    :type pattern: String
+    :param flags: Flags the expression will be compiled with.
+    :type flags: int
+    :rtype: String
+    """
+    if '|' in pattern or flags & (re.IGNORECASE | re.VERBOSE):
+        return ''
+    result = []
+    i = 1 if pattern.startswith('^') else 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern) and \
+                not pattern[i + 1].isalnum():
+            size = 2
+        elif c in '.^$*+?{}[]|()\\':
+            break
+        else:
+            size = 1
+        following = pattern[i + size:i + size + 1]
+        # Quantifiers that allow zero repetitions make the char optional
+        if following in ('*', '?', '{'):
+            break
+        result.append(pattern[i + size - 1])
+        if following == '+':
+            break
+        i += size
+    return ''.join(result)
+
+
+class Query(object):
+    """Filtered listing of the objects in a bucket.
+
+    Filtering methods return a new query, so queries can be reused and
+    refined.  Results are retrieved from GCS as they are consumed when
+    iterating over the query.
+    """
+
+    def __init__(self, bucket, prefix=None, match_glob=True, versions=None,
+                 records=False, prefetch=0):
+        """Initialize a query.
+
+        :param bucket: Bucket whose objects will be listed.
+        :type bucket: gcs_client.Bucket
+        :param prefix: Only return objects whose names begin with this prefix.
+        :type prefix: String
+        :param match_glob: Whether globs are sent to GCS in the matchGlob
+                           parameter.  If False directory levels are listed
+                           using a delimiter instead.
+        :type match_glob: bool
+        :param versions: If True, lists all versions of an object as distinct
+                         results.
+        :type versions: bool
+        :param records: If True objects will be returned as ObjectRecord
+                        instances instead of Object instances.
+        :type records: bool
+        :param prefetch: Number of pages to request in the background ahead
+                         of the page being consumed.
+        :type prefetch: int
+        """
+        self.bucket = bucket
+        self.prefix = prefix or ''
+        self.match_glob = match_glob
+        self.versions = versions
+        self.records = records
+        self.prefetch = prefetch
+        self._glob = None
+        self._tokens = None
+        self._regex = None
+        self._regex_prefix = ''
+        self._filters = []
+
+    def _copy(self):
+        result = copy.copy(self)
+        result._filters = list(self._filters)
+        return result
+
+    def glob(self, pattern):
+        """Only return objects whose names match a glob.
+
+        :param pattern: Glob using GCS matchGlob syntax.
+        :type pattern: String
+        :returns: New query.
+        :rtype: Query
+        """
+        result = self._copy()
+        result._glob = pattern
+        result._tokens = _parse(pattern)[0]
+        result._regex = glob_to_regex(pattern)
+        result._regex_prefix = _literal(result._tokens)
+        return result
+
+    def regex(self, pattern, flags=0):
+        """Only return objects whose names match a regular expression.
+
+        :param pattern: Regular expression matched at the beginning of names,
+                        like re.match does.
+        :type pattern: String
+        :param flags: Regular expression flags.
+        :type flags: int
+        :returns: New query.
+        :rtype: Query
+        """
+        result = self._copy()
+        result._glob = result._tokens = None
+        result._regex = re.compile(pattern, flags)
+        result._regex_prefix = regex_prefix(pattern, flags)
+        return result
+
+    def size(self, min_size=None, max_size=None):
+        """Only return objects within a size range.
+
+        :param min_size: Minimum size in bytes, inclusive.
+        :type min_size: int
+        :param max_size: Maximum size in bytes, inclusive.
+        :type max_size: int
+        :returns: New query.
+        :rtype: Query
+        """
+        def size_filter(item):
+            size = int(item.size)
+            return ((min_size is None or size >= min_size) and
+                    (max_size is None or size <= max_size))
+        return self.where(size_filter)
+
+    def updated(self, after=None, before=None):
+        """Only return objects modified within a time range.
+
+        :param after: Return objects modified at or after this time.
+        :type after: Seconds since the epoch, UTC datetime or RFC 3339 string
+        :param before: Return objects modified before this time.
+        :type before: Seconds since the epoch, UTC datetime or RFC 3339 string
+        :returns: New query.
+        :rtype: Query
+        """
+        after = columns.to_epoch(after)
+        before = columns.to_epoch(before)
+
+        def updated_filter(item):
+            updated = columns.rfc3339_to_epoch(item.updated)
+            return ((after is None or updated >= after) and
+                    (before is None or updated < before))
+        return self.where(updated_filter)
+
+    def where(self, predicate):
+        """Only return objects for which predicate returns True.
+
+        :param predicate: Callable that receives an Object, or ObjectRecord,
+                          and returns whether it must be returned.
+        :type predicate: callable
+        :returns: New query.
+        :rtype: Query
+        """
+        result = self._copy()
+        result._filters.append(predicate)
+        return result
+
+    def _list_prefix(self):
+        """Prefix to list, None if no name can match the query."""
+        pattern_prefix = self._regex_prefix
+        if pattern_prefix.startswith(self.prefix):
+            return pattern_prefix
+        if self.prefix.startswith(pattern_prefix):
+            return self.prefix
+        return None
+
+    def _iter(self, prefix, **kwargs):
+        return self.bucket.iter_list(prefix=prefix or None,
+                                     versions=self.versions,
+                                     prefetch=self.prefetch,
+                                     records=self.records, **kwargs)
+
+    def _walk(self, directory, segments):
+        """List segments of a glob one directory level at a time."""
+        segment = segments[0]
+        literal = _literal(segment)
+        listing = self._iter(directory + literal, delimiter='/')
+        if len(segments) == 1:
+            for item in listing:
+                yield item
+            return
+
+        if len(literal) == len(segment):
+            subdirs = [directory + literal + '/']
+        else:
+            regex = re.compile('(?s)%s/\\Z' % _translate(segment))
+            subdirs = (item.prefix for item in listing
+                       if isinstance(item, gcs_prefix.Prefix) and
+                       regex.match(item.prefix, len(directory)))
+        for subdir in subdirs:
+            for item in self._walk(subdir, segments[1:]):
+                yield item
+
+    def _listing(self):
+        prefix = self._list_prefix()
+        if prefix is None:
+            return iter(())
+
+        if self._glob is None:
+            return self._iter(prefix)
+        if self.match_glob:
+            return self._iter(prefix, matchGlob=self._glob)
+        if (_crosses_dirs(self._tokens) or
+                len(prefix) > len(self._regex_prefix)):
+            return self._iter(prefix)
+        return self._walk('', _segments(self._tokens))
+
+    def _matches(self, item):
+        if isinstance(item, gcs_prefix.Prefix):
+            return False
+        if self._regex and not self._regex.match(item.name):
+            return False
+        if self.prefix and not item.name.startswith(self.prefix):
+            return False
+        return all(f(item) for f in self._filters)
+
+    def __iter__(self):
+        return (item for item in self._listing() if self._matches(item))
+
+    def list(self):
+        """Retrieve all matching objects.
+
+        :returns: List of matching objects.
+        :rtype: list of gcs_client.Object or gcs_object.ObjectRecord
+        """
+        return list(self)
+
+    def __repr__(self):
+        return '<%s gs://%s/%s%s>' % (
+            self.__class__.__name__, self.bucket.name, self.prefix,
+            self._glob or (self._regex and self._regex.pattern) or '')
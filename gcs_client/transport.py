@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from __future__ import absolute_import
+
+import abc
+import json
+import threading
+
+from requests import structures
+import six
+
+from gcs_client import connection
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+#: Endpoint used by default for all GCS requests.
+DEFAULT_ENDPOINT = 'https://www.googleapis.com'
+
+#: User agent sent on JSON API requests, Google APIs only compress responses
+#: for clients whose user agent contains gzip.
+USER_AGENT = 'gcs-client (gzip)'
+
+#: Headers that negotiate gzip compressed JSON API responses.
+GZIP_HEADERS = {'Accept-Encoding': 'gzip', 'User-Agent': USER_AGENT}
+
+#: JSON decoder used by default, orjson when it's installed.  None means the
+#: json method of the responses is used.
+DEFAULT_JSON_DECODER = orjson.loads if orjson else None
+
+_json_decoder = DEFAULT_JSON_DECODER
+
+
+def set_json_decoder(decoder):
+    """Set the function used to decode JSON documents received from GCS.
+
+    .. code-block:: python
+
+        import ujson
+        gcs_client.transport.set_json_decoder(ujson.loads)
+
+    Streamed listing pages are always parsed with the standard json module,
+    as incremental parsing needs its raw_decode method, which other decoders
+    don't provide.
+
+    :param decoder: Function that receives the body as bytes and returns the
+                    decoded document, like orjson.loads.  If None is passed
+                    responses will be decoded with their json method, and
+                    other documents with the standard json module.
+    :type decoder: callable or NoneType
+    """
+    global _json_decoder
+    _json_decoder = decoder
+
+
+def get_json_decoder():
+    """Return the function used to decode JSON documents or None."""
+    return _json_decoder
+
+
+def loads(data):
+    """Decode a JSON document with the configured decoder.
+
+    :param data: JSON document.
+    :type data: bytes
+    :returns: Decoded document.
+    """
+    if _json_decoder is None:
+        return json.loads(data.decode('utf-8'))
+    return _json_decoder(data)
+
+
+def parse_json(response):
+    """Return the JSON document of a response, parsing it only once.
+
+    The decoded document is cached in the response, so following calls return
+    the same object.
+
+    :param response: Response with a JSON body.
+    :type response: requests.Response or compatible object.
+    :returns: Decoded document.
+    :raises: Any exception raised by the decoder if body is not valid JSON.
+    """
+    cache = vars(response)
+    if '_json_document' not in cache:
+        if _json_decoder is None:
+            cache['_json_document'] = response.json()
+        else:
+            cache['_json_document'] = _json_decoder(response.content)
+    return cache['_json_document']
+
+
+def wire_size(response, decoded_size=None):
+    """Return the number of body bytes a response used on the wire.
+
+    For compressed responses this is the size before decompression.  It's the
+    bytes read from the connection for requests responses, the Content-Length
+    header for other compressed responses and the size of the content when
+    the response is not compressed.
+
+    :param decoded_size: Size of the decompressed body, for responses whose
+                         content has already been consumed.
+    :type decoded_size: int
+    """
+    tell = getattr(getattr(response, 'raw', None), 'tell', None)
+    if tell is not None:
+        try:
+            return int(tell())
+        except Exception:
+            pass
+    if response.headers.get('Content-Encoding'):
+        try:
+            return int(response.headers['Content-Length'])
+        except (KeyError, ValueError):
+            pass
+    if decoded_size is None:
+        return len(response.content)
+    return decoded_size
+
+
+class TransferStats(object):
+    """Thread safe counters of response bytes received by a transport.
+
+    :ivar responses: Number of responses received.
+    :vartype responses: int
+
+    :ivar compressed: Number of responses that were compressed.
+    :vartype compressed: int
+
+    :ivar wire_bytes: Body bytes received on the wire.
+    :vartype wire_bytes: int
+
+    :ivar decoded_bytes: Body bytes after decompression.
+    :vartype decoded_bytes: int
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Set all counters to 0."""
+        with self._lock:
+            self.responses = self.compressed = 0
+            self.wire_bytes = self.decoded_bytes = 0
+
+    def record(self, response, decoded_size=None):
+        """Add a response that has been completely read to the counters.
+
+        :param response: Response to add.
+        :type response: requests.Response or compatible object.
+        :param decoded_size: Size of the decompressed body, for streamed
+                             responses whose content has been consumed.
+        :type decoded_size: int
+        """
+        if decoded_size is None:
+            content = getattr(response, 'content', None)
+            if not isinstance(content, six.binary_type):
+                return
+            decoded_size = len(content)
+        wire = wire_size(response, decoded_size)
+        with self._lock:
+            self.responses += 1
+            if response.headers.get('Content-Encoding'):
+                self.compressed += 1
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded_size
+
+    @property
+    def ratio(self):
+        """Decoded bytes per byte received on the wire."""
+        if not self.wire_bytes:
+            return 1.0
+        return float(self.decoded_bytes) / self.wire_bytes
+
+    def __repr__(self):
+        return ('<%s: %s responses, %s wire bytes, %s decoded bytes>' %
+                (self.__class__.__name__, self.responses, self.wire_bytes,
+                 self.decoded_bytes))
+
+
+class Response(object):
+    """Minimal requests.Response look-alike for non requests transports."""
+
+    def __init__(self, status_code, content=b'', headers=None):
+        """Initialize a response.
+
+        :param status_code: HTTP status code of the response.
+        :type status_code: int
+        :param content: Body of the response, anything that is not bytes will
+                        be serialized as JSON.
+        :type content: bytes or JSON serializable object
+        :param headers: Headers of the response.
+        :type headers: dict
+        """
+        self.status_code = status_code
+        if not isinstance(content, six.binary_type):
+            content = json.dumps(content).encode('utf-8')
+        self.content = content
+        self.headers = structures.CaseInsensitiveDict(headers or {})
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+
+class Transport(object):
+    """Base class for all transports used to communicate with GCS.
+
+    Every request made by the library, be it on the JSON API, the upload API
+    or the media downloads, flows through the request method of a Transport
+    instance, so alternative HTTP engines or fake backends can be used without
+    changes in the resource classes.
+
+    Resource classes build their URLs using DEFAULT_ENDPOINT, and transports
+    will translate them to their configured endpoint.
+
+    Responses returned by transports must behave like requests.Response, at
+    least in regards to status_code, headers, content and json attributes.
+    Compressed responses must be returned already decompressed.
+
+    Bytes received, both on the wire and after decompression, are counted in
+    the stats attribute.  Streamed responses are counted once their body has
+    been read with iter_content or they have been closed, and not at all if
+    they are discarded before that.
+    """
+    __metaclass__ = abc.ABCMeta
+
+    #: Whether requests block the calling thread waiting for I/O.
+    blocking = True
+
+    def __init__(self, endpoint=None):
+        """Initialize transport.
+
+        :param endpoint: Scheme and host, and optionally port and path, where
+                         GCS API lives.  Defaults to DEFAULT_ENDPOINT.
+        :type endpoint: String
+        """
+        self.endpoint = (endpoint or DEFAULT_ENDPOINT).rstrip('/')
+        self.stats = TransferStats()
+
+    @staticmethod
+    def get_default():
+        """Return default transport (simpleton patern)."""
+        if not hasattr(Transport, 'default'):
+            Transport.default = HttpTransport()
+        return Transport.default
+
+    @staticmethod
+    def set_default(transport):
+        """Set default transport used by all GCS resources.
+
+        :param transport: Transport to use.  If None is passed we'll go back
+                          to an HttpTransport using the default endpoint.
+        :type transport: Transport or NoneType
+        """
+        assert isinstance(transport, (type(None), Transport))
+        Transport.default = transport or HttpTransport()
+
+    def url(self, url):
+        """Translate a URL on the default endpoint to our endpoint."""
+        if (self.endpoint != DEFAULT_ENDPOINT and
+                url.startswith(DEFAULT_ENDPOINT)):
+            url = self.endpoint + url[len(DEFAULT_ENDPOINT):]
+        return url
+
+    def request(self, method, url, **kwargs):
+        """Send a request to GCS.
+
+        :param method: HTTP method to use (GET, PUT, POST, HEAD, DELETE...)
+        :type method: String
+        :param url: URL for the request.
+        :type url: String
+        :param kwargs: Optional arguments params, headers, json and data with
+                       the same meaning as in requests.request.
+        :returns: Response to the request.
+        :rtype: requests.Response or compatible object.
+        """
+        r = self._request(method, self.url(url), **kwargs)
+        if kwargs.get('stream'):
+            self._record_when_read(r)
+        else:
+            self.stats.record(r)
+        return r
+
+    def _record_when_read(self, response):
+        """Record a streamed response once its body is read or closed."""
+        decoded = [0]
+
+        def record(r):
+            # Responses discarded without reading or closing them are lost
+            if r is not None:
+                self.stats.record(r, decoded[0])
+
+        def count(chunk):
+            decoded[0] += len(chunk)
+
+        connection.when_consumed(response, record, count)
+
+    @abc.abstractmethod
+    def _request(self, method, url, **kwargs):
+        raise NotImplementedError
+
+    def get(self, url, **kwargs):
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        """Send a PUT request."""
+        return self.request('PUT', url, **kwargs)
+
+
+class HttpTransport(Transport):
+    """Transport that sends requests over HTTP using a ConnectionPool."""
+
+    def __init__(self, endpoint=None, pool=None):
+        """Initialize HTTP transport.
+
+        :param endpoint: Scheme and host, and optionally port and path, where
+                         GCS API lives.  Defaults to DEFAULT_ENDPOINT.
+        :type endpoint: String
+        :param pool: Connection pool used for the requests.  Defaults to
+                     ConnectionPool.get_default().
+        :type pool: gcs_client.ConnectionPool
+        """
+        super(HttpTransport, self).__init__(endpoint)
+        self._pool = pool
+
+    @property
+    def pool(self):
+        """Connection pool used by this transport."""
+        return self._pool or connection.ConnectionPool.get_default()
+
+    def _request(self, method, url, **kwargs):
+        return self.pool.request(method, url, **kwargs)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""Disk usage of bucket prefixes.
+
+Object counts and sizes are aggregated per prefix while the listing pages
+are received, so no instance is created for the listed objects, and the
+prefixes of each level are listed concurrently on the shared Executor:
+
+.. code-block:: python
+
+    usage = bucket.usage('logs/', depth=2, concurrency=20)
+    for node in usage.walk():
+        print(node.prefix, node.count, node.size)
+"""
+
+from __future__ import absolute_import
+
+from concurrent import futures
+
+from gcs_client import common
+
+
+__all__ = ('Usage', 'aggregate')
+
+
+#: Partial response fields needed to aggregate usage.
+FIELDS = 'items(name,size,storageClass),prefixes,nextPageToken'
+
+
+class Usage(object):
+    """Totals of the objects whose names begin with a prefix.
+
+    :ivar prefix: Prefix of the objects.
+    :vartype prefix: String
+
+    :ivar count: Number of objects.
+    :vartype count: int
+
+    :ivar size: Total size in bytes.
+    :vartype size: int
+
+    :ivar storage_classes: Number of objects and total size per storage
+                           class, as two item lists.
+    :vartype storage_classes: dict
+
+    :ivar children: Usage of the sub-prefixes by prefix, they are included in
+                    the totals of this prefix.
+    :vartype children: dict
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.count = 0
+        self.size = 0
+        self.storage_classes = {}
+        self.children = {}
+
+    def _add(self, data, parent=None):
+        """Add an item from a listing, used as item factory."""
+        size = int(data.get('size', 0))
+        self.count += 1
+        self.size += size
+        totals = self.storage_classes.setdefault(data.get('storageClass'),
+                                                 [0, 0])
+        totals[0] += 1
+        totals[1] += size
+
+    def _add_children(self):
+        """Add totals of all descendants to this prefix."""
+        for child in self.children.values():
+            child._add_children()
+            self.count += child.count
+            self.size += child.size
+            for storage_class, (count, size) in child.storage_classes.items():
+                totals = self.storage_classes.setdefault(storage_class,
+                                                         [0, 0])
+                totals[0] += count
+                totals[1] += size
+
+    def walk(self):
+        """Iterate over this prefix and its descendants depth first.
+
+        Sub-prefixes are returned in name order.
+        """
+        yield self
+        for name in sorted(self.children):
+            for node in self.children[name].walk():
+                yield node
+
+    def __repr__(self):
+        return '<%s %r: %s objects, %s bytes>' % (
+            self.__class__.__name__, self.prefix, self.count, self.size)
+
+
+def _list_prefix(bucket, node, delimiter, versions):
+    """Aggregate objects of a listing, returns the sub-prefixes."""
+    listing = bucket._iter_list(prefix=node.prefix or None,
+                                delimiter=delimiter, versions=versions,
+                                fields=FIELDS, _item_factory=node._add)
+    return [item.prefix for item in listing if item is not None]
+
+
+def aggregate(bucket, prefix='', depth=1, concurrency=10, delimiter='/',
+              versions=None):
+    """Aggregate usage of a prefix and its sub-prefixes.
+
+    Prefixes up to depth levels below prefix are listed with the delimiter,
+    and prefixes at the last level are listed without it, so their totals
+    include all their descendants.
+
+    :param bucket: Bucket to aggregate.
+    :type bucket: gcs_client.Bucket
+    :param prefix: Prefix to aggregate.
+    :type prefix: String
+    :param depth: Number of levels of sub-prefixes to report.
+    :type depth: int
+    :param concurrency: Maximum number of prefixes listed concurrently.
+    :type concurrency: int
+    :param delimiter: Delimiter separating levels.
+    :type delimiter: String
+    :param versions: If True, all versions of objects are counted.
+    :type versions: bool
+    :returns: Usage of prefix, with sub-prefixes in its children.
+    :rtype: Usage
+    """
+    root = Usage(prefix)
+    executor = common.Executor.get_default().nested()
+    pending = [(root, 0)]
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < concurrency:
+                node, level = pending.pop()
+                future = executor.submit(
+                    _list_prefix, bucket, node,
+                    delimiter if level < depth else None, versions)
+                running[future] = (node, level)
+            done, __ = futures.wait(running,
+                                    return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                node, level = running.pop(future)
+                for sub_prefix in future.result():
+                    child = node.children[sub_prefix] = Usage(sub_prefix)
+                    pending.append((child, level + 1))
+    finally:
+        for future in running:
+            future.cancel()
+    root._add_children()
+    return root
@@ -15,6 +15,7 @@ with open('HISTORY.rst') as history_file:
     history = history_file.read().replace('.. :changelog:', '')
 
 requirements = [
+    "futures; python_version < '3'",
     'oauth2client<2',
     'requests[security]<3'
 ]
@@ -45,6 +46,8 @@ setup(
     package_dir={'gcs_client': 'gcs_client', },
     include_package_data=True,
     install_requires=requirements,
+    extras_require={'aiohttp': ['aiohttp'], 'numpy': ['numpy'],
+                    'orjson': ['orjson']},
     license="Apache License 2.0",
     zip_safe=False,
     keywords='gcs-client',
@@ -58,6 +61,7 @@ setup(
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3.3',
         'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3.6',
     ],
     test_suite='tests',
     tests_require=test_requirements
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_aio
+----------------------------------
+
+Tests for asyncio client running against the in-memory GCS backend.
+"""
+import sys
+import unittest
+
+import mock
+
+from gcs_client import common
+from gcs_client import errors
+from gcs_client import fake
+from gcs_client import gcs_object
+from gcs_client import transport
+
+if sys.version_info >= (3, 6):
+    import asyncio
+    from gcs_client import aio
+
+
+@unittest.skipIf(sys.version_info < (3, 6), 'Requires Python 3.6')
+class TestAsyncClient(unittest.TestCase):
+    """Test asynchronous resources."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.backend = fake.FakeTransport()
+        self.async_transport = aio.SyncTransportWrapper(self.backend)
+        self.creds = fake.FakeCredentials()
+        self.backend.create_bucket('bucket')
+        self.bucket = aio.AsyncBucket('bucket', self.creds,
+                                      transport=self.async_transport)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_default_transport(self):
+        """Test default transport wraps default synchronous transport."""
+        default = transport.Transport.get_default()
+        try:
+            transport.Transport.set_default(self.backend)
+            async_transport = aio.AsyncTransport.get_default()
+            self.assertIsInstance(async_transport, aio.SyncTransportWrapper)
+            self.assertIs(self.backend, async_transport.transport)
+        finally:
+            transport.Transport.set_default(default)
+
+    def test_list(self):
+        """Test asynchronous listing over multiple pages."""
+        names = ['a/b', 'a/c', 'd', 'e']
+        for name in names:
+            self.backend.create_object('bucket', name, b'data')
+
+        result = self.run_async(self.bucket.list(maxResults=1).all())
+        self.assertListEqual(names, [o.name for o in result])
+        self.assertIsInstance(result[0], aio.AsyncObject)
+        self.assertEqual('4', result[0].size)
+
+        listing = self.bucket.list(delimiter='/', maxResults=2)
+        result = self.run_async(listing.all())
+        self.assertIsNone(listing.page_token)
+        self.assertIsInstance(result[0], aio.AsyncObject)
+        self.assertIsInstance(result[1], aio.AsyncPrefix)
+        sub = self.run_async(result[1].list().all())
+        self.assertListEqual(['a/b', 'a/c'], [o.name for o in sub])
+
+    def test_list_fields(self):
+        """Test fields needed by the listing are added to selectors."""
+        names = ['a/b', 'a/c', 'd']
+        for name in names:
+            self.backend.create_object('bucket', name, b'data')
+
+        listing = self.bucket.list(maxResults=1, fields='items(size)')
+        result = self.run_async(listing.all())
+        self.assertListEqual(names, [o.name for o in result])
+        self.assertIsInstance(result[0], aio.AsyncObject)
+        self.assertEqual('4', result[0].size)
+        self.assertRaises(AttributeError, getattr, result[0], 'etag')
+
+        prefix = aio.AsyncPrefix('bucket', 'a/', credentials=self.creds,
+                                 transport=self.async_transport)
+        result = self.run_async(prefix.list(maxResults=1,
+                                            fields='items/size').all())
+        self.assertListEqual(['a/b', 'a/c'], [o.name for o in result])
+
+        proj = aio.AsyncProject('project', self.creds,
+                                transport=self.async_transport)
+        result = self.run_async(proj.list(maxResults=1,
+                                          fields='items(location)').all())
+        self.assertListEqual(['bucket'], [b.name for b in result])
+
+    def test_project(self):
+        """Test creating and listing buckets."""
+        proj = aio.AsyncProject('project', self.creds,
+                                transport=self.async_transport)
+        new_bucket = self.run_async(proj.create_bucket('new', location='EU'))
+        self.assertEqual('EU', new_bucket.location)
+        result = self.run_async(proj.list().all())
+        self.assertListEqual(['bucket', 'new'], [b.name for b in result])
+
+    def test_reload_exists_and_delete(self):
+        """Test explicit metadata retrieval, existence and deletion."""
+        self.backend.create_object('bucket', 'name', b'data')
+        obj = aio.AsyncObject('bucket', 'name', credentials=self.creds,
+                              transport=self.async_transport)
+        self.assertRaises(AttributeError, getattr, obj, 'size')
+        self.assertIs(obj, self.run_async(obj.reload()))
+        self.assertEqual('4', obj.size)
+        self.assertTrue(self.run_async(obj.exists()))
+        self.run_async(obj.delete())
+        self.assertFalse(self.run_async(obj.exists()))
+        self.assertRaises(errors.NotFound, self.run_async, obj.reload())
+
+        self.run_async(self.bucket.reload())
+        self.assertEqual('STANDARD', self.bucket.storageClass)
+        self.run_async(self.bucket.delete())
+        self.assertFalse(self.run_async(self.bucket.exists()))
+
+    def test_refresh(self):
+        """Test conditional refresh of metadata."""
+        self.backend.create_object('bucket', 'name', b'data')
+        obj = aio.AsyncObject('bucket', 'name', credentials=self.creds,
+                              transport=self.async_transport)
+        self.assertTrue(self.run_async(obj.refresh()))
+        self.assertFalse(self.run_async(obj.refresh()))
+        self.backend.request(
+            'PATCH', 'https://www.googleapis.com/storage/v1/b/bucket/o/name',
+            json={'metadata': {'a': '1', 'b': '2'}})
+        self.assertTrue(self.run_async(obj.refresh()))
+        self.assertEqual({'a': '1', 'b': '2'}, obj.metadata)
+        generation = obj.generation
+        self.backend.create_object('bucket', 'name', b'new data')
+        self.assertTrue(self.run_async(obj.refresh()))
+        self.assertNotEqual(generation, obj.generation)
+        self.assertEqual('8', obj.size)
+
+    def test_write_and_read(self):
+        """Test asynchronous uploads and ranged downloads."""
+        data = b'0123456789' * gcs_object.BLOCK_MULTIPLE
+        f = self.run_async(self.bucket.open(
+            'file', 'w', chunksize=gcs_object.BLOCK_MULTIPLE))
+        self.run_async(f.write(data[:5]))
+        self.run_async(f.write(data[5:]))
+        self.run_async(f.close())
+        self.assertEqual(data, self.backend.get_object_data('bucket', 'file'))
+
+        f = self.run_async(self.bucket.open(
+            'file', chunksize=gcs_object.BLOCK_MULTIPLE))
+        self.assertEqual(len(data), f.size)
+        self.assertEqual(data[:10], self.run_async(f.read(10)))
+        f.seek(-10, 2)
+        self.assertEqual(data[-10:], self.run_async(f.read()))
+        f.seek(0)
+        self.assertEqual(data, self.run_async(f.read()))
+        self.run_async(f.close())
+        self.assertTrue(f.closed)
+
+    def test_open_missing(self):
+        """Test opening a missing object."""
+        self.assertRaises(IOError, self.run_async,
+                          self.bucket.open('missing').__aenter__())
+
+    @mock.patch('time.sleep')
+    def test_retry(self, time_mock):
+        """Test asynchronous retries use asyncio.sleep."""
+        calls = []
+        delays = []
+
+        class Retried(object):
+            _retry_params = common.RetryParams(2, 1, 4, 2, False)
+
+            @aio.retry
+            async def method(self):
+                calls.append(1)
+                raise errors.ServiceUnavailable()
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        with mock.patch('asyncio.sleep', sleep):
+            self.assertRaises(errors.ServiceUnavailable, self.run_async,
+                              Retried().method())
+        self.assertEqual(3, len(calls))
+        self.assertListEqual([1, 2], delays)
+        self.assertFalse(time_mock.called)
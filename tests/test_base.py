@@ -20,15 +20,22 @@ test_base
 
 Tests base classes
 """
+import threading
+import time
 import unittest
 
+from concurrent import futures
 import mock
+import requests
 
 from gcs_client import base
 from gcs_client import common
 from gcs_client import errors as gcs_errors
+from gcs_client import transport
 
 
+# Mocked responses are decoded with their json method
+@mock.patch('gcs_client.transport._json_decoder', None)
 class TestGCS(unittest.TestCase):
     """Test Google Cloud Service base class."""
 
@@ -81,7 +88,8 @@ class TestGCS(unittest.TestCase):
         self.assertRaises(AssertionError, setattr, gcs, 'retry_params', 1)
         self.assertIs(common.RetryParams.get_default(), gcs.retry_params)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 200})
     @mock.patch('requests.utils.quote')
     def test_request_default_ok(self, quote_mock, request_mock):
         """Test _request method with default values."""
@@ -90,7 +98,8 @@ class TestGCS(unittest.TestCase):
         self.assertEqual(request_mock.return_value, gcs._request())
         request_mock.assert_called_once_with(
             'GET', self.test_class._URL, params={},
-            headers={'Authorization': creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=creds.authorization), json=None)
         self.assertEqual(1, quote_mock.call_count)
         self.assertFalse(request_mock.return_value.json.called)
 
@@ -102,7 +111,8 @@ class TestGCS(unittest.TestCase):
         gcs._URL = url
         return gcs
 
-    @mock.patch('requests.request', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 200})
     @mock.patch('requests.utils.quote')
     def test_request_default_ok_url_params(self, quote_mock, request_mock):
         """Test _request method with default values."""
@@ -112,11 +122,13 @@ class TestGCS(unittest.TestCase):
         self.assertEqual(request_mock.return_value, gcs._request())
         request_mock.assert_called_once_with(
             'GET', 'url_123', params={},
-            headers={'Authorization': self.creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=self.creds.authorization), json=None)
         quote_mock.assert_called_once_with('123', safe='')
         self.assertFalse(request_mock.return_value.json.called)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 200})
     def test_request_url_without_params(self, request_mock):
         """Test _request method with an url that has no parameters."""
         url = 'url_456'
@@ -125,10 +137,12 @@ class TestGCS(unittest.TestCase):
         self.assertEqual(request_mock.return_value, gcs._request())
         request_mock.assert_called_once_with(
             'GET', url, params={},
-            headers={'Authorization': self.creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=self.creds.authorization), json=None)
         self.assertFalse(request_mock.return_value.json.called)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 200})
     def test_request_url_with_params(self, request_mock):
         """Test _request method with an url that has parameters."""
         url = 'url_{nosize}'
@@ -139,10 +153,12 @@ class TestGCS(unittest.TestCase):
         self.assertEqual(request_mock.return_value, gcs._request(url=url))
         request_mock.assert_called_once_with(
             'GET', 'url_456', params={},
-            headers={'Authorization': self.creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=self.creds.authorization), json=None)
         self.assertFalse(request_mock.return_value.json.called)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 200})
     @mock.patch('requests.utils.quote')
     def test_request_url_no_formatting(self, quote_mock, request_mock):
         """Test _request method with an url and forcing no formatting."""
@@ -153,11 +169,13 @@ class TestGCS(unittest.TestCase):
         self.assertEqual(request_mock.return_value, result)
         request_mock.assert_called_once_with(
             'GET', url, params={},
-            headers={'Authorization': self.creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=self.creds.authorization), json=None)
         quote_mock.assert_not_called()
         self.assertFalse(request_mock.return_value.json.called)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 404})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 404})
     @mock.patch('requests.utils')
     def test_request_default_error(self, utils_mock, request_mock):
         """Test _request method with default values."""
@@ -166,11 +184,13 @@ class TestGCS(unittest.TestCase):
         self.assertRaises(gcs_errors.NotFound, gcs._request)
         request_mock.assert_called_once_with(
             'GET', self.test_class._URL, params={},
-            headers={'Authorization': creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=creds.authorization), json=None)
         self.assertEqual(1, utils_mock.quote.call_count)
         self.assertFalse(request_mock.return_value.json.called)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 203})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 203})
     @mock.patch('requests.utils.quote')
     def test_request_non_default_ok(self, quote_mock, request_mock):
         """Test _request method with default values."""
@@ -183,12 +203,14 @@ class TestGCS(unittest.TestCase):
         request_mock.assert_called_once_with(
             mock.sentinel.op, self.test_class._URL,
             params={'param1': mock.sentinel.param1},
-            headers={'Authorization': creds.authorization, 'head': 'hello'},
+            headers=dict(transport.GZIP_HEADERS, head='hello',
+                         Authorization=creds.authorization),
             json=mock.sentinel.body)
         self.assertEqual(1, quote_mock.call_count)
         self.assertTrue(request_mock.return_value.json.called)
 
-    @mock.patch('requests.request', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.request',
+                **{'return_value.status_code': 200})
     @mock.patch('requests.utils.quote')
     def test_request_default_json_error(self, quote_mock, request_mock):
         """Test _request method with default values."""
@@ -198,7 +220,8 @@ class TestGCS(unittest.TestCase):
         self.assertRaises(gcs_errors.Error, gcs._request, parse=True)
         request_mock.assert_called_once_with(
             'GET', self.test_class._URL, params={},
-            headers={'Authorization': creds.authorization}, json=None)
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=creds.authorization), json=None)
         self.assertEqual(1, quote_mock.call_count)
         self.assertTrue(request_mock.return_value.json.called)
 
@@ -226,12 +249,27 @@ class TestGCS(unittest.TestCase):
         self.assertFalse(obj.exists())
         mock_request.assert_called_once_with(op='HEAD')
 
+    @mock.patch('gcs_client.common.Executor.submit')
+    def test_submit(self, submit_mock):
+        """Test methods are submitted to the default executor."""
+        obj = self.test_class(mock.Mock())
+        self.assertEqual(submit_mock.return_value,
+                         obj.submit('exists', mock.sentinel.arg,
+                                    key=mock.sentinel.key))
+        submit_mock.assert_called_once_with(obj.exists, mock.sentinel.arg,
+                                            key=mock.sentinel.key)
+
+
+class Resource(base.Fillable):
+    _fields = ('name', 'size', 'metadata')
+    _field_defaults = {'metadata': {}}
+
 
 class TestFillable(TestGCS):
     """Test Fillable class."""
 
     def setUp(self):
-        self.test_class = base.Fillable
+        self.test_class = Resource
 
     def test_init(self):
         """Variables are initialized correctly."""
@@ -244,6 +282,12 @@ class TestFillable(TestGCS):
         fill = self.test_class(None)
         self.assertRaises(NotImplementedError, fill._get_data)
 
+    def test_fields(self):
+        """Test descriptors are created for the declared fields."""
+        self.assertIsInstance(Resource.name, base.Field)
+        self.assertEqual({}, Resource.metadata.default)
+        self.assertFalse(hasattr(base.Fillable, 'name'))
+
     @mock.patch('gcs_client.base.Fillable._get_data')
     def test_auto_fill_get_existing_attr(self, mock_get_data):
         """Getting an attribute that exists on the model.
@@ -285,17 +329,15 @@ class TestFillable(TestGCS):
         fill.size = mock.sentinel.my_size
         # We check that retrieving an initialized attribute doesn't trigger
         # gcs data retrieval
-        self.assertEquals(mock.sentinel.my_size, fill.size)
+        self.assertEqual(mock.sentinel.my_size, fill.size)
         self.assertFalse(mock_get_data.called)
-        # Getting an unkown field will trigger the data retrieval
-        self.assertEquals(mock.sentinel.name, fill.name)
+        # Getting a field without value will trigger the data retrieval
+        self.assertEqual(mock.sentinel.name, fill.name)
         mock_get_data.assert_called_once_with()
         self.assertTrue(fill._exists)
         self.assertTrue(fill._data_retrieved)
-        # And now retrieved size will overshadow the one we initialized
-        self.assertEquals(mock.sentinel.gcs_size, fill.size)
-        # But we'll still have access to the original one in __dict__
-        self.assertEquals(mock.sentinel.my_size, fill.__dict__['size'])
+        # And now retrieved size will replace the one we initialized
+        self.assertEqual(mock.sentinel.gcs_size, fill.size)
 
         # Calling non existing attribute will not trigger another _get_data
         # call
@@ -311,22 +353,49 @@ class TestFillable(TestGCS):
         get data (calling _get_data method) and create attributes in the object
         with that data, then try to return requested attribute.
 
-        This test confirms that for an invalid attribute we can retrieve the
-        data but we'll still return an AttributeError exception.
+        This test confirms that for a field GCS doesn't return we can retrieve
+        the data but we'll still return an AttributeError exception, or the
+        default of the field, and that undeclared attributes never trigger the
+        retrieval.
         """
         mock_get_data.return_value = {'name': mock.sentinel.name}
         fill = self.test_class(None)
-        self.assertRaises(AttributeError, getattr, fill, 'wrong_name')
+        self.assertFalse(hasattr(fill, 'wrong_name'))
+        self.assertFalse(mock_get_data.called)
+        self.assertRaises(AttributeError, getattr, fill, 'size')
         self.assertTrue(fill._exists)
         self.assertTrue(fill._data_retrieved)
         mock_get_data.assert_called_once_with()
 
-        # Calling another non existing attribute will not trigger another
-        # _get_data call
+        # Missing field is remembered and will not trigger another _get_data
+        # call
         mock_get_data.reset_mock()
-        self.assertRaises(AttributeError, getattr, fill, 'another_wrong_name')
+        self.assertRaises(AttributeError, getattr, fill, 'size')
+        self.assertEqual({}, fill.metadata)
         self.assertFalse(mock_get_data.called)
 
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_auto_fill_undeclared_attr(self, mock_get_data):
+        """Attributes that are not declared are only set by retrievals."""
+        mock_get_data.return_value = {'name': mock.sentinel.name,
+                                      'softDeletePolicy': mock.sentinel.policy}
+        fill = self.test_class(None)
+        self.assertFalse(hasattr(fill, 'softDeletePolicy'))
+        self.assertFalse(mock_get_data.called)
+        self.assertEqual(mock.sentinel.name, fill.name)
+        self.assertEqual(mock.sentinel.policy, fill.softDeletePolicy)
+        mock_get_data.assert_called_once_with()
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_auto_fill_mutable_default(self, mock_get_data):
+        """Instances don't share mutable defaults."""
+        mock_get_data.return_value = {'name': mock.sentinel.name}
+        fill = self.test_class(None)
+        fill.metadata['key'] = 'value'
+        self.assertEqual({'key': 'value'}, fill.metadata)
+        self.assertEqual({}, self.test_class(None).metadata)
+        self.assertEqual({}, Resource.metadata.default)
+
     @mock.patch('gcs_client.base.Fillable._get_data')
     def test_auto_fill_doesnt_exist(self, mock_get_data):
         """Raises Attribute error for non existing resource."""
@@ -336,6 +405,9 @@ class TestFillable(TestGCS):
         self.assertFalse(fill._exists)
         self.assertFalse(fill._data_retrieved)
         mock_get_data.assert_called_once_with()
+        # Resource not existing is remembered
+        self.assertRaises(AttributeError, getattr, fill, 'size')
+        mock_get_data.assert_called_once_with()
 
     @mock.patch('gcs_client.base.Fillable._get_data')
     def test_auto_fill_other_http_error(self, mock_get_data):
@@ -363,3 +435,271 @@ class TestFillable(TestGCS):
         # attributes
         self.assertRaises(AttributeError, getattr, fill, 'wrong_name')
         self.assertFalse(mock_get_data.called)
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_reload(self, mock_get_data):
+        """Test reload retrieves data even if already retrieved."""
+        mock_get_data.return_value = {'name': 'new_name'}
+        fill = self.test_class._obj_from_data({'name': 'my_name'})
+        self.assertIs(fill, fill.reload())
+        self.assertEqual('new_name', fill.name)
+        self.assertTrue(fill._exists)
+        mock_get_data.assert_called_once_with()
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_reload_fields(self, mock_get_data):
+        """Test partial reload retrieves missing attributes on access."""
+        mock_get_data.side_effect = [{'name': 'new_name'},
+                                     {'name': 'new_name', 'size': 1}]
+        fill = self.test_class(None)
+        fill.reload(fields='name')
+        mock_get_data.assert_called_once_with(fields='name')
+        self.assertEqual('new_name', fill.name)
+        self.assertEqual(1, fill.size)
+        self.assertEqual(2, mock_get_data.call_count)
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_reload_not_found(self, mock_get_data):
+        """Test reload on a resource that doesn't exist."""
+        mock_get_data.side_effect = gcs_errors.NotFound()
+        fill = self.test_class(None)
+        self.assertRaises(gcs_errors.NotFound, fill.reload)
+        self.assertFalse(fill._exists)
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_refresh(self, mock_get_data):
+        """Test refresh only fills attributes when they have changed."""
+        mock_get_data.side_effect = [None, {'name': 'new_name', 'etag': 'e2'}]
+        fill = self.test_class._obj_from_data({'name': 'my_name',
+                                               'etag': 'e1'})
+        self.assertFalse(fill.refresh())
+        self.assertEqual('my_name', fill.name)
+        self.assertTrue(fill.refresh())
+        self.assertEqual('new_name', fill.name)
+        ok = (requests.codes.ok, requests.codes.not_modified)
+        self.assertListEqual(
+            [mock.call(ok=ok, headers={'If-None-Match': 'e1'}),
+             mock.call(ok=ok, headers={'If-None-Match': 'e1'})],
+            mock_get_data.call_args_list)
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_refresh_metageneration(self, mock_get_data):
+        """Test refresh without etag uses the metageneration."""
+        mock_get_data.return_value = None
+        fill = self.test_class._obj_from_data({'metageneration': '2'})
+        self.assertFalse(fill.refresh())
+        mock_get_data.assert_called_once_with(
+            ok=(requests.codes.ok, requests.codes.not_modified),
+            ifMetagenerationNotMatch='2')
+
+    @mock.patch('gcs_client.base.Fillable._get_data')
+    def test_refresh_not_retrieved(self, mock_get_data):
+        """Test refresh reloads attributes that were never retrieved."""
+        mock_get_data.return_value = {'name': 'new_name'}
+        fill = self.test_class(None)
+        self.assertTrue(fill.refresh())
+        self.assertEqual('new_name', fill.name)
+        mock_get_data.assert_called_once_with()
+
+    @mock.patch('gcs_client.base.GCS.submit')
+    def test_submit_reload(self, submit_mock):
+        """Test reload can be submitted to the executor."""
+        fill = self.test_class(None)
+        self.assertEqual(submit_mock.return_value, fill.submit_reload())
+        submit_mock.assert_called_once_with('reload')
+
+
+# Mocked responses are decoded with their json method
+@mock.patch('gcs_client.transport._json_decoder', None)
+@mock.patch('gcs_client.base.gcs_factory', lambda kind, data, *args: data)
+class TestListIterator(unittest.TestCase):
+    """Test listing iterator."""
+
+    def setUp(self):
+        self.parent = mock.Mock()
+        self.pages = {None: {'kind': 'k', 'items': [1, 2],
+                             'nextPageToken': 't1'},
+                      't1': {'kind': 'k', 'nextPageToken': 't2'},
+                      't2': {'kind': 'k', 'items': [3]}}
+
+        def request(parse, url, pageToken, **params):
+            r = mock.Mock()
+            r.json.return_value = self.pages[pageToken]
+            return r
+        self.parent._request.side_effect = request
+
+    def test_iterate(self):
+        """Test pages are retrieved as needed, including empty pages."""
+        it = base.ListIterator(self.parent, 'url', {'prefix': 'p'})
+        self.assertFalse(self.parent._request.called)
+        self.assertEqual(1, next(it))
+        self.assertEqual(1, self.parent._request.call_count)
+        self.assertIsNone(it.page_token)
+        self.assertEqual(2, next(it))
+        self.assertEqual('t1', it.page_token)
+        self.assertListEqual([3], list(it))
+        self.assertIsNone(it.page_token)
+        self.assertTrue(it.done)
+        self.assertEqual(3, it.count)
+        self.parent._request.assert_called_with(parse=True, url='url',
+                                                prefix='p', pageToken='t2')
+
+    def test_limit(self):
+        """Test limit stops iteration and reduces page size."""
+        it = base.ListIterator(self.parent, 'url', {'maxResults': 10}, 1)
+        self.assertListEqual([1], list(it))
+        self.assertTrue(it.done)
+        self.parent._request.assert_called_once_with(
+            parse=True, url='url', maxResults=1, pageToken=None)
+
+    def test_fields(self):
+        """Test fields needed to iterate are added to partial responses."""
+        it = base.ListIterator(self.parent, 'url', {'fields': 'items(name)'})
+        self.assertEqual('items(name),kind,nextPageToken',
+                         it.params['fields'])
+        it = base.ListIterator(self.parent, 'url',
+                               {'fields': 'nextPageToken,items(a(b),c)'},
+                               item_factory=mock.Mock())
+        self.assertEqual('nextPageToken,items(a(b),c)', it.params['fields'])
+        self.assertEqual('items/name,kind,nextPageToken',
+                         base._add_fields('items/name', 'kind',
+                                          'nextPageToken'))
+
+    def test_item_fields(self):
+        """Test fields needed to create instances are added to the items."""
+        it = base.ListIterator(self.parent, 'url', {'fields': 'items(size)'},
+                               item_fields=('bucket', 'name'))
+        self.assertEqual('items(size,bucket,name),kind,nextPageToken',
+                         it.params['fields'])
+        it = base.ListIterator(self.parent, 'url', {'fields': 'prefixes'},
+                               item_fields=('bucket', 'name'))
+        self.assertEqual('prefixes,items(bucket,name),kind,nextPageToken',
+                         it.params['fields'])
+        # Item factories don't need them
+        it = base.ListIterator(self.parent, 'url', {'fields': 'items(size)'},
+                               item_factory=mock.Mock(),
+                               item_fields=('bucket', 'name'))
+        self.assertEqual('items(size),nextPageToken', it.params['fields'])
+
+        self.assertEqual('items,prefixes',
+                         base._add_item_fields('items,prefixes', 'name'))
+        self.assertEqual('items(metadata(a,b),name),prefixes',
+                         base._add_item_fields('items(metadata(a,b)),prefixes',
+                                               'name'))
+        self.assertEqual('items/size,items/name,items(bucket)',
+                         base._add_item_fields('items/size,items/name',
+                                               'bucket', 'name'))
+
+    def test_stream(self):
+        """Test items are returned before the whole page is received."""
+        def chunks(chunk_size):
+            yield b'{"kind": "k", "items": [1, 2'
+            raise IOError()
+        self.parent._request.side_effect = None
+        self.parent._request.return_value.iter_content.side_effect = chunks
+        it = base.ListIterator(self.parent, 'url', {}, stream=True)
+        self.assertEqual(1, next(it))
+        self.assertRaises(IOError, next, it)
+        self.assertIsNone(it.page_token)
+        self.assertEqual(1, it.count)
+        self.parent._request.assert_called_once_with(
+            url='url', stream=True, pageToken=None)
+
+    def test_continue(self):
+        """Test continuing a listing with the page token."""
+        it = base.ListIterator(self.parent, 'url', {})
+        next(it)
+        next(it)
+        it = base.ListIterator(self.parent, 'url',
+                               {'pageToken': it.page_token})
+        self.assertListEqual([3], list(it))
+
+    def test_retry_page(self):
+        """Test transient errors retry only the failed page."""
+        self.parent.retry_params = common.RetryParams(max_retries=2,
+                                                      initial_delay=0)
+        request = self.parent._request.side_effect
+        self.parent._request.side_effect = [
+            request(True, 'url', None),
+            gcs_errors.ServiceUnavailable(),
+            gcs_errors.ServiceUnavailable(),
+            request(True, 'url', 't1'),
+            request(True, 'url', 't2')]
+        it = base.ListIterator(self.parent, 'url', {})
+        self.assertListEqual([1, 2, 3], list(it))
+        self.assertEqual((3, 5, 2), (it.pages, it.requests, it.retries))
+        self.assertListEqual(
+            [None, 't1', 't1', 't1', 't2'],
+            [c[1]['pageToken'] for c in self.parent._request.call_args_list])
+
+    def test_retry_page_exhausted(self):
+        """Test errors are raised once retries are exhausted."""
+        self.parent.retry_params = common.RetryParams(max_retries=1,
+                                                      initial_delay=0)
+        self.parent._request.side_effect = [
+            self.parent._request.side_effect(True, 'url', None),
+            gcs_errors.ServiceUnavailable(),
+            gcs_errors.ServiceUnavailable()]
+        it = base.ListIterator(self.parent, 'url', {})
+        self.assertListEqual([1, 2], [next(it), next(it)])
+        self.assertRaises(gcs_errors.ServiceUnavailable, next, it)
+        self.assertEqual((1, 3, 1), (it.pages, it.requests, it.retries))
+        # Iteration can continue from the failed page
+        self.assertEqual('t1', it.page_token)
+
+    def _wait_prefetch(self, it, pages):
+        for i in range(100):
+            if len(it._pages) >= pages and not it._fetching:
+                break
+            time.sleep(0.01)
+        for future in list(it._pages):
+            future.exception()
+
+    def test_prefetch(self):
+        """Test pages are requested ahead of the consumer."""
+        self.pages['t2']['nextPageToken'] = 't3'
+        self.pages['t3'] = {'kind': 'k', 'items': [4], 'nextPageToken': 't4'}
+        self.pages['t4'] = {'kind': 'k', 'items': [5]}
+        it = base.ListIterator(self.parent, 'url', {}, prefetch=2)
+        self.assertEqual(1, next(it))
+        self._wait_prefetch(it, 2)
+        # Only 2 pages are retrieved ahead of the consumer
+        self.assertEqual(3, self.parent._request.call_count)
+        self.assertListEqual([2, 3, 4, 5], list(it))
+        self.assertIsNone(it.page_token)
+        self.assertEqual(5, self.parent._request.call_count)
+
+    def test_prefetch_limit(self):
+        """Test prefetching stops once limit is reached."""
+        it = base.ListIterator(self.parent, 'url', {}, limit=2, prefetch=5)
+        self.assertListEqual([1, 2], list(it))
+        self._wait_prefetch(it, 0)
+        self.assertEqual(1, self.parent._request.call_count)
+
+    def test_prefetch_error(self):
+        """Test errors retrieving pages are raised in order."""
+        self.pages['t1'] = None
+        it = base.ListIterator(self.parent, 'url', {}, prefetch=3)
+        self.assertListEqual([1, 2], [next(it), next(it)])
+        self.assertRaises(AttributeError, next, it)
+        self._wait_prefetch(it, 0)
+        self.assertEqual(2, self.parent._request.call_count)
+
+    @mock.patch('gcs_client.common.Executor.get_default')
+    def test_prefetch_late_callback(self, get_default_mock):
+        """Test consumer waits for a late done callback of a fetched page."""
+        class LateCallbackFuture(futures.Future):
+            def add_done_callback(self, fn):
+                threading.Timer(0.05, fn, (self,)).start()
+
+        def submit(fn, *args):
+            future = LateCallbackFuture()
+            future.set_result(fn(*args))
+            return future
+        executor = get_default_mock.return_value.nested.return_value
+        executor.submit.side_effect = submit
+
+        it = base.ListIterator(self.parent, 'url', {}, prefetch=1)
+        # Pages are consumed before their callbacks request the next one
+        self.assertListEqual([1, 2, 3], list(it))
+        self.assertEqual(3, self.parent._request.call_count)
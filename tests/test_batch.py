@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_batch
+----------------------------------
+
+Tests for Batch class
+"""
+import unittest
+
+import mock
+
+from gcs_client import batch
+from gcs_client import bucket
+from gcs_client import common
+from gcs_client import errors
+from gcs_client import gcs_object
+from gcs_client import transport
+from tests import test_fake
+
+
+class TestMultipart(unittest.TestCase):
+    """Test multipart encoding and parsing."""
+
+    def test_camel_case(self):
+        self.assertEqual('ifGenerationMatch',
+                         batch._camel_case('if_generation_match'))
+        self.assertEqual('generation', batch._camel_case('generation'))
+
+    def test_response_round_trip(self):
+        content_type, body = batch.encode_multipart(
+            [('0', 200, {'Content-Type': 'application/json'}, b'{"a": 1}'),
+             ('1', 404, {}, b'')])
+        self.assertEqual({'response-0': (200, b'{"a": 1}'),
+                          'response-1': (404, b'')},
+                         batch.parse_multipart(content_type, body))
+
+    def test_parse_not_multipart(self):
+        self.assertRaises(errors.Error, batch.parse_multipart,
+                          'application/json', b'{}')
+
+    def test_encode_operation(self):
+        op = batch._Operation('PATCH', '/storage/v1/b/bucket/o/name',
+                              {'generation': 1, 'fields': None},
+                              {'a': 1}, None, None)
+        self.assertEqual(
+            'Content-Type: application/http\r\n'
+            'Content-Transfer-Encoding: binary\r\n'
+            'Content-ID: <3>\r\n'
+            '\r\n'
+            'PATCH /storage/v1/b/bucket/o/name?generation=1 HTTP/1.1\r\n'
+            'Content-Type: application/json; charset=UTF-8\r\n'
+            'Content-Length: 8\r\n'
+            '\r\n'
+            '{"a": 1}',
+            op.encode(3))
+
+
+class TestBatch(test_fake.FakeTestCase):
+    """Test Batch against the in-memory backend."""
+
+    def _obj(self, name, generation=None):
+        return gcs_object.Object('bucket', name, generation,
+                                 credentials=self.creds)
+
+    def test_max_size(self):
+        self.assertRaises(AssertionError, batch.Batch, self.creds,
+                          max_size=batch.MAX_BATCH_SIZE + 1)
+
+    def test_delete(self):
+        """Test deletes in a batch context, including failures."""
+        self._create('a', 'b')
+        with self.bucket.batch() as b:
+            results = [b.delete(self._obj(name))
+                       for name in ('a', 'missing', 'b')]
+            self.assertEqual(3, len(b))
+            self.assertFalse(any(f.done() for f in results))
+
+        self.assertEqual(0, len(b))
+        self.assertIsNone(results[0].result())
+        self.assertIsInstance(results[1].exception(), errors.NotFound)
+        self.assertIsNone(results[2].result())
+        self.assertListEqual([], self.bucket.list())
+
+    def test_no_flush_on_exception(self):
+        self._create('a')
+        try:
+            with self.bucket.batch() as b:
+                b.delete(self._obj('a'))
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertTrue(self._obj('a').exists())
+
+    def test_delete_preconditions(self):
+        self._create('a')
+        obj = self._obj('a')
+        with self.bucket.batch() as b:
+            failed = b.delete(obj, if_generation_match=1)
+        self.assertIsInstance(failed.exception(), errors.Http)
+        self.assertEqual(412, failed.exception().code)
+
+    def test_get_and_exists(self):
+        """Test retrieving and checking existence of resources."""
+        self._create('a')
+        obj, missing = self._obj('a'), self._obj('missing')
+        other_bucket = bucket.Bucket('other', self.creds)
+        with self.bucket.batch() as b:
+            got = b.get(obj)
+            not_found = b.get(missing)
+            exists = [b.exists(r) for r in (obj, missing, self.bucket,
+                                            other_bucket)]
+            got_bucket = b.get(self.bucket)
+
+        self.assertIs(obj, got.result())
+        self.assertEqual('1', obj.size)
+        self.assertTrue(obj._data_retrieved)
+        self.assertIsInstance(not_found.exception(), errors.NotFound)
+        self.assertIs(False, missing._exists)
+        self.assertListEqual([True, False, True, False],
+                             [f.result() for f in exists])
+        self.assertEqual('STANDARD', got_bucket.result().storageClass)
+
+    def test_get_old_generation(self):
+        self._create('a')
+        obj = self._obj('a', generation='1')
+        with self.bucket.batch() as b:
+            result = b.get(obj)
+        self.assertIsInstance(result.exception(), errors.NotFound)
+
+    def test_patch(self):
+        """Test updating metadata of objects and buckets."""
+        self._create('a')
+        obj = self._obj('a')
+        with self.bucket.batch() as b:
+            patched = b.patch(obj, {'metadata': {'key': 'value'},
+                                    'contentType': 'text/plain'})
+            conflict = b.patch(self._obj('a'), {},
+                               if_metageneration_match=5)
+            patched_bucket = b.patch(self.bucket, {'labels': {'a': 'b'}})
+
+        self.assertIs(obj, patched.result())
+        self.assertEqual('text/plain', obj.contentType)
+        self.assertEqual('value', obj.metadata)
+        self.assertEqual('2', obj.metageneration)
+        self.assertEqual(412, conflict.exception().code)
+        self.assertEqual('2', patched_bucket.result().metageneration)
+
+    def test_flush_in_chunks(self):
+        """Test operations are split in several batch requests."""
+        names = ['obj%s' % i for i in range(7)]
+        self._create(*names)
+        b = self.bucket.batch(max_size=3)
+        with mock.patch.object(self.backend, 'request',
+                               wraps=self.backend.request) as request:
+            results = [b.delete(self._obj(name)) for name in names]
+            b.flush()
+        self.assertEqual(3, request.call_count)
+        self.assertListEqual([None] * 7, [f.result() for f in results])
+        self.assertListEqual([], self.bucket.list())
+
+    @mock.patch('time.sleep')
+    def test_retry_transient_errors(self, sleep_mock):
+        """Test only failed operations are retried."""
+        self._create('a', 'b')
+        responses = iter([{'response-0': (503, b''),
+                           'response-1': (204, b'')},
+                          {'response-0': (204, b'')}])
+
+        def parse(content_type, content):
+            return next(responses)
+
+        b = batch.Batch(self.creds,
+                        common.RetryParams(max_retries=1,
+                                           initial_delay=0.1))
+        results = [b.delete(self._obj(name)) for name in ('a', 'b')]
+        with mock.patch('gcs_client.batch.parse_multipart', parse):
+            b.flush()
+        self.assertListEqual([None, None], [f.result() for f in results])
+        self.assertEqual(1, sleep_mock.call_count)
+
+    @mock.patch('time.sleep')
+    def test_retry_exhausted(self, sleep_mock):
+        self._create('a')
+        b = batch.Batch(self.creds, common.RetryParams(max_retries=1))
+        result = b.delete(self._obj('a'))
+        with mock.patch('gcs_client.batch.parse_multipart',
+                        return_value={'response-0': (503, b'')}):
+            b.flush()
+        self.assertIsInstance(result.exception(), errors.Http)
+        self.assertEqual(503, result.exception().code)
+
+    def test_missing_response(self):
+        self._create('a')
+        b = batch.Batch(self.creds, common.RetryParams(max_retries=0))
+        result = b.delete(self._obj('a'))
+        with mock.patch('gcs_client.batch.parse_multipart',
+                        return_value={}):
+            b.flush()
+        self.assertEqual(500, result.exception().code)
+
+    @mock.patch('gcs_client.transport.Transport.post',
+                return_value=transport.Response(401, b'Unauthorized'))
+    def test_batch_request_error(self, post_mock):
+        b = batch.Batch(self.creds, common.RetryParams(max_retries=0))
+        b.delete(self._obj('a'))
+        self.assertRaises(errors.Http, b.flush)
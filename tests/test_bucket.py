@@ -31,6 +31,8 @@ from gcs_client import common
 from gcs_client import prefix
 
 
+# Mocked responses are decoded with their json method
+@mock.patch('gcs_client.transport._json_decoder', None)
 class TestBucket(unittest.TestCase):
 
     @mock.patch('gcs_client.base.GCS.__init__')
@@ -83,7 +85,9 @@ class TestBucket(unittest.TestCase):
                      'nextPageToken': mock.sentinel.next_token},
                     {'kind': 'storage#objects',
                      'items': [mock.sentinel.result3]}]
-        mock_request.return_value.json.side_effect = expected
+        # Each request returns a new response
+        mock_request.side_effect = [mock.Mock(**{'json.return_value': page})
+                                    for page in expected]
 
         expected2 = [mock.sentinel.result4, mock.sentinel.result5]
         obj_mock.side_effect = expected2
@@ -105,7 +109,7 @@ class TestBucket(unittest.TestCase):
                        versions=mock.sentinel.version,
                        delimiter=mock.sentinel.delimiter,
                        projection=mock.sentinel.projection,
-                       pageToken=mock.sentinel.page_token),
+                       pageToken=mock.sentinel.page_token, matchGlob=None),
              mock.call(parse=True,
                        url='https://www.googleapis.com/storage/v1/b/{name}/o',
                        prefix=mock.sentinel.prefix,
@@ -113,7 +117,7 @@ class TestBucket(unittest.TestCase):
                        versions=mock.sentinel.version,
                        delimiter=mock.sentinel.delimiter,
                        projection=mock.sentinel.projection,
-                       pageToken=mock.sentinel.next_token)],
+                       pageToken=mock.sentinel.next_token, matchGlob=None)],
             mock_request.call_args_list)
         self.assertListEqual(
             [mock.call(mock.sentinel.result1, creds, retry_params),
@@ -173,3 +177,43 @@ class TestBucket(unittest.TestCase):
         mock_obj.assert_called_once_with(name, file_name, generation, creds,
                                          retry, chunksize)
         mock_obj.return_value.open.assert_called_once_with(mode)
+
+
+class TestSplitPoints(unittest.TestCase):
+    """Test key space splitting for parallel listing."""
+
+    def test_split_points(self):
+        points = bucket._split_points(['a1', 'a9', 'b3'], '', 'b3', 4)
+        self.assertEqual(3, len(points))
+        self.assertListEqual(sorted(points), points)
+        self.assertTrue(all(p > 'b3' for p in points))
+
+    def test_split_points_prefix(self):
+        points = bucket._split_points(['dir/x'], 'dir/', 'dir/x', 3)
+        self.assertEqual(2, len(points))
+        self.assertTrue(all(p.startswith('dir/') and p > 'dir/x'
+                            for p in points))
+
+    def test_split_points_shared_prefix(self):
+        """Test splits are chosen after the prefix shared by all names."""
+        names = ['data/part-%06d.parquet' % i for i in range(500)]
+        points = bucket._split_points(names, 'data/', names[-1], 4)
+        self.assertListEqual(['data/part-00062', 'data/part-00075',
+                              'data/part-00087'], points)
+
+    def test_split_points_shared_prefix_end(self):
+        """Test shared prefix is shortened when there's no room after it."""
+        names = ['data/part-%06d.parquet' % i for i in range(1000, 2000)]
+        self.assertListEqual(['data/part-0040', 'data/part-0060',
+                              'data/part-0080'],
+                             bucket._split_points(names, 'data/', names[-1],
+                                                  4))
+        self.assertListEqual(['data/part-0022', 'data/part-0025',
+                              'data/part-0027'],
+                             bucket._split_points(names, 'data/', names[-1],
+                                                  4, 'data/part-003'))
+
+    def test_split_points_end_of_key_space(self):
+        """Test no splits are returned when there's no room for them."""
+        self.assertListEqual([], bucket._split_points(['a', 'z'], '', 'zzzz',
+                                                      4))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_cache
+----------------------------------
+
+Tests for the metadata cache.
+"""
+
+import unittest
+
+import mock
+
+from gcs_client import bucket
+from gcs_client import cache
+from gcs_client import errors
+from gcs_client import gcs_object
+from gcs_client import project
+from tests import test_fake
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Tests for MetadataCache class."""
+
+    def setUp(self):
+        self.cache = cache.MetadataCache(max_size=2, ttl=10, negative_ttl=5)
+
+    def test_disabled(self):
+        disabled = cache.MetadataCache()
+        self.assertFalse(disabled.enabled)
+        disabled.put('bucket', 'name', data={'size': '1'})
+        self.assertEqual(0, len(disabled))
+        self.assertIsNone(disabled.get('bucket', 'name'))
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get('bucket', 'name'))
+        self.cache.put('bucket', 'name', data={'size': '1'})
+        self.cache.put('bucket', 'name', '2', data={'size': '2'})
+        self.assertDictEqual({'size': '1'}, self.cache.get('bucket', 'name'))
+        self.assertDictEqual({'size': '2'},
+                             self.cache.get('bucket', 'name', '2'))
+        self.assertIsNone(self.cache.get('bucket', 'other'))
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(2, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+    def test_copies(self):
+        """Test stored metadata is not shared with callers."""
+        data = {'metadata': {'key': 'value'}}
+        self.cache.put('bucket', 'name', data=data)
+        data['metadata']['key'] = 'changed'
+        self.cache.get('bucket', 'name')['metadata']['key'] = 'changed'
+        self.assertDictEqual({'metadata': {'key': 'value'}},
+                             self.cache.get('bucket', 'name'))
+
+    def test_negative(self):
+        self.cache.put('bucket')
+        self.assertIs(cache.NOT_FOUND, self.cache.get('bucket'))
+
+    @mock.patch('time.time')
+    def test_expiration(self, time_mock):
+        time_mock.return_value = 100
+        self.cache.put('bucket', 'name', data={'size': '1'})
+        self.cache.put('bucket', 'missing')
+        time_mock.return_value = 105
+        self.assertIsNotNone(self.cache.get('bucket', 'name'))
+        self.assertIsNone(self.cache.get('bucket', 'missing'))
+        time_mock.return_value = 110
+        self.assertIsNone(self.cache.get('bucket', 'name'))
+        self.assertIsNone(self.cache.get_stale('bucket', 'missing'))
+        # Expired metadata is kept until it's revalidated or evicted
+        self.assertDictEqual({'size': '1'},
+                             self.cache.get_stale('bucket', 'name'))
+        self.assertEqual(1, len(self.cache))
+
+    @mock.patch('time.time')
+    def test_renew(self, time_mock):
+        time_mock.return_value = 100
+        self.cache.put('bucket', 'name', data={'etag': 'e1'})
+        time_mock.return_value = 110
+        self.assertFalse(self.cache.renew('bucket', 'name', etag='e2'))
+        self.assertFalse(self.cache.renew('bucket', 'other', etag='e1'))
+        self.assertTrue(self.cache.renew('bucket', 'name', etag='e1'))
+        self.assertDictEqual({'etag': 'e1'}, self.cache.get('bucket', 'name'))
+        self.assertEqual(1, self.cache.renewals)
+
+    def test_lru_eviction(self):
+        self.cache.put('bucket', 'a', data={})
+        self.cache.put('bucket', 'b', data={})
+        self.cache.get('bucket', 'a')
+        self.cache.put('bucket', 'c', data={})
+        self.assertIsNone(self.cache.get('bucket', 'b'))
+        self.assertIsNotNone(self.cache.get('bucket', 'a'))
+        self.assertIsNotNone(self.cache.get('bucket', 'c'))
+
+    def test_invalidate(self):
+        self.cache.put('bucket', 'name', data={})
+        self.cache.put('bucket', 'name', '3', data={})
+        self.cache.put('bucket')
+        self.cache.invalidate('bucket', 'name')
+        self.assertIsNone(self.cache.get('bucket', 'name'))
+        self.assertIsNone(self.cache.get('bucket', 'name', '3'))
+        self.assertIs(cache.NOT_FOUND, self.cache.get('bucket'))
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+
+    def test_set_default(self):
+        """Test setting default configuration with an instance."""
+        first = cache.MetadataCache.get_default()
+        try:
+            cache.MetadataCache.set_default(self.cache)
+            second = cache.MetadataCache.get_default()
+            self.assertIs(first, second)
+            self.assertEqual((2, 10, 5), (second.max_size, second.ttl,
+                                          second.negative_ttl))
+        finally:
+            cache.MetadataCache.set_default()
+
+
+class TestResourceCache(test_fake.FakeTestCase):
+    """Test metadata sharing between Object and Bucket instances."""
+
+    def setUp(self):
+        super(TestResourceCache, self).setUp()
+        cache.MetadataCache.set_default(max_size=100)
+        self.cache = cache.MetadataCache.get_default()
+        self._create('a')
+
+    def tearDown(self):
+        cache.MetadataCache.set_default()
+        super(TestResourceCache, self).tearDown()
+
+    def _object(self, name='a'):
+        return gcs_object.Object('bucket', name, credentials=self.creds)
+
+    def test_shared_metadata(self):
+        self.assertEqual('1', self._object().size)
+        responses = self.backend.stats.responses
+        self.assertEqual('1', self._object().size)
+        self.assertTrue(self._object().exists())
+        self.assertEqual(responses, self.backend.stats.responses)
+        self.assertEqual(2, self.cache.hits)
+
+    def test_partial_reload_not_cached(self):
+        self._object().reload(fields='size')
+        self.assertEqual(0, len(self.cache))
+        self._object().reload()
+        self.assertEqual(1, len(self.cache))
+
+    def test_negative(self):
+        self.assertFalse(self._object('b').exists())
+        responses = self.backend.stats.responses
+        self.assertFalse(self._object('b').exists())
+        self.assertIsNone(self._object('b').timeDeleted)
+        self.assertRaises(AttributeError, getattr, self._object('b'), 'size')
+        self.assertEqual(responses, self.backend.stats.responses)
+
+    def test_invalidate_on_write(self):
+        self.assertFalse(self._object('b').exists())
+        with self._object('b').open('w') as f:
+            f.write('data')
+        self.assertEqual('4', self._object('b').size)
+
+    def test_invalidate_on_delete(self):
+        self.assertEqual('1', self._object().size)
+        self._object().delete()
+        self.assertFalse(self._object().exists())
+
+    def test_invalidate_on_batch(self):
+        self.assertEqual('1', self._object().size)
+        with self.bucket.batch() as batch:
+            batch.delete(self._object())
+        self.assertFalse(self._object().exists())
+
+    def test_batch_get_after_overwrite(self):
+        """Test batch gets only pin the generation that was asked for."""
+        obj = self._object()
+        self.assertEqual('1', obj.size)
+        generation = obj.generation
+        self.backend.create_object('bucket', 'a', b'new')
+        with self.bucket.batch() as batch:
+            result = batch.get(obj)
+        self.assertIs(obj, result.result())
+        self.assertNotEqual(generation, obj.generation)
+        self.assertEqual('3', obj.size)
+
+        old = gcs_object.Object('bucket', 'a', generation,
+                                credentials=self.creds)
+        with self.bucket.batch() as batch:
+            result = batch.get(old)
+        self.assertIsInstance(result.exception(), errors.NotFound)
+        self.assertTrue(self._object().exists())
+        self.assertListEqual([True], self.bucket.exists_many(['a']))
+        self.assertEqual('3', self.bucket.get_objects(['a'])[0].size)
+
+    def test_bucket(self):
+        self.assertFalse(bucket.Bucket('new', self.creds).exists())
+        project.Project('0', self.creds).create_bucket('new')
+        self.assertTrue(bucket.Bucket('new', self.creds).exists())
+        bucket.Bucket('new', self.creds).delete()
+        self.assertFalse(bucket.Bucket('new', self.creds).exists())
+
+    def test_get_objects(self):
+        """Test cached objects are not requested in bulk retrievals."""
+        self._create('c')
+        self.assertEqual('1', self._object().size)
+        self.assertFalse(self._object('b').exists())
+        responses = self.backend.stats.responses
+        result = self.bucket.get_objects(['a', 'b', 'c'])
+        self.assertEqual(responses + 1, self.backend.stats.responses)
+        self.assertEqual(['a', None, 'c'],
+                         [o and o.name for o in result])
+        self.assertListEqual([True, False, True],
+                             self.bucket.exists_many(['a', 'b', 'c']))
+        self.assertEqual(responses + 1, self.backend.stats.responses)
+
+    @mock.patch('time.time')
+    def test_revalidate(self, time_mock):
+        """Test expired metadata is only downloaded if it has changed."""
+        time_mock.return_value = 100
+        self.assertEqual('1', self._object().size)
+        time_mock.return_value = 200
+        self.assertEqual('1', self._object().size)
+        self.assertEqual(1, self.cache.renewals)
+        self.assertIsNotNone(self.cache.get('bucket', 'a'))
+
+        self.backend.create_object('bucket', 'a', b'new')
+        time_mock.return_value = 300
+        self.assertEqual('3', self._object().size)
+        self.assertEqual(1, self.cache.renewals)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_checkpoint
+----------------------------------
+
+Tests for checkpoints of resumable listings.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from gcs_client import checkpoint
+from gcs_client import errors
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, 'listing.ckpt')
+        self.ckpt = checkpoint.Checkpoint(self.path)
+
+    def test_get(self):
+        """Test getting a checkpoint from a path or an instance."""
+        self.assertIsNone(checkpoint.Checkpoint.get(None))
+        self.assertIs(self.ckpt, checkpoint.Checkpoint.get(self.ckpt))
+        self.assertEqual(self.path, checkpoint.Checkpoint.get(self.path).path)
+
+    def test_load_missing(self):
+        """Test loading a checkpoint that doesn't exist."""
+        self.assertIsNone(self.ckpt.load())
+        self.assertIsNone(self.ckpt.check('list', {'params': {}}))
+        # Removing a missing checkpoint is not an error
+        self.ckpt.remove()
+
+    def test_save_and_check(self):
+        """Test saving state and loading it back."""
+        identity = {'url': 'url', 'params': {'prefix': 'a/', 'limit': None}}
+        self.ckpt.save('list', identity, page_token='token', count=10)
+        self.ckpt.save('list', identity, page_token='token2', count=20)
+        state = self.ckpt.check('list', identity)
+        self.assertEqual('token2', state['page_token'])
+        self.assertEqual(20, state['count'])
+        self.assertListEqual(['listing.ckpt'], os.listdir(self.tmp_dir))
+        self.ckpt.remove()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_check_mismatch(self):
+        """Test checkpoints of other listings are rejected."""
+        self.ckpt.save('list', {'params': {'prefix': 'a/'}}, count=0)
+        self.assertRaises(errors.Error, self.ckpt.check, 'list',
+                          {'params': {'prefix': 'b/'}})
+        self.assertRaises(errors.Error, self.ckpt.check, 'parallel_list',
+                          {'params': {'prefix': 'a/'}})
+
+    def test_save_error(self):
+        """Test failed saves keep the previous checkpoint."""
+        self.ckpt.save('list', {}, count=1)
+        with mock.patch('gcs_client.checkpoint._replace',
+                        side_effect=OSError):
+            self.assertRaises(OSError, self.ckpt.save, 'list', {}, count=2)
+        self.assertEqual(1, self.ckpt.load()['count'])
+        self.assertListEqual(['listing.ckpt'], os.listdir(self.tmp_dir))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_columns
+----------------------------------
+
+Tests for columnar listings
+"""
+import datetime
+import unittest
+
+import mock
+
+from gcs_client import columns
+from tests import test_fake
+
+
+class TestStringColumn(unittest.TestCase):
+    """Test packed string column."""
+
+    def test_column(self):
+        col = columns.StringColumn([u'a', u'', u'\xf1and\xfa'])
+        self.assertEqual(3, len(col))
+        self.assertEqual(u'a', col[0])
+        self.assertEqual(u'', col[1])
+        self.assertEqual(u'\xf1and\xfa', col[-1])
+        self.assertListEqual([u'', u'\xf1and\xfa'], col[1:])
+        self.assertListEqual([u'a', u'', u'\xf1and\xfa'], list(col))
+        self.assertRaises(IndexError, col.__getitem__, 3)
+
+
+class TestObjectColumns(unittest.TestCase):
+    """Test ObjectColumns."""
+
+    def test_rfc3339_to_epoch(self):
+        self.assertEqual(86400 + 3661,
+                         columns.rfc3339_to_epoch('1970-01-02T01:01:01.123Z'))
+
+    def test_to_epoch(self):
+        self.assertEqual(86400, columns.to_epoch(datetime.datetime(1970, 1,
+                                                                   2)))
+        self.assertEqual(10, columns.to_epoch('1970-01-01T00:00:10Z'))
+        self.assertEqual(1.5, columns.to_epoch(1.5))
+        self.assertIsNone(columns.to_epoch(None))
+
+    def test_append(self):
+        cols = columns.ObjectColumns()
+        self.assertEqual(0, cols._append({'name': 'a', 'size': '10',
+                                          'generation': '5',
+                                          'updated': '1970-01-01T00:00:10Z',
+                                          'md5Hash': 'md5'}))
+        self.assertEqual(1, cols._append({'name': 'b'}))
+        self.assertEqual(2, len(cols))
+        self.assertDictEqual({'name': 'a', 'size': 10, 'generation': 5,
+                              'updated': 10, 'md5Hash': 'md5', 'crc32c': ''},
+                             cols.row(0))
+        self.assertDictEqual({'name': 'b', 'size': -1, 'generation': -1,
+                              'updated': -1, 'md5Hash': '', 'crc32c': ''},
+                             cols.row(1))
+
+    def test_extend(self):
+        cols = columns.ObjectColumns()
+        prefix = mock.Mock(prefix='dir/')
+        self.assertIs(cols, cols.extend([0, prefix, 1]))
+        self.assertListEqual(['dir/'], cols.prefixes)
+
+    @mock.patch('gcs_client.columns.numpy', None)
+    def test_to_numpy_not_installed(self):
+        self.assertRaises(ImportError, columns.ObjectColumns().to_numpy)
+
+    @unittest.skipIf(columns.numpy is None, 'numpy is not installed')
+    def test_to_numpy(self):
+        cols = columns.ObjectColumns()
+        cols._append({'name': 'a', 'size': '10'})
+        cols._append({'name': 'b', 'size': '20'})
+        arrays = cols.to_numpy()
+        self.assertEqual(30, arrays['size'].sum())
+        self.assertListEqual(['b'], list(arrays['name'][arrays['size'] > 10]))
+
+
+class TestListColumns(test_fake.FakeTestCase):
+    """Test listing into columns."""
+
+    def test_bucket_list_columns(self):
+        self._create('a', 'bb', 'd/ccc', 'd/e/f')
+        cols = self.bucket.list_columns(delimiter='/', maxResults=2)
+        self.assertListEqual(['a', 'bb'], list(cols.name))
+        self.assertListEqual([1, 2], list(cols.size))
+        self.assertListEqual(['d/'], cols.prefixes)
+        self.assertTrue(all(g > 0 for g in cols.generation))
+        self.assertTrue(all(u > 0 for u in cols.updated))
+
+        prefix = self.bucket.list(delimiter='/')[-1]
+        cols = prefix.list_columns(prefetch=2, maxResults=1)
+        self.assertListEqual(['d/ccc'], list(cols.name))
+        self.assertListEqual(['d/e/'], cols.prefixes)
+        cols = prefix.list_columns(delimiter='')
+        self.assertListEqual(['d/ccc', 'd/e/f'], list(cols.name))
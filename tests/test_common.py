@@ -150,6 +150,74 @@ class TestRetryParams(unittest.TestCase):
         self.assertNotEqual(sorted(new_params), sorted(first_params_values))
 
 
+class TestExecutor(unittest.TestCase):
+    """Test Executor class."""
+
+    def setUp(self):
+        # We don't want to bring default configuration from one test to another
+        if hasattr(common.Executor, 'default'):
+            delattr(common.Executor, 'default')
+
+    def tearDown(self):
+        common.Executor.get_default().shutdown()
+        delattr(common.Executor, 'default')
+
+    def test_init_default(self):
+        """Test that default values for new instances are as expected."""
+        executor = common.Executor()
+        self.assertEqual(10, executor.max_workers)
+        self.assertIsNone(executor._executor)
+
+    def test_get_default_singleton(self):
+        """Test that get_default always returns the same instance."""
+        first_executor = common.Executor.get_default()
+        second_executor = common.Executor.get_default()
+        self.assertIs(first_executor, second_executor)
+
+    def test_set_default(self):
+        """Test changing default configuration keeps the same instance."""
+        first_executor = common.Executor.get_default()
+        common.Executor.set_default(common.Executor(3))
+        self.assertIs(first_executor, common.Executor.get_default())
+        self.assertEqual(3, first_executor.max_workers)
+        common.Executor.set_default(max_workers=4)
+        self.assertEqual(4, first_executor.max_workers)
+
+    def test_submit_and_map(self):
+        """Test running callables on the executor."""
+        executor = common.Executor(2)
+        future = executor.submit(sum, [1, 2], 3)
+        self.assertEqual(6, future.result())
+        self.assertListEqual([1, 4, 9],
+                             list(executor.map(lambda x: x * x, [1, 2, 3])))
+        executor.shutdown()
+        self.assertIsNone(executor._executor)
+        # It can still be used after shutdown
+        self.assertEqual(3, executor.submit(len, 'abc').result())
+        executor.shutdown()
+
+    def test_nested(self):
+        """Test work waited for from a worker runs in the calling thread."""
+        executor = common.Executor(1)
+        self.assertIs(executor, executor.nested())
+        self.assertFalse(executor.in_worker)
+        self.assertTrue(executor.submit(lambda: executor.in_worker).result())
+        nested = executor.submit(executor.nested).result()
+        self.assertIsInstance(nested, common.InlineExecutor)
+        # With a single worker waiting on the pool would never complete
+        future = executor.submit(
+            lambda: executor.nested().submit(sum, [1, 2]).result())
+        self.assertEqual(3, future.result(timeout=5))
+        executor.shutdown()
+
+        # Callables run on submission, errors are held by their futures
+        inline = common.InlineExecutor()
+        future = inline.submit(int, 'a')
+        self.assertTrue(future.done())
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertListEqual([3, 5], list(inline.map(sum, [(1, 2), (2, 3)])))
+
+
 class TestRetry(unittest.TestCase):
     def setUp(self):
         # Set default retries to 2 retries and no delay between retries
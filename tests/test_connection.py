@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_connection
+----------------------------------
+
+Tests for ConnectionPool class.
+"""
+import io
+import unittest
+
+import mock
+import requests
+
+from gcs_client import connection
+
+
+def _response(content=b''):
+    r = requests.Response()
+    r.status_code = 200
+    r.raw = io.BytesIO(content)
+    return r
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test ConnectionPool class."""
+
+    def setUp(self):
+        # We don't want to bring default configuration from one test to another
+        if hasattr(connection.ConnectionPool, 'default'):
+            delattr(connection.ConnectionPool, 'default')
+
+    def tearDown(self):
+        if hasattr(connection.ConnectionPool, 'default'):
+            delattr(connection.ConnectionPool, 'default')
+
+    def test_init_default(self):
+        """Test that default values for new instances are as expected."""
+        pool = connection.ConnectionPool()
+        self.assertEqual(10, pool.max_hosts)
+        self.assertEqual(10, pool.max_size)
+        self.assertIsNone(pool.max_connections)
+        self.assertEqual(60, pool.idle_timeout)
+        self.assertIsNone(pool._semaphore)
+
+    def test_init_values(self):
+        """Test that we can initialize values for new instances."""
+        pool = connection.ConnectionPool(1, 2, 3, 4)
+        self.assertEqual(1, pool.max_hosts)
+        self.assertEqual(2, pool.max_size)
+        self.assertEqual(3, pool.max_connections)
+        self.assertEqual(4, pool.idle_timeout)
+        self.assertIsNotNone(pool._semaphore)
+
+    def test_get_default_singleton(self):
+        """Test that get_default always returns the same instance."""
+        first_pool = connection.ConnectionPool.get_default()
+        second_pool = connection.ConnectionPool.get_default()
+        self.assertIs(first_pool, second_pool)
+
+    def test_set_default_using_instance(self):
+        """Test setting default configuration with an instance."""
+        first_pool = connection.ConnectionPool.get_default()
+        new_pool = connection.ConnectionPool(1, 2, 3, 4)
+        connection.ConnectionPool.set_default(new_pool)
+        second_pool = connection.ConnectionPool.get_default()
+        self.assertIs(first_pool, second_pool)
+        self.assertEqual((1, 2, 3, 4),
+                         (second_pool.max_hosts, second_pool.max_size,
+                          second_pool.max_connections,
+                          second_pool.idle_timeout))
+
+    def test_set_default_using_args(self):
+        """Test setting default configuration with arguments."""
+        first_pool = connection.ConnectionPool.get_default()
+        connection.ConnectionPool.set_default(max_size=20)
+        second_pool = connection.ConnectionPool.get_default()
+        self.assertIs(first_pool, second_pool)
+        self.assertEqual(20, second_pool.max_size)
+
+    @mock.patch('requests.Session')
+    def test_session_reused(self, session_mock):
+        """Test that consecutive requests reuse the same session."""
+        pool = connection.ConnectionPool()
+        pool.get(mock.sentinel.url, params=mock.sentinel.params)
+        pool.put(mock.sentinel.url, data=mock.sentinel.data)
+        pool.post(mock.sentinel.url)
+        pool.request('DELETE', mock.sentinel.url)
+
+        session_mock.assert_called_once_with()
+        session = session_mock.return_value
+        self.assertListEqual(
+            [mock.call('GET', mock.sentinel.url, params=mock.sentinel.params),
+             mock.call('PUT', mock.sentinel.url, data=mock.sentinel.data),
+             mock.call('POST', mock.sentinel.url),
+             mock.call('DELETE', mock.sentinel.url)],
+            session.request.call_args_list)
+
+    @mock.patch('time.time')
+    @mock.patch('requests.Session')
+    def test_idle_session_discarded(self, session_mock, time_mock):
+        """Test that connections idle for too long are discarded."""
+        time_mock.side_effect = [0, 5, 20]
+        first, second = mock.Mock(), mock.Mock()
+        session_mock.side_effect = [first, second]
+        pool = connection.ConnectionPool(idle_timeout=10)
+
+        pool.get(mock.sentinel.url)
+        pool.get(mock.sentinel.url)
+        self.assertEqual(2, first.request.call_count)
+        self.assertFalse(first.close.called)
+
+        pool.get(mock.sentinel.url)
+        first.close.assert_called_once_with()
+        second.request.assert_called_once_with('GET', mock.sentinel.url)
+
+    @mock.patch('time.time')
+    @mock.patch('requests.Session')
+    def test_reap(self, session_mock, time_mock):
+        """Test explicit reaping of idle connections."""
+        time_mock.side_effect = [0, 5, 20]
+        pool = connection.ConnectionPool(idle_timeout=10)
+        pool.get(mock.sentinel.url)
+
+        pool.reap()
+        self.assertFalse(session_mock.return_value.close.called)
+        pool.reap()
+        session_mock.return_value.close.assert_called_once_with()
+        self.assertIsNone(pool._session)
+
+    @mock.patch('requests.Session')
+    def test_close(self, session_mock):
+        """Test closing the pool allows further use."""
+        pool = connection.ConnectionPool()
+        pool.get(mock.sentinel.url)
+        pool.close()
+        session_mock.return_value.close.assert_called_once_with()
+        pool.get(mock.sentinel.url)
+        self.assertEqual(2, session_mock.call_count)
+
+    @mock.patch('requests.Session')
+    def test_max_connections(self, session_mock):
+        """Test that requests acquire and release the semaphore."""
+        pool = connection.ConnectionPool(max_connections=1)
+        pool._semaphore = mock.MagicMock()
+        pool.get(mock.sentinel.url)
+        pool._semaphore.__enter__.assert_called_once_with()
+        self.assertEqual(1, pool._semaphore.__exit__.call_count)
+
+    @mock.patch('requests.Session')
+    def test_max_connections_stream_close(self, session_mock):
+        """Test streamed requests hold the semaphore until closed."""
+        session_mock.return_value.request.return_value = _response(b'ab')
+        pool = connection.ConnectionPool(max_connections=1)
+        r = pool.get(mock.sentinel.url, stream=True)
+        self.assertFalse(pool._semaphore.acquire(False))
+        r.close()
+        self.assertTrue(r.raw.closed)
+        self.assertTrue(pool._semaphore.acquire(False))
+        pool._semaphore.release()
+        # Closing again doesn't release it twice
+        r.close()
+        self.assertTrue(pool._semaphore.acquire(False))
+        self.assertFalse(pool._semaphore.acquire(False))
+
+    @mock.patch('requests.Session')
+    def test_max_connections_stream_consumed(self, session_mock):
+        """Test streamed requests release the semaphore when consumed."""
+        session_mock.return_value.request.return_value = _response(b'ab')
+        pool = connection.ConnectionPool(max_connections=1)
+        r = pool.get(mock.sentinel.url, stream=True)
+        chunks = r.iter_content(1)
+        self.assertEqual(b'a', next(chunks))
+        self.assertFalse(pool._semaphore.acquire(False))
+        self.assertListEqual([b'b'], list(chunks))
+        self.assertTrue(pool._semaphore.acquire(False))
+
+    @mock.patch('requests.Session')
+    def test_max_connections_stream_discarded(self, session_mock):
+        """Test streamed requests release the semaphore when discarded."""
+        session_mock.return_value.request.side_effect = (
+            lambda *args, **kwargs: _response(b'ab'))
+        pool = connection.ConnectionPool(max_connections=1)
+        pool.get(mock.sentinel.url, stream=True)
+        self.assertTrue(pool._semaphore.acquire(False))
+        pool._semaphore.release()
+        # Discarded after being partially read
+        chunks = pool.get(mock.sentinel.url, stream=True).iter_content(1)
+        self.assertEqual(b'a', next(chunks))
+        self.assertFalse(pool._semaphore.acquire(False))
+        del chunks
+        self.assertTrue(pool._semaphore.acquire(False))
+
+    @mock.patch('requests.Session')
+    def test_max_connections_stream_error(self, session_mock):
+        """Test semaphore is released if a streamed request fails."""
+        session_mock.return_value.request.side_effect = ValueError
+        pool = connection.ConnectionPool(max_connections=1)
+        self.assertRaises(ValueError, pool.get, mock.sentinel.url,
+                          stream=True)
+        self.assertTrue(pool._semaphore.acquire(False))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_diff
+----------------------------------
+
+Tests for streaming listing comparison
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from gcs_client import bucket
+from gcs_client import diff
+from tests import test_fake
+
+
+class TestDiff(unittest.TestCase):
+    """Test merging of listings."""
+
+    def _entries(self, *entries):
+        return [(name, {'size': size, 'md5Hash': md5})
+                for name, size, md5 in entries]
+
+    def test_diff(self):
+        source = self._entries(('a', 1, 'x'), ('b', 1, 'x'), ('c', 2, 'x'),
+                               ('e', 1, None))
+        target = self._entries(('b', 1, 'x'), ('c', 2, 'y'), ('d', 1, 'x'),
+                               ('e', 1, 'x'))
+        result = [(c.status, c.name) for c in diff.diff(source, target)]
+        self.assertListEqual([(diff.REMOVED, 'a'), (diff.CHANGED, 'c'),
+                              (diff.ADDED, 'd')], result)
+
+        result = diff.diff(source, target, compare=('size',), unchanged=True)
+        self.assertListEqual(
+            [diff.REMOVED, diff.UNCHANGED, diff.UNCHANGED, diff.ADDED,
+             diff.UNCHANGED], [c.status for c in result])
+
+    def test_diff_empty(self):
+        entries = self._entries(('a', 1, 'x'))
+        self.assertListEqual([], list(diff.diff([], [])))
+        self.assertListEqual([diff.Change(diff.ADDED, 'a', None,
+                                          entries[0][1])],
+                             list(diff.diff([], entries)))
+
+    def test_not_ordered(self):
+        entries = self._entries(('b', 1, 'x'), ('a', 1, 'x'))
+        self.assertRaises(ValueError, list, diff.diff(entries, []))
+        self.assertRaises(ValueError, list, diff.diff([], entries))
+
+    def test_local_tree(self):
+        """Test local files are returned in GCS name order."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        os.makedirs(os.path.join(tmp_dir, 'a', 'b'))
+        for name in ('a.txt', 'a/b/c', 'a/z', 'a0'):
+            with open(os.path.join(tmp_dir, *name.split('/')), 'wb') as f:
+                f.write(name.encode('utf-8'))
+        result = list(diff.local_tree(tmp_dir))
+        self.assertListEqual(['a.txt', 'a/b/c', 'a/z', 'a0'],
+                             [name for name, entry in result])
+        self.assertEqual(5, result[1][1].size)
+        # Same encoding GCS uses
+        self.assertEqual('peVNH9e7aaIo7w3NJDE2fg==', result[0][1].md5Hash)
+
+
+class TestBucketDiff(test_fake.FakeTestCase):
+    """Test comparing buckets using the in-memory backend."""
+
+    def test_bucket_diff(self):
+        for name, data in (('old/a', b'a'), ('old/b', b'b'), ('old/c', b'c'),
+                           ('new/b', b'b'), ('new/c', b'C'), ('new/d', b'd')):
+            self.backend.create_object('bucket', name, data)
+        result = self.bucket.diff(self.bucket, 'old/', 'new/')
+        self.assertListEqual([('removed', 'a'), ('changed', 'c'),
+                              ('added', 'd')],
+                             [(c.status, c.name) for c in result])
+
+        self.backend.create_bucket('other')
+        self.backend.create_object('other', 'old/a', b'a')
+        other = bucket.Bucket('other', self.creds)
+        result = list(self.bucket.diff(other, 'old/', unchanged=True))
+        self.assertListEqual([('unchanged', 'a'), ('removed', 'b'),
+                              ('removed', 'c')],
+                             [(c.status, c.name) for c in result])
+
+    def test_local_diff(self):
+        self._create('dir/a', 'dir/b')
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        for name, data in (('a', b'dir/a'), ('b', b'dir/X'), ('c', b'')):
+            with open(os.path.join(tmp_dir, name), 'wb') as f:
+                f.write(data)
+        result = self.bucket.diff(tmp_dir, 'dir/')
+        self.assertListEqual([('changed', 'b'), ('added', 'c')],
+                             [(c.status, c.name) for c in result])
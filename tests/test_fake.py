@@ -0,0 +1,535 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_fake
+----------------------------------
+
+Tests for the in-memory GCS backend using the real resource classes.
+"""
+import collections
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from gcs_client import bucket
+from gcs_client import connection
+from gcs_client import errors
+from gcs_client import fake
+from gcs_client import gcs_object
+from gcs_client import prefix
+from gcs_client import project
+from gcs_client import transport
+
+
+class FakeTestCase(unittest.TestCase):
+    """Base class for tests that run against FakeTransport."""
+
+    def setUp(self):
+        self.default = transport.Transport.get_default()
+        self.backend = fake.FakeTransport()
+        transport.Transport.set_default(self.backend)
+        self.creds = fake.FakeCredentials()
+        self.backend.create_bucket('bucket')
+        self.bucket = bucket.Bucket('bucket', self.creds)
+
+    def tearDown(self):
+        transport.Transport.set_default(self.default)
+
+    def _create(self, *names):
+        for name in names:
+            self.backend.create_object('bucket', name, name.encode('utf-8'))
+
+
+class TestFakeTransport(FakeTestCase):
+    """Test FakeTransport through the resource classes."""
+
+    def test_create_and_list_buckets(self):
+        """Test creating buckets through a project and listing them."""
+        proj = project.Project('project', self.creds)
+        new_bucket = proj.create_bucket('new_bucket', location='EU')
+        self.assertIsInstance(new_bucket, bucket.Bucket)
+        self.assertEqual('EU', new_bucket.location)
+        self.assertListEqual(['bucket', 'new_bucket'],
+                             [b.name for b in proj.list()])
+        self.assertRaises(errors.Http, proj.create_bucket, 'bucket')
+
+    def test_bucket_metadata_and_exists(self):
+        """Test bucket attributes and existence checks."""
+        self.assertEqual('STANDARD', self.bucket.storageClass)
+        self.assertTrue(self.bucket.exists())
+        self.assertFalse(bucket.Bucket('missing', self.creds).exists())
+
+    def test_delete_bucket(self):
+        """Test only empty buckets can be deleted."""
+        self._create('a')
+        self.assertRaises(errors.Http, self.bucket.delete)
+        gcs_object.Object('bucket', 'a', credentials=self.creds).delete()
+        self.bucket.delete()
+        self.assertFalse(self.bucket.exists())
+
+    def test_list_pagination(self):
+        """Test listing objects over multiple pages."""
+        names = ['obj%03d' % i for i in range(25)]
+        self._create(*names)
+        result = self.bucket.list(maxResults=10)
+        self.assertListEqual(names, [o.name for o in result])
+        self.assertEqual('6', result[3].size)
+
+    def test_list_delimiter(self):
+        """Test listing with prefixes and delimiters."""
+        self._create('a/b', 'a/c', 'd', 'e', 'e/f', 'e/g/h')
+        result = self.bucket.list(delimiter='/', maxResults=2)
+        self.assertListEqual(['d', 'e'], [o.name for o in result
+                                          if isinstance(o,
+                                                        gcs_object.Object)])
+        prefixes = [p for p in result if isinstance(p, prefix.Prefix)]
+        self.assertListEqual(['a/', 'e/'], [p.prefix for p in prefixes])
+
+        sub = prefixes[1].list()
+        self.assertListEqual(['e/f', 'e/g/'], [str(getattr(o, 'prefix',
+                                                           o.name))
+                                               for o in sub])
+
+    def test_object_metadata(self):
+        """Test object metadata, generations and not found objects."""
+        self._create('name')
+        obj = gcs_object.Object('bucket', 'name', credentials=self.creds)
+        self.assertEqual('4', obj.size)
+        self.assertTrue(obj.exists())
+        old = gcs_object.Object('bucket', 'name', '1', credentials=self.creds)
+        self.assertFalse(hasattr(old, 'size'))
+        self.assertFalse(gcs_object.Object('bucket', 'missing',
+                                           credentials=self.creds).exists())
+
+    def test_refresh(self):
+        """Test conditional refresh of object and bucket metadata."""
+        self._create('name')
+        obj = gcs_object.Object('bucket', 'name', credentials=self.creds)
+        self.assertEqual('4', obj.size)
+        self.assertFalse(obj.refresh())
+        with self.bucket.batch() as b:
+            b.patch(gcs_object.Object('bucket', 'name',
+                                      credentials=self.creds),
+                    {'metadata': {'a': '1', 'b': '2'}})
+        self.assertTrue(obj.refresh())
+        self.assertEqual({'a': '1', 'b': '2'}, obj.metadata)
+
+        # Only the generation we asked for is pinned
+        old = gcs_object.Object('bucket', 'name', obj.generation,
+                                credentials=self.creds).reload()
+        self.assertFalse(old.refresh())
+        generation = obj.generation
+        self.backend.create_object('bucket', 'name', b'new data')
+        self.assertTrue(obj.refresh())
+        self.assertNotEqual(generation, obj.generation)
+        self.assertEqual('8', obj.size)
+        self.assertRaises(errors.NotFound, old.refresh)
+
+        self.assertEqual('1', self.bucket.metageneration)
+        self.assertFalse(self.bucket.refresh())
+        del self.bucket.etag
+        self.assertFalse(self.bucket.refresh())
+
+    def test_write_and_read(self):
+        """Test resumable uploads and ranged downloads."""
+        data = b'0123456789' * gcs_object.BLOCK_MULTIPLE
+        with self.bucket.open('file', 'w',
+                              chunksize=gcs_object.BLOCK_MULTIPLE) as f:
+            f.write(data[:5])
+            f.write(data[5:])
+        self.assertEqual(data, self.backend.get_object_data('bucket', 'file'))
+
+        with self.bucket.open('file',
+                              chunksize=gcs_object.BLOCK_MULTIPLE) as f:
+            self.assertEqual(len(data), f.size)
+            self.assertEqual(data[:10], f.read(10))
+            f.seek(-10, 2)
+            self.assertEqual(data[-10:], f.read())
+            f.seek(0)
+            self.assertEqual(data, f.read())
+
+    def test_write_empty(self):
+        """Test writing and reading an empty object."""
+        with self.bucket.open('empty', 'w'):
+            pass
+        with self.bucket.open('empty') as f:
+            self.assertEqual(0, f.size)
+            self.assertEqual(b'', f.read())
+
+    def test_open_missing(self):
+        """Test opening a missing object for reading."""
+        self.assertRaises(IOError, self.bucket.open, 'missing')
+
+    def test_delete_preconditions(self):
+        """Test generation preconditions on delete."""
+        self._create('name')
+        obj = gcs_object.Object('bucket', 'name', credentials=self.creds)
+        self.assertRaises(errors.Http, obj.delete, if_generation_match=1)
+        obj.delete(if_generation_match=obj.generation)
+        self.assertFalse(obj.exists())
+
+    def test_custom_endpoint(self):
+        """Test backend works with a custom endpoint."""
+        self.backend = fake.FakeTransport('http://localhost:4443/gcs')
+        transport.Transport.set_default(self.backend)
+        self.backend.create_bucket('bucket')
+        self._create('name')
+        with self.bucket.open('name') as f:
+            self.assertEqual(b'name', f.read())
+        with self.bucket.open('other', 'w') as f:
+            f.write(b'data')
+        self.assertEqual(b'data',
+                         self.backend.get_object_data('bucket', 'other'))
+
+    def test_iter_list(self):
+        """Test iterating over a listing and continuing it later."""
+        names = ['obj%03d' % i for i in range(25)]
+        self._create(*names)
+        it = self.bucket.iter_list(maxResults=10)
+        self.assertListEqual(names[:10], [next(it).name for i in range(10)])
+        it = self.bucket.iter_list(maxResults=10, pageToken=it.page_token,
+                                   limit=12)
+        self.assertListEqual(names[10:22], [o.name for o in it])
+        prefixes = self.bucket.iter_list(delimiter='/', prefix='obj00')
+        self.assertListEqual(names[:10], [o.name for o in prefixes])
+
+    def test_iter_list_prefetch(self):
+        """Test listing with background prefetching of pages."""
+        names = ['obj%03d' % i for i in range(25)]
+        self._create(*names)
+        it = self.bucket.iter_list(maxResults=4, prefetch=3, limit=22)
+        self.assertListEqual(names[:22], [o.name for o in it])
+
+    def test_iter_list_stream(self):
+        """Test listing parsing pages as they are received."""
+        names = ['obj%03d' % i for i in range(25)] + ['x/a', 'y/b']
+        self._create(*names)
+        it = self.bucket.iter_list(maxResults=10, stream=True)
+        self.assertListEqual(names[:10], [next(it).name for i in range(10)])
+        self.assertEqual(1, it.pages)
+        token = it.page_token
+        self.assertIsNotNone(token)
+        it = self.bucket.iter_list(maxResults=10, pageToken=token, limit=12,
+                                   stream=True)
+        self.assertListEqual(names[10:22], [o.name for o in it])
+        self.assertTrue(it.done)
+
+        result = list(self.bucket.iter_list(delimiter='/', maxResults=10,
+                                            records=True, stream=True))
+        expected = self.bucket.list(delimiter='/', records=True)
+        self.assertListEqual([type(r) for r in expected],
+                             [type(r) for r in result])
+        self.assertEqual(['x/', 'y/'], [r.prefix for r in result[-2:]])
+        self.assertRaises(ValueError, self.bucket.iter_list, prefetch=1,
+                          stream=True)
+
+    def test_iter_list_stream_stats(self):
+        """Test streamed pages are counted in the transfer stats."""
+        self._create(*['dir/object-%03d' % i for i in range(100)])
+        self.bucket.list()
+        expected = (self.backend.stats.wire_bytes,
+                    self.backend.stats.decoded_bytes)
+        self.backend.stats.reset()
+        list(self.bucket.iter_list(stream=True))
+        self.assertEqual((1, 1) + expected,
+                         (self.backend.stats.responses,
+                          self.backend.stats.compressed,
+                          self.backend.stats.wire_bytes,
+                          self.backend.stats.decoded_bytes))
+
+    def test_iter_list_stream_abandoned(self):
+        """Test abandoned streamed listings give their connection back."""
+        self._create('a', 'b', 'c')
+        pool = connection.ConnectionPool(max_connections=1)
+        session = mock.Mock()
+        session.request.side_effect = self.backend._request
+        pool._get_session = mock.Mock(return_value=session)
+        transport.Transport.set_default(
+            transport.HttpTransport(self.backend.endpoint, pool))
+
+        it = self.bucket.iter_list(maxResults=2, stream=True)
+        self.assertEqual('a', next(it).name)
+        self.assertFalse(pool._semaphore.acquire(False))
+        del it
+        # Another request would wait forever for the connection
+        self.assertTrue(pool._semaphore.acquire(False))
+        pool._semaphore.release()
+        self.assertListEqual(['a', 'b', 'c'],
+                             [o.name for o in self.bucket.iter_list(
+                                 maxResults=2, stream=True)])
+        self.assertTrue(pool._semaphore.acquire(False))
+
+    def test_iter_list_stream_error(self):
+        """Test a page that fails while streaming is requested again."""
+        self._create('a', 'b', 'c')
+        it = self.bucket.iter_list(maxResults=2, stream=True)
+        self.assertListEqual(['a', 'b'], [next(it).name for i in range(2)])
+        with mock.patch('gcs_client.transport.Response.iter_content',
+                        side_effect=IOError()):
+            self.assertRaises(IOError, next, it)
+        self.assertListEqual(['c'], [o.name for o in it])
+        self.assertEqual(3, it.pages)
+
+    def test_iter_list_checkpoint(self):
+        """Test resuming an interrupted listing from its checkpoint."""
+        names = ['obj%03d' % i for i in range(25)]
+        self._create(*names)
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'listing.ckpt')
+
+        it = self.bucket.iter_list(maxResults=10, checkpoint=path)
+        # Checkpoint is saved when we ask for more after a whole page
+        self.assertListEqual(names[:13], [next(it).name for i in range(13)])
+        self.assertTrue(os.path.exists(path))
+
+        # Partially consumed page is returned again
+        it = self.bucket.iter_list(maxResults=10, checkpoint=path)
+        self.assertListEqual(names[10:], [o.name for o in it])
+        self.assertEqual(25, it.count)
+        self.assertFalse(os.path.exists(path))
+
+        it = self.bucket.iter_list(maxResults=10, checkpoint=path)
+        [next(it) for i in range(11)]
+        with self.assertRaises(errors.Error):
+            self.bucket.iter_list(maxResults=5, checkpoint=path)
+
+    def test_list_records(self):
+        """Test listing compact records and promoting them to objects."""
+        self._create('a', 'd/b', 'd/c')
+        result = self.bucket.list(delimiter='/', records=True)
+        self.assertIsInstance(result[0], gcs_object.ObjectRecord)
+        self.assertEqual(('a', 1), (result[0].name, result[0].size))
+        self.assertIsInstance(result[1], prefix.Prefix)
+        records = list(result[1].iter_list(records=True))
+        self.assertListEqual(['d/b', 'd/c'], [r.name for r in records])
+        obj = records[0].to_object()
+        self.assertIsInstance(obj, gcs_object.Object)
+        self.assertEqual('application/octet-stream', obj.contentType)
+        self.assertEqual(str(records[0].generation), obj.generation)
+
+    def test_list_fields(self):
+        """Test partial listings retrieve missing attributes on access."""
+        self._create('a', 'b')
+        result = self.bucket.list(fields='items(bucket,name,size)')
+        self.assertListEqual(['a', 'b'], [o.name for o in result])
+        self.assertNotIn('contentType', vars(result[0]))
+        self.assertEqual('application/octet-stream', result[0].contentType)
+
+        # Fields needed to use the objects are always requested
+        result = self.bucket.list(fields='items(size)')
+        self.assertListEqual([('bucket', 'a', '1'), ('bucket', 'b', '1')],
+                             [(o.bucket, o.name, o.size) for o in result])
+        with result[0].open() as f:
+            self.assertEqual(b'a', f.read())
+
+        records = self.bucket.list(records=True, fields='items(name)')
+        self.assertEqual('a', records[0].name)
+        self.assertIsNone(records[0].size)
+
+    def test_reload_fields(self):
+        """Test fields partial responses of the in-memory backend."""
+        self._create('a')
+        obj = gcs_object.Object('bucket', 'a', credentials=self.creds)
+        obj.reload(fields='size,metadata/x')
+        self.assertEqual('1', vars(obj)['size'])
+        self.assertNotIn('md5Hash', vars(obj))
+        self.assertEqual('1', obj.size)
+        self.assertIsNotNone(obj.md5Hash)
+
+        data = {'a': [{'b': 1, 'c': 2}], 'd': {'e': 3, 'f': 4}, 'g': 5}
+        self.assertDictEqual(
+            {'a': [{'b': 1}], 'd': {'e': 3}},
+            fake._select_fields(data, fake._parse_fields('a(b),d/e')[0]))
+        self.assertDictEqual(
+            {'a': [{'c': 2}], 'd': data['d']},
+            fake._select_fields(data, fake._parse_fields('a/c,d/*')[0]))
+
+    def test_gzip(self):
+        """Test JSON responses are compressed but media is not."""
+        self._create(*['dir/object-%03d' % i for i in range(100)])
+        self.bucket.list()
+        stats = self.backend.stats
+        self.assertEqual(1, stats.compressed)
+        self.assertLess(stats.wire_bytes * 3, stats.decoded_bytes)
+
+        stats.reset()
+        with self.bucket.open('dir/object-000') as f:
+            self.assertEqual(b'dir/object-000', f.read())
+        self.assertEqual(0, stats.compressed)
+
+    def test_walk(self):
+        """Test walking the tree of prefixes concurrently."""
+        self._create('a', 'd/b', 'd/c', 'd/e/f', 'd/e/g/h', 'x/y')
+        result = {p: ([sub.prefix for sub in prefixes],
+                      [o.name for o in objects])
+                  for p, prefixes, objects in self.bucket.walk(concurrency=2)}
+        self.assertDictEqual({'': (['d/', 'x/'], ['a']),
+                              'd/': (['d/e/'], ['d/b', 'd/c']),
+                              'd/e/': (['d/e/g/'], ['d/e/f']),
+                              'd/e/g/': ([], ['d/e/g/h']),
+                              'x/': ([], ['x/y'])},
+                             result)
+
+    def test_walk_prune(self):
+        """Test pruning prefixes and starting on a prefix."""
+        self._create('d/b', 'd/e/f', 'd/g/h')
+        visited = []
+        for p, prefixes, objects in self.bucket.walk('d/'):
+            visited.append(p)
+            prefixes[:] = [sub for sub in prefixes if sub.prefix != 'd/e/']
+        self.assertListEqual(['d/', 'd/g/'], visited)
+
+    def test_parallel_list(self):
+        """Test listing concurrently by key ranges."""
+        names = sorted('%s%03d' % (c, i) for c in 'aeimquy' for i in range(20))
+        self._create(*names)
+        result = self.bucket.parallel_list(concurrency=3, maxResults=7)
+        self.assertListEqual(names, [o.name for o in result])
+
+        result = self.bucket.parallel_list(concurrency=3, ordered=False,
+                                           sample_pages=3, maxResults=7,
+                                           splits=20)
+        result = [o.name for o in result]
+        self.assertEqual(len(names), len(result))
+        self.assertSetEqual(set(names), set(result))
+
+    def test_parallel_list_prefix(self):
+        """Test parallel listing with prefix and a small listing."""
+        names = ['dir/%03d' % i for i in range(30)]
+        self._create('a', 'z', *names)
+        result = self.bucket.parallel_list('dir/', maxResults=5)
+        self.assertListEqual(names, [o.name for o in result])
+        result = self.bucket.parallel_list('dir/', sample_pages=10,
+                                           maxResults=5)
+        self.assertListEqual(names, [o.name for o in result])
+        self.assertListEqual([], list(self.bucket.parallel_list('missing')))
+
+    def test_parallel_list_shared_prefix(self):
+        """Test names sharing a long prefix are split among ranges."""
+        names = ['data/part-%06d.parquet' % i for i in range(1000)]
+        self._create(*names)
+        sizes = collections.Counter()
+        list_page = self.bucket._list_range_page
+
+        def count_page(start, end, *args, **kwargs):
+            items, page_token = list_page(start, end, *args, **kwargs)
+            sizes[start, end] += len(items)
+            return items, page_token
+
+        with mock.patch.object(self.bucket, '_list_range_page',
+                               side_effect=count_page):
+            result = self.bucket.parallel_list(concurrency=4, maxResults=200)
+            self.assertListEqual(names, [o.name for o in result])
+        # Besides the 200 sampled objects
+        self.assertEqual(800, sum(sizes.values()))
+        self.assertGreaterEqual(len([n for n in sizes.values() if n]), 4)
+        self.assertLessEqual(max(sizes.values()), 200)
+
+    def test_parallel_list_streams_ranges(self):
+        """Test objects of a range are returned as its pages arrive."""
+        names = ['%03d' % i for i in range(100)]
+        self._create(*names)
+        list_page = self.bucket._list_range_page
+        with mock.patch.object(self.bucket, '_list_range_page',
+                               wraps=list_page) as list_mock:
+            result = self.bucket.parallel_list(concurrency=1, splits=2,
+                                               maxResults=10)
+            self.assertListEqual(names[:11],
+                                 [next(result).name for i in range(11)])
+            self.assertEqual(1, list_mock.call_count)
+            self.assertListEqual(names[11:], [o.name for o in result])
+
+    def test_parallel_list_checkpoint(self):
+        """Test resuming an interrupted parallel listing."""
+        names = sorted('%s%03d' % (c, i) for c in 'aeimquy' for i in range(20))
+        self._create(*names)
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'listing.ckpt')
+
+        result = self.bucket.parallel_list(concurrency=3, maxResults=7,
+                                           checkpoint=path)
+        first = [next(result).name for i in range(60)]
+        result.close()
+        self.assertListEqual(names[:60], first)
+        self.assertTrue(os.path.exists(path))
+
+        result = self.bucket.parallel_list(concurrency=3, maxResults=7,
+                                           checkpoint=path)
+        rest = [o.name for o in result]
+        # Only the ranges that were not completely consumed are listed again
+        self.assertLess(len(rest), len(names))
+        self.assertListEqual(names, sorted(set(first + rest)))
+        self.assertFalse(os.path.exists(path))
+
+    def test_get_objects(self):
+        """Test retrieving many objects in concurrent batch requests."""
+        names = ['%03d' % i for i in range(25)]
+        self._create(*names)
+        wanted = ['missing'] + names[::-1] + ['other']
+        result = self.bucket.get_objects(wanted, concurrency=2, batch_size=4)
+        self.assertEqual(len(wanted), len(result))
+        self.assertIsNone(result[0])
+        self.assertIsNone(result[-1])
+        self.assertListEqual(names[::-1], [o.name for o in result[1:-1]])
+        # Objects are filled, no more requests are needed to access fields
+        with mock.patch.object(self.backend, '_request') as request_mock:
+            self.assertEqual('3', result[-2].size)
+            self.assertFalse(request_mock.called)
+        self.assertListEqual([], self.bucket.get_objects([]))
+
+    def test_exists_many(self):
+        self._create('a', 'c')
+        self.assertListEqual([True, False, True, False],
+                             self.bucket.exists_many(['a', 'b', 'c', 'd'],
+                                                     batch_size=3))
+
+
+class TestFutures(FakeTestCase):
+    """Test concurrent futures API."""
+
+    def test_bucket_futures(self):
+        """Test bucket submit methods."""
+        writes = [self.bucket.submit_write('obj%s' % i,
+                                           ('data%s' % i).encode())
+                  for i in range(5)]
+        self.assertListEqual([None] * 5, [f.result() for f in writes])
+
+        listing = self.bucket.submit_list(prefix='obj')
+        self.assertListEqual(['obj%s' % i for i in range(5)],
+                             [o.name for o in listing.result()])
+
+        reads = [self.bucket.submit_read('obj%s' % i) for i in range(5)]
+        self.assertListEqual([('data%s' % i).encode() for i in range(5)],
+                             [f.result() for f in reads])
+        self.assertRaises(IOError,
+                          self.bucket.submit_read('missing').result)
+
+    def test_object_futures(self):
+        """Test object submit methods."""
+        self._create('name')
+        obj = gcs_object.Object('bucket', 'name', credentials=self.creds)
+        self.assertIs(obj, obj.submit_reload().result())
+        self.assertEqual('4', obj.size)
+        self.assertEqual(b'name', obj.submit_read().result())
+        self.assertIsNone(obj.submit_delete().result())
+        self.assertFalse(obj.submit('exists').result())
+        self.assertRaises(errors.NotFound, obj.submit_reload().result)
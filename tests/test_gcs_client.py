@@ -58,6 +58,27 @@ class TestGcs_client(unittest.TestCase):
         from gcs_client import common
         self.assertIs(common.RetryParams, gcs_client.RetryParams)
 
+    def test_executor_accessible(self):
+        from gcs_client import common
+        self.assertIs(common.Executor, gcs_client.Executor)
+
+    def test_batch_accessible(self):
+        from gcs_client import batch
+        self.assertIs(batch.Batch, gcs_client.Batch)
+
+    def test_object_columns_accessible(self):
+        from gcs_client import columns
+        self.assertIs(columns.ObjectColumns, gcs_client.ObjectColumns)
+
+    def test_connection_pool_accessible(self):
+        from gcs_client import connection
+        self.assertIs(connection.ConnectionPool, gcs_client.ConnectionPool)
+
+    def test_transport_accessible(self):
+        from gcs_client import transport
+        self.assertIs(transport.Transport, gcs_client.Transport)
+        self.assertIs(transport.HttpTransport, gcs_client.HttpTransport)
+
     def test_errors_accessible(self):
         from gcs_client import errors
         self.assertIs(errors, gcs_client.errors)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_inventory
+----------------------------------
+
+Tests for the local bucket inventory
+"""
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+from gcs_client import gcs_object
+from gcs_client import inventory
+from tests import test_fake
+
+
+class TestInventory(test_fake.FakeTestCase):
+    """Test Inventory against the in-memory backend."""
+
+    def setUp(self):
+        super(TestInventory, self).setUp()
+        self.inv = inventory.Inventory()
+        self.addCleanup(self.inv.close)
+
+    def test_prefix_range(self):
+        self.assertEqual(('', ()), inventory._prefix_range(''))
+        self.assertEqual((' AND name >= ? AND name < ?', ('ab/', 'ab0')),
+                         inventory._prefix_range('ab/'))
+
+    def test_sync(self):
+        """Test initial synchronization and queries."""
+        self._create('a', 'd/bb', 'd/ccc', 'da')
+        self.assertEqual((4, 0, 0, 4), self.inv.sync(self.bucket))
+
+        row = self.inv.get('bucket', 'd/bb')
+        self.assertEqual(4, row['size'])
+        obj = gcs_object.Object('bucket', 'd/bb', credentials=self.creds)
+        self.assertEqual(int(obj.reload().generation), row['generation'])
+        self.assertIsNone(self.inv.get('bucket', 'missing'))
+        self.assertListEqual(['d/bb', 'd/ccc'],
+                             [r['name'] for r in self.inv.list('bucket',
+                                                               'd/')])
+        self.assertEqual((2, 9), self.inv.total_size('bucket', 'd/'))
+        self.assertEqual((4, 12), self.inv.total_size('bucket'))
+        self.assertEqual((0, 0), self.inv.total_size('other'))
+        self.assertAlmostEqual(time.time(),
+                               self.inv.synced_at('bucket', ''), delta=60)
+        self.assertIsNone(self.inv.synced_at('bucket', 'd/'))
+
+    def test_refresh(self):
+        """Test refreshing only some prefixes."""
+        self._create('a', 'd/b', 'd/c', 'e/f')
+        self.inv.sync(self.bucket)
+        # Change contents in d/ and e/, but only refresh d/
+        self.backend.create_object('bucket', 'd/b', b'changed')
+        self.backend.create_object('bucket', 'd/new', b'')
+        self.backend.create_object('bucket', 'e/g', b'')
+        gcs_object.Object('bucket', 'd/c', credentials=self.creds).delete()
+
+        self.assertEqual((1, 1, 1, 2), self.inv.refresh(self.bucket, ['d/']))
+        self.assertListEqual(['a', 'd/b', 'd/new', 'e/f'],
+                             [r['name'] for r in self.inv.list('bucket')])
+        self.assertEqual(7, self.inv.get('bucket', 'd/b')['size'])
+        self.assertEqual((1, 0, 0, 5), self.inv.sync(self.bucket))
+
+    def test_updated_since(self):
+        self._create('a', 'b')
+        self.inv.sync(self.bucket)
+        future = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        self.assertListEqual([], list(self.inv.updated_since('bucket',
+                                                             future)))
+        self.assertListEqual(['a', 'b'],
+                             sorted(r['name'] for r in
+                                    self.inv.updated_since('bucket', 0)))
+        self.assertListEqual(['b'],
+                             [r['name'] for r in
+                              self.inv.updated_since('bucket', 0, 'b')])
+
+    def test_persistent(self):
+        """Test inventory is kept on disk."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'inventory.db')
+        self._create('a')
+        with inventory.Inventory(path) as inv:
+            inv.sync(self.bucket)
+        with inventory.Inventory(path) as inv:
+            self.assertEqual((1, 1), inv.total_size('bucket'))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_jsonstream
+----------------------------------
+
+Tests for incremental JSON parsing
+"""
+import unittest
+
+from gcs_client import jsonstream
+
+
+class TestIterObject(unittest.TestCase):
+    """Test parsing JSON objects in chunks."""
+
+    def _chunks(self, data, size):
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def _parse(self, data, size, arrays=('items',)):
+        return list(jsonstream.iter_object(self._chunks(data, size), arrays))
+
+    def test_members(self):
+        """Test results are the same whatever the chunk size."""
+        data = (u'{"kind": "storage#objects", "nextPageToken": "t",\n'
+                u' "prefixes": ["a/", "b/"],\n'
+                u' "items": [{"name": "\u00f1", "size": "12",\n'
+                u'            "metadata": {"k": [1, 2.5, null, true]}},\n'
+                u'           {"name": "b", "n": 12345}],\n'
+                u' "number": 1234}\n').encode('utf-8')
+        expected = [('kind', 'storage#objects'), ('nextPageToken', 't'),
+                    ('prefixes', ['a/', 'b/']),
+                    ('items', {'name': u'\xf1', 'size': '12',
+                               'metadata': {'k': [1, 2.5, None, True]}}),
+                    ('items', {'name': 'b', 'n': 12345}),
+                    ('number', 1234)]
+        for size in (1, 2, 3, 7, len(data)):
+            self.assertListEqual(expected, self._parse(data, size))
+
+    def test_empty(self):
+        self.assertListEqual([], self._parse(b' { } ', 1))
+        self.assertListEqual([('a', 1)],
+                             self._parse(b'{"items": [], "a": 1}', 4))
+        self.assertListEqual([('items', {})],
+                             self._parse(b'{"items": {}}', 4))
+
+    def test_invalid(self):
+        """Test truncated or invalid documents raise ValueError."""
+        for data in (b'', b'[]', b'{"a": 1', b'{"items": [1, 2',
+                     b'{"a": tru}', b'{1: 2}', b'{"a": 1} x'):
+            self.assertRaises(ValueError, self._parse, data, 2)
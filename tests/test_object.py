@@ -29,6 +29,8 @@ import requests
 from gcs_client import gcs_object
 
 
+# Mocked responses are decoded with their json method
+@mock.patch('gcs_client.transport._json_decoder', None)
 class TestObject(unittest.TestCase):
     """Tests for Object class."""
 
@@ -45,8 +47,13 @@ class TestObject(unittest.TestCase):
         self.assertEqual(mock.sentinel.bucket, obj.bucket)
         self.assertEqual(mock.sentinel.generation, obj.generation)
         self.assertEqual('storage#objects', obj.kind)
+
+    def test_field_defaults(self):
+        """Test fields GCS doesn't return for objects without them."""
+        obj = gcs_object.Object._obj_from_data({'name': 'name'})
         self.assertDictEqual({}, obj.metadata)
         self.assertIsNone(obj.timeDeleted)
+        self.assertRaises(AttributeError, getattr, obj, 'md5Hash')
 
     @mock.patch('gcs_client.base.GCS.__init__')
     def test_init_defaults(self, mock_init):
@@ -141,3 +148,46 @@ class TestObject(unittest.TestCase):
                                           mock.sentinel.new_cs,
                                           mock.sentinel.retry_params,
                                           mock.sentinel.generation)
+
+
+class TestObjectRecord(unittest.TestCase):
+    """Tests for ObjectRecord class."""
+
+    def setUp(self):
+        self.parent = mock.Mock(credentials=mock.sentinel.credentials,
+                                retry_params=mock.sentinel.retry_params)
+        self.parent.name = 'bucket'
+
+    def test_from_data(self):
+        record = gcs_object.ObjectRecord._from_data(
+            {'name': 'name', 'size': '10', 'generation': '3',
+             'md5Hash': 'md5', 'updated': 'date', 'kind': 'storage#object'},
+            self.parent)
+        self.assertEqual('bucket', record.bucket)
+        self.assertEqual('name', record.name)
+        self.assertEqual(10, record.size)
+        self.assertEqual(3, record.generation)
+        self.assertEqual('md5', record.md5Hash)
+        self.assertIsNone(record.crc32c)
+        self.assertEqual('date', record.updated)
+        self.assertEqual('bucket/name', str(record))
+
+    def test_slots(self):
+        record = gcs_object.ObjectRecord(self.parent, 'name')
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertRaises(AttributeError, setattr, record, 'other', 1)
+
+    @mock.patch('gcs_client.gcs_object.Object')
+    def test_to_object(self, obj_mock):
+        record = gcs_object.ObjectRecord(self.parent, 'name', generation=3)
+        self.assertEqual(obj_mock.return_value, record.to_object(5))
+        obj_mock.assert_called_once_with('bucket', 'name', None,
+                                         mock.sentinel.credentials,
+                                         mock.sentinel.retry_params, 5)
+
+    def test_list_kwargs(self):
+        self.assertDictEqual({}, gcs_object.ObjectRecord._list_kwargs(False))
+        kwargs = gcs_object.ObjectRecord._list_kwargs(True)
+        self.assertEqual(gcs_object.ObjectRecord.FIELDS, kwargs['fields'])
+        self.assertEqual(gcs_object.ObjectRecord._from_data,
+                         kwargs['_item_factory'])
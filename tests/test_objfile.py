@@ -124,7 +124,8 @@ class TestObjFile(unittest.TestCase):
                           self.name, mock.sentinel.credentials, 'r',
                           gcs_object.BLOCK_MULTIPLE + 1)
 
-    @mock.patch('requests.get', **{'return_value.status_code': 404})
+    @mock.patch('gcs_client.transport.Transport.get',
+                **{'return_value.status_code': 404})
     def test_init_read_not_found(self, get_mock):
         access_token = 'access_token'
         creds = mock.Mock()
@@ -132,7 +133,8 @@ class TestObjFile(unittest.TestCase):
         self.assertRaises(IOError, gcs_object.GCSObjFile, self.bucket,
                           self.name, creds, 'r')
 
-    @mock.patch('requests.get', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.get',
+                **{'return_value.status_code': 200})
     def test_init_read_non_json(self, get_mock):
         get_mock.return_value.content = 'non_json'
         access_token = 'access_token'
@@ -141,7 +143,8 @@ class TestObjFile(unittest.TestCase):
         self.assertRaises(errors.Error, gcs_object.GCSObjFile, self.bucket,
                           self.name, creds, 'r')
 
-    @mock.patch('requests.get', **{'return_value.status_code': 404})
+    @mock.patch('gcs_client.transport.Transport.get',
+                **{'return_value.status_code': 404})
     def test_init_read_quote_data(self, get_mock):
         access_token = 'access_token'
         creds = mock.Mock()
@@ -157,7 +160,8 @@ class TestObjFile(unittest.TestCase):
                                          params={'fields': 'size',
                                                  'generation': None})
 
-    @mock.patch('requests.get', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.get',
+                **{'return_value.status_code': 200})
     def test_init_read(self, get_mock):
         size = 123
         get_mock.return_value.content = '{"size": "%s"}' % size
@@ -189,9 +193,9 @@ class TestObjFile(unittest.TestCase):
 
     def _open(self, mode):
         if mode == 'r':
-            method = 'requests.get'
+            method = 'gcs_client.transport.Transport.get'
         else:
-            method = 'requests.post'
+            method = 'gcs_client.transport.Transport.post'
 
         self.access_token = 'access_token'
         creds = mock.Mock()
@@ -228,7 +232,8 @@ class TestObjFile(unittest.TestCase):
             self.assertFalse(f.closed)
         self.assertTrue(f.closed)
 
-    @mock.patch('requests.post', **{'return_value.status_code': 404})
+    @mock.patch('gcs_client.transport.Transport.post',
+                **{'return_value.status_code': 404})
     def test_init_write_not_found(self, head_mock):
         access_token = 'access_token'
         creds = mock.Mock()
@@ -236,7 +241,8 @@ class TestObjFile(unittest.TestCase):
         self.assertRaises(IOError, gcs_object.GCSObjFile, self.bucket,
                           self.name, creds, 'w')
 
-    @mock.patch('requests.post', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.post',
+                **{'return_value.status_code': 200})
     def test_init_write(self, post_mock):
         access_token = 'access_token'
         creds = mock.Mock()
@@ -301,7 +307,7 @@ class TestObjFile(unittest.TestCase):
                          headers['Authorization'])
         self.assertEqual('bytes=%s-%s' % (begin, end - 1), headers['Range'])
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_read_all_fits_in_1_chunk(self, get_mock):
         f = self._open('r')
         expected_data = b'0' * (f._chunksize - 1)
@@ -321,7 +327,8 @@ class TestObjFile(unittest.TestCase):
 
         f.close()
 
-    @mock.patch('requests.put', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.put',
+                **{'return_value.status_code': 200})
     def test_write_all_fits_in_1_chunk(self, put_mock):
         f = self._open('w')
         data = b'*' * (f._chunksize - 1)
@@ -338,7 +345,7 @@ class TestObjFile(unittest.TestCase):
         put_mock.assert_called_once_with(mock.sentinel.location, data=data,
                                          headers=headers)
 
-    @mock.patch('requests.put')
+    @mock.patch('gcs_client.transport.Transport.put')
     def test_write_all_multiple_chunks(self, put_mock):
         put_mock.side_effect = [mock.Mock(status_code=308),
                                 mock.Mock(status_code=200)]
@@ -369,7 +376,8 @@ class TestObjFile(unittest.TestCase):
                                          data=data2[1:],
                                          headers=headers)
 
-    @mock.patch('requests.put', **{'return_value.status_code': 200})
+    @mock.patch('gcs_client.transport.Transport.put',
+                **{'return_value.status_code': 200})
     def test_write_exactly_1_chunk(self, put_mock):
         put_mock.side_effect = [mock.Mock(status_code=308),
                                 mock.Mock(status_code=200)]
@@ -390,7 +398,7 @@ class TestObjFile(unittest.TestCase):
         put_mock.assert_called_once_with(mock.sentinel.location, data=b'',
                                          headers=headers)
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_read_all_multiple_chunks(self, get_mock):
         f = self._open('r')
         expected_data = b'0' * ((f._chunksize - 1) * 2)
@@ -413,7 +421,7 @@ class TestObjFile(unittest.TestCase):
 
         f.close()
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_read_all_multiple_chunks_exact_size_no_header(self, get_mock):
         f = self._open('r')
         expected_data = b'0' * (f._chunksize * 2)
@@ -438,7 +446,7 @@ class TestObjFile(unittest.TestCase):
 
         f.close()
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_read_all_multiple_chunks_exact_size_with_header(self, get_mock):
         f = self._open('r')
         offsets = ((0, f._chunksize), (f._chunksize, 2 * f._chunksize))
@@ -466,7 +474,7 @@ class TestObjFile(unittest.TestCase):
 
         f.close()
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_read_size_multiple_chunks(self, get_mock):
         f = self._open('r')
         offsets = ((0, f._chunksize), (f._chunksize, 2 * f._chunksize))
@@ -502,12 +510,13 @@ class TestObjFile(unittest.TestCase):
 
         f.close()
 
-    @mock.patch('requests.get', **{'return_value.status_code': 404})
+    @mock.patch('gcs_client.transport.Transport.get',
+                **{'return_value.status_code': 404})
     def test_read_error(self, get_mock):
         with self._open('r') as f:
             self.assertRaises(gcs_object.errors.NotFound, f.read)
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_get_data_size_0(self, get_mock):
         get_mock.return_value = mock.Mock(status_code=200, content='data')
         with self._open('r') as f:
@@ -516,7 +525,8 @@ class TestObjFile(unittest.TestCase):
             self.assertFalse(get_mock.called)
 
     def _check_seek(self, offset, whence, expected_initial=None):
-        with mock.patch('requests.get') as get_mock:
+        with mock.patch('gcs_client.transport.Transport.get') as \
+                get_mock:
             block = gcs_object.DEFAULT_BLOCK_SIZE
             f = self._open('r')
             f.size = 4 * block
@@ -572,7 +582,20 @@ class TestObjFile(unittest.TestCase):
         self._check_seek(six.MAXSIZE, os.SEEK_END,
                          4 * gcs_object.DEFAULT_BLOCK_SIZE)
 
-    @mock.patch('requests.get')
+    @mock.patch('gcs_client.transport.Transport.get')
+    def test_seek_after_eof(self, get_mock):
+        """Test seeking after reaching EOF allows reading again."""
+        with self._open('r') as f:
+            f.size = 10
+            get_mock.side_effect = [
+                mock.Mock(status_code=200, content=b'0123456789', headers={}),
+                mock.Mock(status_code=206, content=b'56789', headers={})]
+            self.assertEqual(b'0123456789', f.read())
+            f.seek(5)
+            self.assertEqual(b'56789', f.read())
+            self._check_get_call(get_mock, 1, 5, 5 + f._chunksize)
+
+    @mock.patch('gcs_client.transport.Transport.get')
     def test_seek_read_wrong_whence(self, get_mock):
         with self._open('r') as f:
             self.assertRaises(ValueError, f.seek, 0, -1)
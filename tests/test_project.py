@@ -27,8 +27,11 @@ import mock
 
 from gcs_client import common
 from gcs_client import project
+from gcs_client import transport
 
 
+# Mocked responses are decoded with their json method
+@mock.patch('gcs_client.transport._json_decoder', None)
 class TestProject(unittest.TestCase):
 
     @mock.patch('gcs_client.base.GCS.__init__')
@@ -75,7 +78,9 @@ class TestProject(unittest.TestCase):
                      'nextPageToken': mock.sentinel.next_token},
                     {'kind': 'storage#buckets',
                      'items': [mock.sentinel.result3]}]
-        mock_request.return_value.json.side_effect = expected
+        # Each request returns a new response
+        mock_request.side_effect = [mock.Mock(**{'json.return_value': page})
+                                    for page in expected]
 
         expected2 = [mock.sentinel.result4, mock.sentinel.result5]
         obj_mock.side_effect = expected2
@@ -109,12 +114,15 @@ class TestProject(unittest.TestCase):
                        pageToken=mock.sentinel.next_token)],
             mock_request.call_args_list)
         self.assertListEqual(
-            [mock.call(mock.sentinel.result1, creds, retry_params),
-             mock.call(mock.sentinel.result2, creds, retry_params),
-             mock.call(mock.sentinel.result3, creds, retry_params)],
+            [mock.call(mock.sentinel.result1, creds, retry_params,
+                       partial=True),
+             mock.call(mock.sentinel.result2, creds, retry_params,
+                       partial=True),
+             mock.call(mock.sentinel.result3, creds, retry_params,
+                       partial=True)],
             obj_mock.call_args_list)
 
-    @mock.patch('requests.request')
+    @mock.patch('gcs_client.transport.Transport.request')
     @mock.patch('gcs_client.bucket.Bucket._obj_from_data')
     def test_create_buckets(self, obj_mock, request_mock):
         """Test bucket creation."""
@@ -135,7 +143,8 @@ class TestProject(unittest.TestCase):
         request_mock.assert_called_once_with(
             'POST',
             'https://www.googleapis.com/storage/v1/b?project=project_name',
-            headers={'Authorization': mock.ANY},
+            headers=dict(transport.GZIP_HEADERS,
+                         Authorization=mock.ANY),
             json={'storageClass': mock.sentinel.storage,
                   'name': mock.sentinel.name,
                   'location': mock.sentinel.location},
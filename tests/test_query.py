@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_query
+----------------------------------
+
+Tests for listing queries
+"""
+import datetime
+import re
+import unittest
+
+import mock
+
+from gcs_client import gcs_object
+from gcs_client import query
+from tests import test_fake
+
+
+class TestGlob(unittest.TestCase):
+    """Test glob parsing."""
+
+    def _matches(self, pattern, names):
+        regex = query.glob_to_regex(pattern)
+        return [name for name in names if regex.match(name)]
+
+    def test_wildcards(self):
+        names = ['a.txt', 'b.txt', 'd/a.txt', 'd/e/a.txt', 'a.txt.gz']
+        self.assertListEqual(['a.txt', 'b.txt'],
+                             self._matches('*.txt', names))
+        self.assertListEqual(['a.txt', 'b.txt', 'd/a.txt', 'd/e/a.txt'],
+                             self._matches('**.txt', names))
+        self.assertListEqual(['d/a.txt'], self._matches('?/a.txt', names))
+        self.assertListEqual(['a.txt', 'd/a.txt'],
+                             self._matches('{a,d/a}.txt', names))
+        self.assertListEqual(['b.txt'], self._matches('[!a].txt', names))
+        self.assertListEqual(['a.txt', 'b.txt'],
+                             self._matches('[ab].txt', names))
+
+    def test_literals(self):
+        names = ['a*b', 'axb', '[a', 'a.b']
+        self.assertListEqual(['a*b'], self._matches('a\\*b', names))
+        self.assertListEqual(['[a'], self._matches('[a', names))
+        self.assertListEqual(['a.b'], self._matches('a.b', names))
+
+    def test_glob_prefix(self):
+        self.assertEqual('logs/2026-10-',
+                         query.glob_prefix('logs/2026-10-*/*.parquet'))
+        self.assertEqual('a*b', query.glob_prefix('a\\*b?'))
+        self.assertEqual('', query.glob_prefix('{a,b}'))
+
+    def test_regex_prefix(self):
+        self.assertEqual('logs/', query.regex_prefix(r'logs/\d+'))
+        self.assertEqual('a.b', query.regex_prefix(r'^a\.b.*'))
+        self.assertEqual('ab', query.regex_prefix('abc?'))
+        self.assertEqual('abc', query.regex_prefix('abc+d'))
+        self.assertEqual('', query.regex_prefix('ab|cd'))
+        self.assertEqual('', query.regex_prefix('ab', re.IGNORECASE))
+
+
+class TestQuery(test_fake.FakeTestCase):
+    """Test queries against the in-memory backend."""
+
+    def setUp(self):
+        super(TestQuery, self).setUp()
+        self._create('logs/2026-09-30/a.parquet',
+                     'logs/2026-10-01/a.parquet',
+                     'logs/2026-10-01/bb.parquet',
+                     'logs/2026-10-01/c.json',
+                     'logs/2026-10-01/sub/d.parquet',
+                     'logs/2026-10-02/e.parquet',
+                     'other/f.parquet')
+        self.expected = ['logs/2026-10-01/a.parquet',
+                         'logs/2026-10-01/bb.parquet',
+                         'logs/2026-10-02/e.parquet']
+        self.list_mock = mock.patch.object(
+            self.backend, '_list_objects',
+            wraps=self.backend._list_objects).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _listed(self):
+        return [(c[0][1].get('prefix'), c[0][1].get('delimiter'),
+                 c[0][1].get('matchGlob'))
+                for c in self.list_mock.call_args_list]
+
+    def test_match_glob(self):
+        """Test glob and literal prefix are sent to the server."""
+        result = self.bucket.query('logs/2026-10-*/*.parquet')
+        self.assertListEqual(self.expected, [o.name for o in result])
+        self.assertListEqual(
+            [('logs/2026-10-', None, 'logs/2026-10-*/*.parquet')],
+            self._listed())
+
+    def test_delimiter_levels(self):
+        """Test directory levels are listed without server side matching."""
+        result = self.bucket.query('logs/2026-10-*/*.parquet',
+                                   match_glob=False, records=True)
+        self.assertListEqual(self.expected, [o.name for o in result])
+        self.assertIsInstance(result.list()[0], gcs_object.ObjectRecord)
+        self.assertListEqual([('logs/2026-10-', '/', None),
+                              ('logs/2026-10-01/', '/', None),
+                              ('logs/2026-10-02/', '/', None)],
+                             self._listed()[:3])
+
+    def test_globstar(self):
+        """Test patterns crossing directories use a flat listing."""
+        result = self.bucket.query('logs/**.parquet', match_glob=False)
+        self.assertEqual(5, len(result.list()))
+        self.assertListEqual([('logs/', None, None)], self._listed())
+
+    def test_prefix(self):
+        """Test combining explicit prefix and glob."""
+        result = self.bucket.query('logs/*/*.parquet',
+                                   prefix='logs/2026-10-02/')
+        self.assertListEqual(['logs/2026-10-02/e.parquet'],
+                             [o.name for o in result])
+        self.assertListEqual([], self.bucket.query('logs/*',
+                                                   prefix='other/').list())
+        self.assertListEqual(['other/f.parquet'],
+                             [o.name for o in self.bucket.query(
+                                 prefix='other/')])
+
+    def test_regex(self):
+        """Test regex filtering lists from its literal prefix."""
+        result = self.bucket.query().regex(r'logs/2026-10-\d+/[ab]+\.')
+        self.assertListEqual(self.expected[:2], [o.name for o in result])
+        self.assertListEqual([('logs/2026-10-', None, None)], self._listed())
+
+    def test_predicates(self):
+        """Test size, time and custom filters."""
+        self.backend.create_object('bucket', 'logs/2026-10-02/e.parquet',
+                                   b'')
+        base = self.bucket.query('logs/2026-10-*/*.parquet')
+        self.assertListEqual(self.expected[:2],
+                             [o.name for o in base.size(min_size=1)])
+        self.assertListEqual(self.expected[2:],
+                             [o.name for o in base.size(max_size=0)])
+        self.assertListEqual(self.expected, [o.name for o in base.list()])
+        self.assertListEqual(
+            [], base.updated(after=datetime.datetime(2100, 1, 1)).list())
+        self.assertEqual(
+            3, len(base.updated(before='2100-01-01T00:00:00Z').list()))
+        self.assertListEqual(
+            self.expected[1:2],
+            [o.name for o in base.where(lambda o: 'bb' in o.name)])
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_transport
+----------------------------------
+
+Tests for Transport classes.
+"""
+import unittest
+
+import mock
+
+from gcs_client import connection
+from gcs_client import transport
+
+
+class TestTransport(unittest.TestCase):
+    """Test Transport and HttpTransport classes."""
+
+    def setUp(self):
+        self.default = transport.Transport.get_default()
+
+    def tearDown(self):
+        transport.Transport.set_default(self.default)
+
+    def test_get_default_singleton(self):
+        """Test that get_default always returns the same instance."""
+        self.assertIsInstance(transport.Transport.get_default(),
+                              transport.HttpTransport)
+        self.assertIs(transport.Transport.get_default(),
+                      transport.HttpTransport.get_default())
+
+    def test_set_default(self):
+        """Test setting and resetting the default transport."""
+        new_transport = transport.HttpTransport()
+        transport.Transport.set_default(new_transport)
+        self.assertIs(new_transport, transport.Transport.get_default())
+        transport.Transport.set_default(None)
+        self.assertIsNot(new_transport, transport.Transport.get_default())
+        self.assertIsInstance(transport.Transport.get_default(),
+                              transport.HttpTransport)
+
+    def test_set_default_wrong_type(self):
+        """Test we cannot set something that is not a transport."""
+        self.assertRaises(AssertionError, transport.Transport.set_default, 1)
+
+    def test_url_default_endpoint(self):
+        """Test URLs are not changed with the default endpoint."""
+        url = transport.DEFAULT_ENDPOINT + '/storage/v1/b'
+        self.assertEqual(url, transport.HttpTransport().url(url))
+
+    def test_url_custom_endpoint(self):
+        """Test URLs are translated to custom endpoints."""
+        trans = transport.HttpTransport('http://localhost:4443/')
+        self.assertEqual('http://localhost:4443/storage/v1/b',
+                         trans.url(transport.DEFAULT_ENDPOINT +
+                                   '/storage/v1/b'))
+        self.assertEqual('http://other/b', trans.url('http://other/b'))
+
+    def test_pool_default(self):
+        """Test HttpTransport uses the default pool."""
+        self.assertIs(connection.ConnectionPool.get_default(),
+                      transport.HttpTransport().pool)
+
+    def test_request(self):
+        """Test requests are sent to the pool with the translated URL."""
+        pool = mock.Mock()
+        trans = transport.HttpTransport('http://localhost', pool)
+        self.assertEqual(pool.request.return_value,
+                         trans.get(transport.DEFAULT_ENDPOINT + '/path',
+                                   params=mock.sentinel.params))
+        trans.put('http://localhost/path', data=mock.sentinel.data)
+        trans.post('http://localhost/path')
+        self.assertListEqual(
+            [mock.call('GET', 'http://localhost/path',
+                       params=mock.sentinel.params),
+             mock.call('PUT', 'http://localhost/path',
+                       data=mock.sentinel.data),
+             mock.call('POST', 'http://localhost/path')],
+            pool.request.call_args_list)
+
+    def test_stats(self):
+        """Test wire and decoded bytes of responses are counted."""
+        pool = mock.Mock()
+        pool.request.return_value = transport.Response(
+            200, b'x' * 100, {'Content-Encoding': 'gzip',
+                              'Content-Length': '20'})
+        trans = transport.HttpTransport('http://localhost', pool)
+        trans.get('http://localhost/path')
+        trans.get('http://localhost/path', stream=True)
+        pool.request.return_value = transport.Response(200, b'x' * 10)
+        trans.get('http://localhost/path')
+        self.assertEqual((2, 1, 30, 110),
+                         (trans.stats.responses, trans.stats.compressed,
+                          trans.stats.wire_bytes, trans.stats.decoded_bytes))
+        self.assertAlmostEqual(110 / 30.0, trans.stats.ratio)
+        trans.stats.reset()
+        self.assertEqual(0, trans.stats.responses)
+        self.assertEqual(1.0, trans.stats.ratio)
+
+    def test_stats_stream(self):
+        """Test streamed responses are counted once their body is read."""
+        pool = mock.Mock()
+        pool.request.return_value = transport.Response(
+            200, b'x' * 100, {'Content-Encoding': 'gzip',
+                              'Content-Length': '20'})
+        trans = transport.HttpTransport('http://localhost', pool)
+        r = trans.get('http://localhost/path', stream=True)
+        chunks = r.iter_content(60)
+        next(chunks)
+        self.assertEqual(0, trans.stats.responses)
+        list(chunks)
+        self.assertEqual((1, 1, 20, 100),
+                         (trans.stats.responses, trans.stats.compressed,
+                          trans.stats.wire_bytes, trans.stats.decoded_bytes))
+        # Closing it afterwards doesn't count it again
+        r.close()
+        self.assertEqual(1, trans.stats.responses)
+
+        # Bytes read before closing a partially read response are counted
+        pool.request.return_value = transport.Response(200, b'x' * 100)
+        r = trans.get('http://localhost/path', stream=True)
+        next(r.iter_content(60))
+        r.close()
+        self.assertEqual((2, 80, 160),
+                         (trans.stats.responses, trans.stats.wire_bytes,
+                          trans.stats.decoded_bytes))
+
+    def test_wire_size_raw(self):
+        """Test bytes read from the connection are used when available."""
+        response = mock.Mock(content=b'x' * 100, headers={})
+        response.raw.tell.return_value = 25
+        self.assertEqual(25, transport.wire_size(response))
+
+
+class TestJSON(unittest.TestCase):
+    """Test decoding of JSON responses."""
+
+    def setUp(self):
+        self.addCleanup(transport.set_json_decoder,
+                        transport.get_json_decoder())
+
+    def test_parse_once(self):
+        """Test documents are parsed once and cached in the response."""
+        decoder = mock.Mock(return_value={'a': 1})
+        transport.set_json_decoder(decoder)
+        response = transport.Response(200, b'{"a": 1}')
+        self.assertEqual({'a': 1}, transport.parse_json(response))
+        self.assertIs(transport.parse_json(response),
+                      transport.parse_json(response))
+        decoder.assert_called_once_with(b'{"a": 1}')
+        self.assertEqual({'a': 1}, transport.loads(b'{"a": 1}'))
+
+    def test_response_json(self):
+        """Test the json method of responses is used without a decoder."""
+        transport.set_json_decoder(None)
+        response = mock.Mock(**{'json.return_value': {'a': 1}})
+        self.assertEqual({'a': 1}, transport.parse_json(response))
+        transport.parse_json(response)
+        response.json.assert_called_once_with()
+        self.assertEqual({'a': 1}, transport.loads(b'{"a": 1}'))
+
+    def test_invalid(self):
+        """Test decoding errors are raised."""
+        for decoder in (None, transport.DEFAULT_JSON_DECODER):
+            transport.set_json_decoder(decoder)
+            self.assertRaises(ValueError, transport.parse_json,
+                              transport.Response(200, b'{'))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2015 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+test_usage
+----------------------------------
+
+Tests for disk usage aggregation
+"""
+import mock
+
+from gcs_client import usage
+from tests import test_fake
+
+
+class TestUsage(test_fake.FakeTestCase):
+    """Test usage aggregation against the in-memory backend."""
+
+    def setUp(self):
+        super(TestUsage, self).setUp()
+        # Sizes are the lengths of the names
+        self._create('a', 'd/bb', 'd/e/ccc', 'd/e/f/dddd', 'g/hh')
+
+    def test_totals(self):
+        """Test depth 0 only aggregates the prefix."""
+        result = self.bucket.usage(depth=0)
+        self.assertEqual((5, 26), (result.count, result.size))
+        self.assertDictEqual({}, result.children)
+        self.assertDictEqual({'STANDARD': [5, 26]}, result.storage_classes)
+
+    def test_depth(self):
+        """Test sub-prefixes include all their descendants."""
+        result = self.bucket.usage(depth=2, concurrency=2)
+        self.assertEqual((5, 26), (result.count, result.size))
+        self.assertListEqual(
+            [('', 5, 26), ('d/', 3, 21), ('d/e/', 2, 17), ('g/', 1, 4)],
+            [(n.prefix, n.count, n.size) for n in result.walk()])
+
+        result = self.bucket.usage('d/', depth=1)
+        self.assertListEqual([('d/', 3, 21), ('d/e/', 2, 17)],
+                             [(n.prefix, n.count, n.size)
+                              for n in result.walk()])
+
+    def test_fields(self):
+        """Test only required fields are requested and no objects created."""
+        with mock.patch.object(self.bucket, '_request',
+                               wraps=self.bucket._request) as request_mock:
+            with mock.patch('gcs_client.base.gcs_factory') as factory_mock:
+                self.bucket.usage(depth=0)
+        self.assertEqual(usage.FIELDS,
+                         request_mock.call_args[1]['fields'])
+        self.assertFalse(factory_mock.called)